@@ -0,0 +1,204 @@
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+
+
+DEFAULT_MAX_CONCURRENT = 2
+DEFAULT_MAX_QUEUE = 16
+DEFAULT_MAX_WAIT_S = 1.0
+DEFAULT_MAX_WAITING_PER_SESSION = 1
+WAIT_SAMPLES = 2000
+
+
+class _Waiter:
+    __slots__ = ("event", "granted", "enqueued_at")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.granted = False
+        self.enqueued_at = time.perf_counter()
+
+
+class AdmissionController:
+    """
+    Admission control in front of the LLM.
+    - At most `max_concurrent` calls in flight
+    - At most `max_queue` callers waiting, each for at most `max_wait_s`
+    - Waiting callers are admitted round-robin across sessions, and one
+      session cannot hold more than `max_waiting_per_session` places
+    - Callers that cannot be admitted are shed: they get False at once
+      (queue full) or after their wait runs out, and carry on without
+      the LLM
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = DEFAULT_MAX_CONCURRENT,
+        max_queue: int = DEFAULT_MAX_QUEUE,
+        max_wait_s: float = DEFAULT_MAX_WAIT_S,
+        max_waiting_per_session: int = DEFAULT_MAX_WAITING_PER_SESSION,
+    ):
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.max_wait_s = max_wait_s
+        self.max_waiting_per_session = max_waiting_per_session
+
+        self._lock = threading.Lock()
+        self._lanes = OrderedDict()   # session -> deque[_Waiter]
+        self._active = 0
+        self._queued = 0
+
+        self._stats = {
+            "requests": 0,
+            "admitted": 0,
+            "shed_queue_full": 0,
+            "shed_timeout": 0,
+        }
+        self._waits_ms = deque(maxlen=WAIT_SAMPLES)
+
+    @classmethod
+    def from_env(cls, max_concurrent: int = DEFAULT_MAX_CONCURRENT) -> "AdmissionController":
+        """
+        LLM_MAX_CONCURRENT, LLM_MAX_QUEUE, LLM_MAX_WAIT_S
+        """
+        return cls(
+            max_concurrent=int(os.getenv("LLM_MAX_CONCURRENT", max_concurrent)),
+            max_queue=int(os.getenv("LLM_MAX_QUEUE", DEFAULT_MAX_QUEUE)),
+            max_wait_s=float(os.getenv("LLM_MAX_WAIT_S", DEFAULT_MAX_WAIT_S)),
+        )
+
+    # Admission
+
+    def try_acquire(self, session_id: str | None = None, timeout: float | None = None) -> bool:
+        """
+        Waits up to min(timeout, max_wait_s) for a slot.
+        Returns False when the caller is shed. Call release() after a
+        successful acquire, once the LLM call has finished.
+        """
+        wait_s = self.max_wait_s if timeout is None else min(timeout, self.max_wait_s)
+        waiter = _Waiter()
+        key = session_id if session_id is not None else id(waiter)
+
+        with self._lock:
+            self._stats["requests"] += 1
+
+            if self._active < self.max_concurrent and not self._queued:
+                self._active += 1
+                self._stats["admitted"] += 1
+                self._waits_ms.append(0.0)
+                return True
+
+            lane = self._lanes.get(key)
+            if (
+                self._queued >= self.max_queue
+                or (lane and len(lane) >= self.max_waiting_per_session)
+                or wait_s <= 0
+            ):
+                self._stats["shed_queue_full"] += 1
+                return False
+
+            self._lanes.setdefault(key, deque()).append(waiter)
+            self._queued += 1
+
+        waiter.event.wait(wait_s)
+
+        with self._lock:
+            if waiter.granted:
+                self._stats["admitted"] += 1
+                self._waits_ms.append((time.perf_counter() - waiter.enqueued_at) * 1000)
+                return True
+
+            lane = self._lanes[key]
+            lane.remove(waiter)
+            if not lane:
+                del self._lanes[key]
+            self._queued -= 1
+            self._stats["shed_timeout"] += 1
+            return False
+
+    def release(self):
+        with self._lock:
+            self._active -= 1
+            self._grant_next()
+
+    def _grant_next(self):
+        while self._active < self.max_concurrent and self._lanes:
+            key, lane = next(iter(self._lanes.items()))
+            waiter = lane.popleft()
+            self._lanes.pop(key)
+            if lane:
+                self._lanes[key] = lane   # back of the rotation
+            self._queued -= 1
+            self._active += 1
+            waiter.granted = True
+            waiter.event.set()
+
+    # Metrics
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+            waits = sorted(self._waits_ms)
+            stats["active"] = self._active
+            stats["queue_depth"] = self._queued
+
+        def pct(p):
+            if not waits:
+                return 0.0
+            return round(waits[min(len(waits) - 1, int(p * len(waits)))], 2)
+
+        shed = stats["shed_queue_full"] + stats["shed_timeout"]
+        stats["shed"] = shed
+        stats["shed_rate"] = round(shed / stats["requests"], 4) if stats["requests"] else 0.0
+        stats["wait_ms"] = {"p50": pct(0.50), "p95": pct(0.95), "p99": pct(0.99)}
+        return stats
+
+
+# Per backend
+#
+# Each backend has its own controller, so remote and local calls never
+# compete for the same slots. A batching scheduler gets at least
+# max_batch slots (fewer would cap every batch below its size); a router
+# or hedged pair gets the sum of what its backends would.
+
+_CONTROLLERS = {}   # id(backend) -> (backend, AdmissionController)
+_CONTROLLERS_LOCK = threading.Lock()
+
+
+def _members(backend) -> list:
+    routed = getattr(backend, "backends", None)
+    if isinstance(routed, dict):
+        return list(routed.values())
+    if hasattr(backend, "primary") and hasattr(backend, "secondary"):
+        return [backend.primary, backend.secondary]
+    return []
+
+
+def default_max_concurrent(backend) -> int:
+    members = _members(backend)
+    if members:
+        return sum(default_max_concurrent(m) for m in members)
+    return max(DEFAULT_MAX_CONCURRENT, getattr(backend, "max_batch", 1))
+
+
+def admission_controller(backend=None) -> AdmissionController:
+    """
+    The process-wide controller in front of one LLM backend.
+    """
+    with _CONTROLLERS_LOCK:
+        entry = _CONTROLLERS.get(id(backend))
+        if entry is None:
+            controller = AdmissionController.from_env(default_max_concurrent(backend))
+            # The backend is kept alive with its entry, so its id is never reused
+            entry = _CONTROLLERS[id(backend)] = (backend, controller)
+        return entry[1]
+
+
+def admission_stats() -> dict:
+    """
+    stats() of every controller, by backend.
+    """
+    with _CONTROLLERS_LOCK:
+        entries = list(_CONTROLLERS.values())
+    return {repr(backend): controller.stats() for backend, controller in entries}
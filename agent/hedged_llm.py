@@ -0,0 +1,156 @@
+import json
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+
+DEFAULT_HEDGE_PERCENTILE = 0.9
+DEFAULT_INITIAL_DELAY_S = 1.5
+MIN_HEDGE_DELAY_S = 0.05
+MAX_HEDGE_DELAY_S = 10.0
+MIN_SAMPLES = 5
+LATENCY_SAMPLES = 200
+
+# Keys an extraction may return (anything else is not an intent)
+INTENT_KEYS = {
+    "source", "destination", "trip_type", "travel_date", "return_date",
+    "days", "travelers", "preferences", "interests",
+}
+
+_DECODER = json.JSONDecoder()
+
+
+def response_text(response) -> str:
+    return response.content if hasattr(response, "content") else str(response)
+
+
+def is_valid_intent(response) -> bool:
+    """
+    True when the response holds a JSON object made of intent keys
+    ("{}" counts: the model saw nothing to extract).
+    """
+    text = response_text(response)
+    start = text.find("{")
+    while start != -1:
+        try:
+            data, _ = _DECODER.raw_decode(text, start)
+            return isinstance(data, dict) and set(data) <= INTENT_KEYS
+        except json.JSONDecodeError:
+            start = text.find("{", start + 1)
+    return False
+
+
+class HedgedLLM:
+    """
+    Hedged invocation over two backends.
+    - The prompt goes to the primary first
+    - If no valid answer arrives within the hedge delay (a percentile of
+      recent primary latencies), the secondary is asked too
+    - The first response that is valid intent JSON wins
+    - The loser is cancelled if it has not started yet; a call already
+      in flight cannot be interrupted, its result is simply discarded
+    """
+
+    def __init__(
+        self,
+        primary,
+        secondary,
+        hedge_percentile: float = DEFAULT_HEDGE_PERCENTILE,
+        initial_delay_s: float = DEFAULT_INITIAL_DELAY_S,
+        validator=is_valid_intent,
+        max_workers: int = 8,
+    ):
+        self.primary = primary
+        self.secondary = secondary
+        self.hedge_percentile = hedge_percentile
+        self.initial_delay_s = initial_delay_s
+        self.validator = validator
+
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="llm-hedge")
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=LATENCY_SAMPLES)
+        self._stats = {
+            "requests": 0,
+            "hedged": 0,
+            "primary_wins": 0,
+            "secondary_wins": 0,
+            "no_valid_response": 0,
+        }
+
+    # Hedge delay
+
+    def hedge_delay_s(self) -> float:
+        with self._lock:
+            samples = sorted(self._latencies)
+
+        if len(samples) < MIN_SAMPLES:
+            return self.initial_delay_s
+
+        idx = min(len(samples) - 1, int(self.hedge_percentile * len(samples)))
+        return min(MAX_HEDGE_DELAY_S, max(MIN_HEDGE_DELAY_S, samples[idx]))
+
+    def _timed(self, backend, prompt, kwargs, record: bool):
+        started = time.perf_counter()
+        result = backend.invoke(prompt, **kwargs)
+        if record:
+            with self._lock:
+                self._latencies.append(time.perf_counter() - started)
+        return result
+
+    # Invocation
+
+    def invoke(self, prompt, **kwargs):
+        with self._lock:
+            self._stats["requests"] += 1
+
+        primary = self._pool.submit(self._timed, self.primary, prompt, kwargs, True)
+        pending = {primary: "primary"}
+        fallback = None   # last response received, even if not valid
+
+        done, _ = wait([primary], timeout=self.hedge_delay_s())
+        if not done or not self._accept(primary):
+            with self._lock:
+                self._stats["hedged"] += 1
+            secondary = self._pool.submit(self._timed, self.secondary, prompt, kwargs, False)
+            pending[secondary] = "secondary"
+
+        while pending:
+            done, _ = wait(list(pending), return_when=FIRST_COMPLETED)
+            for future in done:
+                name = pending.pop(future)
+                if future.exception() is None:
+                    fallback = future.result()
+                if self._accept(future):
+                    for loser in pending:
+                        loser.cancel()
+                    with self._lock:
+                        self._stats[f"{name}_wins"] += 1
+                    return future.result()
+
+        with self._lock:
+            self._stats["no_valid_response"] += 1
+
+        if fallback is not None:
+            return fallback
+        # Both failed → surface the primary's error
+        return primary.result()
+
+    def _accept(self, future) -> bool:
+        if future.exception() is not None:
+            return False
+        try:
+            return bool(self.validator(future.result()))
+        except Exception:
+            return False
+
+    def stats(self) -> dict:
+        with self._lock:
+            samples = sorted(self._latencies)
+            stats = dict(self._stats)
+        stats["primary_p50_ms"] = round(samples[len(samples) // 2] * 1000, 1) if samples else None
+        stats["hedge_delay_ms"] = round(self.hedge_delay_s() * 1000, 1)
+        return stats
+
+    def __repr__(self):
+        return f"HedgedLLM({self.primary!r}, {self.secondary!r})"
@@ -0,0 +1,280 @@
+import argparse
+import json
+import os
+import queue
+import socket
+import socketserver
+import threading
+import time
+import uuid
+
+from agent.model_registry import ModelRegistry, MODEL_VARIANTS, DEFAULT_MODEL
+
+
+DEFAULT_SOCKET_PATH = "/tmp/travel-agent-llm.sock"
+DEFAULT_REQUEST_TIMEOUT_S = 60.0
+DEFAULT_MAX_QUEUE = 64
+
+
+def configured_socket_path() -> str | None:
+    """
+    Socket of the shared inference daemon, if one is configured and running.
+    """
+    path = os.getenv("LLM_INFERENCE_SOCKET")
+    if path and os.path.exists(path):
+        return path
+    return None
+
+
+# JOB
+
+class _Job:
+    def __init__(self, model: str, prompt: str, timeout_s: float):
+        self.model = model
+        self.prompt = prompt
+        self.enqueued_at = time.monotonic()
+        self.deadline = self.enqueued_at + timeout_s
+        self.done = threading.Event()
+        self.text = None
+        self.error = None
+
+
+# SERVER
+
+class InferenceServer:
+    """
+    Owns the local models for every app worker on the host.
+    - One copy of the weights (via ModelRegistry)
+    - Bounded request queue, served by a small worker pool
+    - Per-request timeouts, including time spent queued
+    """
+
+    def __init__(
+        self,
+        socket_path: str = DEFAULT_SOCKET_PATH,
+        registry: ModelRegistry | None = None,
+        workers: int = 1,
+        max_queue: int = DEFAULT_MAX_QUEUE,
+    ):
+        self.socket_path = socket_path
+        self.registry = registry or ModelRegistry()
+        self.workers = max(1, workers)
+        self.jobs = queue.Queue(maxsize=max_queue)
+
+        # llama.cpp instances are not safe to call from two threads at once
+        self._model_locks = {name: threading.Lock() for name in self.registry.variants}
+        self._server = None
+
+        self.stats = {
+            "served": 0,
+            "failed": 0,
+            "timed_out": 0,
+            "rejected": 0,
+        }
+
+    # Request handling
+
+    def submit(self, model: str, prompt: str, timeout_s: float) -> dict:
+        if model not in self.registry.variants:
+            return {"ok": False, "error": f"Unknown model '{model}'"}
+
+        job = _Job(model, prompt, timeout_s)
+        try:
+            self.jobs.put_nowait(job)
+        except queue.Full:
+            self.stats["rejected"] += 1
+            return {"ok": False, "error": "Inference queue is full"}
+
+        if not job.done.wait(max(0.0, job.deadline - time.monotonic())):
+            self.stats["timed_out"] += 1
+            return {"ok": False, "error": "timeout"}
+
+        if job.error:
+            return {"ok": False, "error": job.error}
+        return {"ok": True, "text": job.text}
+
+    def _worker(self):
+        while True:
+            job = self.jobs.get()
+            try:
+                if time.monotonic() >= job.deadline:
+                    continue  # caller already gave up
+
+                with self._model_locks[job.model]:
+                    with self.registry.use(job.model) as llm:
+                        response = llm.invoke(job.prompt)
+
+                job.text = response.content if hasattr(response, "content") else str(response)
+                self.stats["served"] += 1
+
+            except Exception as e:
+                job.error = str(e)
+                self.stats["failed"] += 1
+
+            finally:
+                job.done.set()
+                self.jobs.task_done()
+
+    def status(self) -> dict:
+        return {
+            "queue_depth": self.jobs.qsize(),
+            "workers": self.workers,
+            **self.stats,
+            "registry": self.registry.status(),
+        }
+
+    def handle(self, request: dict) -> dict:
+        op = request.get("op", "invoke")
+
+        if op == "status":
+            return {"ok": True, "status": self.status()}
+
+        if op == "invoke":
+            return self.submit(
+                request.get("model") or DEFAULT_MODEL,
+                request.get("prompt", ""),
+                float(request.get("timeout") or DEFAULT_REQUEST_TIMEOUT_S),
+            )
+
+        return {"ok": False, "error": f"Unknown op '{op}'"}
+
+    # Socket lifecycle
+
+    def serve_forever(self):
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+        for i in range(self.workers):
+            threading.Thread(
+                target=self._worker, name=f"inference-worker-{i}", daemon=True
+            ).start()
+
+        self.registry.start_reaper()
+
+        server = self
+
+        class _Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                for line in self.rfile:
+                    if not line.strip():
+                        continue
+                    try:
+                        request = json.loads(line)
+                        reply = server.handle(request)
+                        reply["id"] = request.get("id")
+                    except Exception as e:
+                        reply = {"ok": False, "error": str(e)}
+
+                    self.wfile.write(json.dumps(reply).encode("utf-8") + b"\n")
+                    self.wfile.flush()
+
+        class _Server(socketserver.ThreadingUnixStreamServer):
+            daemon_threads = True
+
+        self._server = _Server(self.socket_path, _Handler)
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+
+    def shutdown(self):
+        if self._server is not None:
+            self._server.shutdown()
+
+
+# CLIENT SHIM
+#
+# Drop-in for the in-process LlamaCpp object: only `invoke` is used by the
+# agent, and it returns plain text just like LlamaCpp does.
+
+class InferenceClient:
+    def __init__(
+        self,
+        socket_path: str,
+        model: str = DEFAULT_MODEL,
+        timeout_s: float = DEFAULT_REQUEST_TIMEOUT_S,
+    ):
+        self.socket_path = socket_path
+        self.model = model
+        self.timeout_s = timeout_s
+
+    def _request(self, payload: dict, timeout_s: float) -> dict:
+        payload["id"] = uuid.uuid4().hex
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            # small grace period so the server's own timeout reply wins
+            sock.settimeout(timeout_s + 2.0)
+            sock.connect(self.socket_path)
+            sock.sendall(json.dumps(payload).encode("utf-8") + b"\n")
+
+            buf = b""
+            while not buf.endswith(b"\n"):
+                chunk = sock.recv(65536)
+                if not chunk:
+                    break
+                buf += chunk
+
+        if not buf:
+            raise RuntimeError("Inference server closed the connection")
+        return json.loads(buf)
+
+    def invoke(self, prompt, timeout: float | None = None, **kwargs) -> str:
+        timeout_s = timeout or self.timeout_s
+        try:
+            reply = self._request(
+                {"op": "invoke", "model": self.model, "prompt": str(prompt), "timeout": timeout_s},
+                timeout_s,
+            )
+        except socket.timeout:
+            raise TimeoutError(f"Inference request timed out after {timeout_s}s")
+
+        if not reply.get("ok"):
+            if reply.get("error") == "timeout":
+                raise TimeoutError(f"Inference request timed out after {timeout_s}s")
+            raise RuntimeError(f"Inference server error: {reply.get('error')}")
+        return reply["text"]
+
+    def status(self) -> dict:
+        return self._request({"op": "status"}, 5.0).get("status", {})
+
+    def __repr__(self):
+        return f"InferenceClient({self.socket_path!r}, model={self.model!r})"
+
+
+def client_model_info(socket_path: str, choice: str | None) -> dict:
+    name = (choice or DEFAULT_MODEL).lower().strip()
+    if name not in MODEL_VARIANTS:
+        raise RuntimeError(f"Requested model '{choice}' is not available")
+
+    return {
+        "instance": InferenceClient(socket_path, model=name),
+        "provider": "Local (shared)",
+        "model_name": MODEL_VARIANTS[name]["model_name"],
+        "status": "connected",
+    }
+
+
+# CLI
+
+def main():
+    parser = argparse.ArgumentParser(description="Shared local LLM inference daemon")
+    parser.add_argument("--socket", default=os.getenv("LLM_INFERENCE_SOCKET", DEFAULT_SOCKET_PATH))
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--max-queue", type=int, default=DEFAULT_MAX_QUEUE)
+    parser.add_argument("--preload", action="store_true", help="Load models that fit the RAM budget at startup")
+    args = parser.parse_args()
+
+    server = InferenceServer(args.socket, workers=args.workers, max_queue=args.max_queue)
+
+    if args.preload:
+        for name in server.registry.plan():
+            print(f"Loading {server.registry.variants[name]['label']}...")
+            server.registry.acquire(name)
+
+    print(f"Inference server listening on {args.socket}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,16 @@
 import json
-import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
 from datetime import date
 
+from agent.travel_lexicon import scan_message, count_travelers, FILLER_WORDS
+from utils.date_parser import parse_date, DATE_WORDS
+from utils.deadline import Deadline
+from utils.json_stream import JSONObjectStream, first_json_object
+from agent.admission import AdmissionController, admission_controller
+from agent.llm_scheduler import session_kwargs
+
 
 GENERIC_PHRASES = {
     "plan a trip",
@@ -20,131 +29,416 @@ GENERIC_PHRASES = {
 # SAFE JSON EXTRACTION
 
 def _extract_json(text: str) -> dict:
-    matches = re.findall(r"\{[\s\S]*?\}", text)
-    for m in matches:
-        try:
-            return json.loads(m)
-        except json.JSONDecodeError:
-            continue
-    return {}
+    # First complete object, nested "preferences" included
+    return first_json_object(text) or {}
 
 
 # RULE-BASED EXTRACTION (PRIMARY)
+#
+# One pass of the compiled travel matcher (agent/travel_lexicon.py) yields
+# typed spans; every field carries the confidence of the phrase behind it.
+# Values at or above CONFIDENCE_THRESHOLD are final; weaker ones are kept
+# but the LLM gets a chance to correct them.
+
+CONFIDENCE_THRESHOLD = 0.75
+
+# Slots the LLM may be asked about. Dates are resolved by utils/date_parser
+# and never sent to the model; return_date is derived.
+INTENT_SLOTS = ("source", "destination", "days", "travelers")
+
+
+def _best(spans: list):
+    """
+    Highest-confidence span (earliest, then longest, wins ties).
+    """
+    if not spans:
+        return None
+    best = max(spans, key=lambda s: (s.confidence, -s.start, s.size))
+    return best.value, best.confidence
+
+
+def _place_after(tokens: list, index: int, covered: set, to_end: bool = False):
+    """
+    Up to two plain words after tokens[index], for places the
+    gazetteer does not know (so validation can explain they are
+    not supported).
+    """
+    words = []
+    j = index + 1
+    while (
+        j < len(tokens) and len(words) < 2
+        and tokens[j].text.isalpha()
+        and tokens[j].text not in FILLER_WORDS
+        and j not in covered
+    ):
+        words.append(tokens[j].text)
+        j += 1
+
+    if not words or (to_end and j != len(tokens)):
+        return None, j
+
+    name = " ".join(words)
+    if name in GENERIC_PHRASES:
+        return None, j
+    return name.title(), j
+
+
+def _extract_route(tokens: list, spans: list, covered: set) -> dict:
+    fields = {}
+    cities = [s for s in spans if s.kind == "city"]
+    cue_before = {}
+    for s in spans:
+        if s.kind in ("source_cue", "destination_cue"):
+            cue_before.setdefault(s.last_token, set()).add(s.kind)
+            if s.kind == "destination_cue" and tokens[s.first_token].text == "to":
+                cue_before[s.last_token].add("to")
+
+    def joined_by(a, b):
+        if b.first_token - a.last_token != 1:
+            return None
+        return tokens[a.last_token].text
+
+    # Destination candidates as (strength, city, confidence): a city
+    # right after "to" beats one after a weaker cue ("in", "for"),
+    # which beats a bare city name
+    destinations = []
+
+    for i, c in enumerate(cities):
+        nxt = cities[i + 1] if i + 1 < len(cities) else None
+        prev = cities[i - 1] if i > 0 else None
+
+        # "X to Y" / "X from Y" between two known cities
+        link = joined_by(c, nxt) if nxt else None
+        if link == "to" and "source" not in fields:
+            fields["source"] = (c.value, 0.95)
+            continue
+        if link == "from":
+            destinations.append((2, c.value, 0.95))
+            continue
+
+        cues = cue_before.get(c.first_token, set())
+        back = joined_by(prev, c) if prev else None
+
+        if "source_cue" in cues:
+            fields.setdefault("source", (c.value, 0.95))
+        elif back == "to":
+            destinations.append((2, c.value, 0.95))
+        elif "to" in cues:
+            destinations.append((2, c.value, 0.9))
+        elif "destination_cue" in cues:
+            destinations.append((1, c.value, 0.9))
+        else:
+            # a bare city name most often names where the user wants to go
+            destinations.append((0, c.value, 0.6))
+
+    strength = 0
+    if destinations:
+        strength = max(d[0] for d in destinations)
+        best = [d for d in destinations if d[0] == strength]
+        _, value, confidence = best[0]
+        if len({d[1] for d in best}) > 1:
+            # Equally strong cues name different cities: the LLM decides
+            confidence = min(confidence, 0.6)
+        fields["destination"] = (value, confidence)
+
+    # Places the gazetteer does not know, for whichever side is still
+    # missing ("from delhi to paris" → destination Paris, unsupported)
+    words = [t.text for t in tokens]
+
+    if "from" in words and "source" not in fields:
+        i = words.index("from")
+        source, j = _place_after(tokens, i, covered)
+        if source and "destination" not in fields and j < len(tokens) and words[j] == "to":
+            destination, end = _place_after(tokens, j, covered)
+            if destination:
+                covered.update(range(i, end))
+                return {"source": (source, 0.6), "destination": (destination, 0.6)}
+
+        if source:
+            covered.update(range(i, j))
+            fields["source"] = (source, 0.6)
+
+    # A trailing "to X" outranks a known city behind a weaker cue
+    if "to" in words and ("destination" not in fields or strength < 2):
+        i = len(words) - 1 - words[::-1].index("to")
+        destination, end = _place_after(tokens, i, covered, to_end=True)
+        if destination:
+            covered.update(range(i, end))
+            fields["destination"] = (destination, 0.6)
+
+    return fields
+
+
+def _rule_based_extract_scored(user_query: str, today: date | None = None) -> dict:
+    """
+    Deterministic extraction with a confidence per field.
+    `today` anchors relative dates ("next friday", "in 3 days").
+
+    Returns:
+    {
+        "fields": {"destination": ("Goa", 0.95), ...},
+        "residual": [...]   # unexplained words
+    }
+    """
+    tokens, spans = scan_message(user_query)
+    by_kind = {}
+    covered = set()
+    for s in spans:
+        by_kind.setdefault(s.kind, []).append(s)
+        covered.update(range(s.first_token, s.last_token))
+
+    fields = {}
+
+    # DATE
+    # The words of a date expression are explained even when the date is
+    # in the past (the agent reports that), so they never reach the LLM.
+
+    today = today or date.today()
+    expr = None
+    date_tokens = set()
+    if any(t.symbol != t.text or t.text in DATE_WORDS for t in tokens):
+        expr = parse_date(user_query.lower(), today)
+    if expr:
+        start, end = expr.span
+        date_tokens = {i for i, t in enumerate(tokens) if start <= t.start < end}
+        covered.update(date_tokens)
+        if expr.start >= today:
+            fields["travel_date"] = (expr.start.isoformat(), 0.95)
+            if expr.end:
+                # "15-20 june" also says how long
+                fields["days"] = ((expr.end - expr.start).days + 1, 0.9)
+
+    headcount = count_travelers(tokens, spans)
+    if headcount:
+        fields["travelers"] = headcount[:2]
+
+    # "in a week" / "a week from now" say when, not how long
+    by_kind["days"] = [
+        s for s in by_kind.get("days", [])
+        if not date_tokens.intersection(range(s.first_token, s.last_token))
+    ]
+
+    for key in ("days", "trip_type"):
+        found = _best(by_kind.get(key))
+        if found:
+            fields[key] = found
 
-def _rule_based_extract(user_query: str) -> dict:
+    found = _best(by_kind.get("budget"))
+    if found:
+        fields["preferences"] = ({"budget": found[0]}, found[1])
+
+    fields.update(_extract_route(tokens, spans, covered))
+
+    # Words the rules did not account for (ignoring filler).
+    # Anything left here is the only reason to ask the LLM.
+    residual = [
+        t.text for i, t in enumerate(tokens)
+        if i not in covered
+        and t.number is None
+        and t.text not in FILLER_WORDS
+    ]
+
+    return {
+        "fields": fields,
+        "residual": residual,
+    }
+
+
+def _rule_based_extract(user_query: str, today: date | None = None) -> dict:
     """
     Deterministic extraction (FAST).
     Covers common human language patterns.
     """
-    text = user_query.lower()
-    extracted = {}
-
-    # FROM → TO 
-  
-    m = re.search(r"from\s+([a-z\s]+?)\s+to\s+([a-z\s]+)", text)
-    if m:
-        extracted["source"] = m.group(1).title().strip()
-        extracted["destination"] = m.group(2).title().strip()
-        return extracted  # 🚨 stop early – this is authoritative
-
-
- 
-    # X FROM Y (WEAK SIGNAL)
-  
-    m = re.search(r"([a-z\s]+?)\s+from\s+([a-z\s]+)", text)
-    if m:
-        possible_dest = m.group(1).strip()
-        source = m.group(2).title().strip()
-
-        extracted["source"] = source
-
-        if possible_dest not in GENERIC_PHRASES:
-            extracted["destination"] = possible_dest.title()
-
- 
-    # destination only
-    m = re.search(r"\bto\s+([a-z\s]{2,20})$", text)
-    if m and "from" not in text:
-        candidate = m.group(1).strip()
-        if candidate not in GENERIC_PHRASES:
-            extracted.setdefault("destination", candidate.title())
- 
-    # TRIP TYPE 
- 
-    if any(k in text for k in [
-        "round trip", "roundtrip", "return trip", "two way", "2 way", "both ways", "return"
-    ]):
-        extracted["trip_type"] = "round_trip"
-
-    elif any(k in text for k in [
-        "one way", "one-way", "single trip", "no return"
-    ]):
-        extracted["trip_type"] = "one_way"
-
- 
-    # TRAVELERS
-  
-    if "me and my wife" in text or "me and my husband" in text:
-        extracted["travelers"] = 2
-
-    m = re.search(r"(\d+)\s*(people|person|persons|travellers|travelers|pax)", text)
-    if m:
-        extracted["travelers"] = int(m.group(1))
-
-
-    # DAYS
-
-    m = re.search(r"for\s+(\d+)\s*day", text)
-    if m:
-        extracted["days"] = int(m.group(1))
-
-    if "one week" in text:
-        extracted["days"] = 7
+    scored = _rule_based_extract_scored(user_query, today)
+    return {k: v for k, (v, _) in scored["fields"].items()}
 
 
-    # DATE
+# DEADLINE
+#
+# With a turn deadline the LLM call runs on a helper thread and is
+# abandoned when the budget runs out; the rule-based fields stand.
+
+LLM_MIN_BUDGET_S = 0.25
+LLM_RESERVE_S = 0.2      # left for the tools after an abandoned call
+_LLM_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix="intent-llm")
 
-    m = re.search(r"(20\d{2}-\d{2}-\d{2})", text)
-    if m:
-        d = date.fromisoformat(m.group(1))
-        if d > date.today():
-            extracted["travel_date"] = m.group(1)
 
+class _AdmissionHold:
+    """
+    The admission slot of one LLM call, released exactly once: by the
+    call when it returns, or by the turn when its deadline abandons it.
+    """
+
+    def __init__(self, admission: AdmissionController | None):
+        self._admission = admission
+        self._lock = threading.Lock()
+
+    def release(self):
+        with self._lock:
+            admission, self._admission = self._admission, None
+        if admission:
+            admission.release()
+
+
+def _call_llm(llm, prompt, user_query, missing_keys, hold=None, deadline=None, session_id=None):
+    try:
+        # Routers pick a backend from the message and the open slots
+        invoke_for_intent = getattr(llm, "invoke_for_intent", None)
+        if invoke_for_intent:
+            return invoke_for_intent(
+                prompt, user_query, missing_keys, **session_kwargs(invoke_for_intent, session_id)
+            )
+        # A batching scheduler runs streams one at a time; a whole
+        # answer inside a batch arrives sooner than a stream on its own
+        stream = getattr(llm, "stream", None)
+        if stream and not getattr(llm, "batching", False):
+            return _stream_llm(stream, prompt, deadline, session_id)
+        return llm.invoke(prompt, **session_kwargs(llm.invoke, session_id))
+    finally:
+        if hold:
+            hold.release()
+
+
+# STREAMING
+#
+# Local models tend to keep explaining after the JSON. Streamed tokens
+# go through an incremental parser and generation stops at the closing
+# brace of the first complete object (or when the turn deadline passes).
+
+STREAM_TOKEN_BUDGET = 256   # LlamaCpp's default max_tokens
+
+_STREAM_LOCK = threading.Lock()
+STREAM_STATS = {
+    "calls": 0,
+    "stopped_early": 0,
+    "tokens_streamed": 0,
+    "tokens_saved": 0,
+    "time_to_result_ms": 0.0,
+}
+
+
+def _stream_llm(stream, prompt, deadline=None, session_id=None) -> str:
+    parser = JSONObjectStream()
+    parts = []
+    started = time.perf_counter()
+
+    chunks = stream(prompt, **session_kwargs(stream, session_id))
+    try:
+        for chunk in chunks:
+            parts.append(chunk)
+            if parser.feed(chunk) is not None:
+                break
+            if deadline and deadline.expired():
+                break
+    finally:
+        chunks.close()
+
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    with _STREAM_LOCK:
+        STREAM_STATS["calls"] += 1
+        STREAM_STATS["tokens_streamed"] += len(parts)
+        STREAM_STATS["time_to_result_ms"] += elapsed_ms
+        if parser.done:
+            STREAM_STATS["stopped_early"] += 1
+            STREAM_STATS["tokens_saved"] += max(0, STREAM_TOKEN_BUDGET - len(parts))
+
+    text = "".join(parts)
+    return text[:parser.chars_to_result] if parser.done else text
+
+
+def stream_stats() -> dict:
+    """
+    Streamed extractions: average time to result and tokens per call.
+    tokens_saved is an upper bound (the generation budget left unused).
+    """
+    with _STREAM_LOCK:
+        calls = STREAM_STATS["calls"]
+        return {
+            **STREAM_STATS,
+            "time_to_result_ms": round(STREAM_STATS["time_to_result_ms"], 1),
+            "avg_time_to_result_ms": round(STREAM_STATS["time_to_result_ms"] / calls, 1) if calls else 0.0,
+            "avg_tokens_streamed": round(STREAM_STATS["tokens_streamed"] / calls, 1) if calls else 0.0,
+            "avg_tokens_saved": round(STREAM_STATS["tokens_saved"] / calls, 1) if calls else 0.0,
+        }
+
+
+# FAST-PATH METRICS
+
+_FAST_PATH_LOCK = threading.Lock()
+FAST_PATH_STATS = {
+    "turns": 0,
+    "rules_only": 0,
+    "llm_calls": 0,
+    "llm_shed": 0,
+}
+
+
+def _record_turn(used_llm: bool, shed: bool = False):
+    with _FAST_PATH_LOCK:
+        FAST_PATH_STATS["turns"] += 1
+        if used_llm:
+            FAST_PATH_STATS["llm_calls"] += 1
+        else:
+            FAST_PATH_STATS["rules_only"] += 1
+        if shed:
+            FAST_PATH_STATS["llm_shed"] += 1
 
-    # BUDGET
 
-    if any(k in text for k in ["budget", "budget friendly", "low cost", "cheap"]):
-        extracted.setdefault("preferences", {})["budget"] = "budget"
-    elif "luxury" in text:
-        extracted.setdefault("preferences", {})["budget"] = "luxury"
-    elif "mid" in text:
-        extracted.setdefault("preferences", {})["budget"] = "mid-range"
+def fast_path_stats() -> dict:
+    """
+    Share of parsed turns resolved without an LLM call.
+    """
+    with _FAST_PATH_LOCK:
+        turns = FAST_PATH_STATS["turns"]
+        return {
+            **FAST_PATH_STATS,
+            "rules_only_ratio": round(FAST_PATH_STATS["rules_only"] / turns, 4) if turns else 0.0,
+        }
 
-    return extracted
+
+def reset_fast_path_stats():
+    with _FAST_PATH_LOCK:
+        for k in FAST_PATH_STATS:
+            FAST_PATH_STATS[k] = 0
 
 
 
 # MAIN PARSER (RULES → LLM → MERGE)
 
-def parse_travel_intent(llm, user_query: str, temp_state: dict) -> dict:
+def parse_travel_intent(
+    llm,
+    user_query: str,
+    temp_state: dict,
+    today: date | None = None,
+    deadline: Deadline | None = None,
+    session_id: str | None = None,
+    admission: AdmissionController | None = None,
+) -> dict:
     """
     Bullet-proof intent parser:
-    - Rule-based FIRST
-    - LLM fills gaps ONLY
+    - Rule-based FIRST (each field scored with a confidence)
+    - Dates resolved deterministically, never by the LLM
+    - LLM only for low-confidence fields, or empty ones the rules
+      could not explain from the message
+    - LLM skipped or abandoned when the turn deadline runs out
+      (recorded as degraded stage "intent_llm")
+    - LLM skipped when admission control sheds the call under load
+      (recorded as degraded stage "intent_llm_shed")
     - Never overwrites
     """
 
     final = {}
+    low_confidence = set()
 
 
     #  RULE-BASED FIRST
 
-    rule_data = _rule_based_extract(user_query)
+    scored = _rule_based_extract_scored(user_query, today)
 
-    for k, v in rule_data.items():
+    for k, (v, confidence) in scored["fields"].items():
         if k not in temp_state:
             continue
-        if temp_state.get(k) is not None:
+        if k != "preferences" and temp_state.get(k) is not None:
             continue
 
         if k == "preferences":
@@ -155,16 +449,40 @@ def parse_travel_intent(llm, user_query: str, temp_state: dict) -> dict:
         else:
             final[k] = v
 
-    #  LLM (ONLY IF SOMETHING IS STILL MISSING)
+        if confidence < CONFIDENCE_THRESHOLD:
+            low_confidence.add(k)
+
+    #  LLM (ONLY FOR EMPTY OR LOW-CONFIDENCE SLOTS)
+    #  Empty slots only matter if the message says something the rules
+    #  could not explain; "two of us" is fully understood without a model.
 
     missing_keys = [
-        k for k in temp_state
-        if k not in ("preferences", "trip_type")
-        and temp_state.get(k) is None
+        k for k in INTENT_SLOTS
+        if temp_state.get(k) is None
         and k not in final
     ]
 
-    if missing_keys:
+    needs_llm = bool(low_confidence) or bool(missing_keys and scored["residual"])
+
+    if needs_llm and deadline and not deadline.allows(LLM_MIN_BUDGET_S):
+        deadline.degrade("intent_llm")
+        needs_llm = False
+
+    #  ADMISSION: queue for the LLM at most as long as the turn can
+    #  afford, otherwise the rule-based fields stand
+
+    shed = False
+    if needs_llm:
+        admission = admission or admission_controller(llm)
+        wait_s = deadline.remaining() - LLM_MIN_BUDGET_S if deadline and not deadline.unbounded else None
+        if not admission.try_acquire(session_id, timeout=wait_s):
+            if deadline:
+                deadline.degrade("intent_llm_shed")
+            needs_llm, shed = False, True
+
+    _record_turn(needs_llm, shed)
+
+    if needs_llm:
         prompt = f"""
         You are a travel intent extractor for a travel planning assistant.
 
@@ -176,7 +494,6 @@ def parse_travel_intent(llm, user_query: str, temp_state: dict) -> dict:
         ━━━━━━━━━━━━━━━━━━━━
         - source: Departure city or location (e.g., "Delhi", "Mumbai")
         - destination: Arrival city or location (e.g., "Goa", "Bangalore")
-        - travel_date: Travel date in YYYY-MM-DD format (must be a future date)
         - trip_type: One of ["one_way", "round_trip"]
         - days: Total number of days for the trip (integer)
         - travelers: Number of people traveling (integer)
@@ -190,7 +507,8 @@ def parse_travel_intent(llm, user_query: str, temp_state: dict) -> dict:
         - Extract information ONLY if it is explicitly mentioned or clearly implied.
         - If a field already has a value in the JSON state, DO NOT modify it.
         - If the user message is conversational, vague, or non-informational, return an empty JSON object {{}}.
-        - NEVER guess dates, days, travelers, budget, or locations.
+        - NEVER guess days, travelers, budget, or locations.
+        - Do NOT extract dates. Dates are resolved separately.
         - If no new information can be extracted, return {{}}.
         - Return ONLY valid JSON. No explanations. No markdown.
         - trip_type: One of ["one_way", "round_trip"]
@@ -206,9 +524,9 @@ def parse_travel_intent(llm, user_query: str, temp_state: dict) -> dict:
         
         
 
-        User: "Plan a trip to Goa from Delhi for 5 days starting June 15, 2025 with 2 people on a budget"
+        User: "Plan a trip to Goa from Delhi for 5 days with 2 people on a budget"
         Return:
-        {{"source":"Delhi","destination":"Goa","travel_date":"2025-06-15","days":5,"travelers":2,"preferences":{{"budget":"budget"}}}}
+        {{"source":"Delhi","destination":"Goa","days":5,"travelers":2,"preferences":{{"budget":"budget"}}}}
 
         User: "trip from mumbai to goa"
         Return: {{"source":"Mumbai","destination":"Goa"}}
@@ -231,19 +549,6 @@ def parse_travel_intent(llm, user_query: str, temp_state: dict) -> dict:
         User: "mid range"
         Return: {{"preferences":{{"budget":"mid-range"}}}}
 
-        ━━━━━━━━━━━━━━━━━━━━
-        DATE HANDLING
-        ━━━━━━━━━━━━━━━━━━━━
-
-        User: "starting July 1"
-        Return: {{"travel_date":"2025-07-01"}}
-
-        User: "next friday"
-        Return: {{"travel_date":"<future YYYY-MM-DD>"}}
-
-        User: "last monday"
-        Return: {{}}
-
         ━━━━━━━━━━━━━━━━━━━━
         NATURAL LANGUAGE
         ━━━━━━━━━━━━━━━━━━━━
@@ -277,12 +582,11 @@ def parse_travel_intent(llm, user_query: str, temp_state: dict) -> dict:
 
         
 
-        1) User: "Plan a trip to Goa from Delhi for 5 days starting June 15, 2025 with 2 people on a budget"
+        1) User: "Plan a trip to Goa from Delhi for 5 days with 2 people on a budget"
         Extract:
         {{
         "source": "Delhi",
         "destination": "Goa",
-        "travel_date": "2025-06-15",
         "days": 5,
         "travelers": 2,
         "preferences": {{"budget": "budget"}}
@@ -304,9 +608,9 @@ def parse_travel_intent(llm, user_query: str, temp_state: dict) -> dict:
         Extract:
         {{"days": 5}}
 
-        6) User: "starting July 1"
+        6) User: "the two of us"
         Extract:
-        {{"travel_date": "2025-07-01"}}
+        {{"travelers": 2}}
 
         7) User: "budget trip"
         Extract:
@@ -356,9 +660,9 @@ def parse_travel_intent(llm, user_query: str, temp_state: dict) -> dict:
         Extract:
         {{"source": "Delhi", "destination": "Goa"}}
 
-        18) User: "next friday"
+        18) User: "from goa"
         Extract:
-        {{"travel_date": "<resolve to future YYYY-MM-DD>"}}
+        {{"source": "Goa"}}
 
         19) User: "one week trip"
         Extract:
@@ -409,6 +713,8 @@ def parse_travel_intent(llm, user_query: str, temp_state: dict) -> dict:
             clean = {}
 
             for k, v in data.items():
+                if k in ("travel_date", "return_date"):
+                    continue
                 if isinstance(v, str):
                     if v.lower() in GENERIC_PHRASES:
                         continue
@@ -416,22 +722,39 @@ def parse_travel_intent(llm, user_query: str, temp_state: dict) -> dict:
 
             return clean
         
+        hold = _AdmissionHold(admission)
         try:
-            response = llm.invoke(prompt)
+            if deadline and not deadline.unbounded:
+                future = _LLM_POOL.submit(
+                    _call_llm, llm, prompt, user_query, missing_keys, hold, deadline, session_id
+                )
+                response = future.result(
+                    timeout=max(0.0, deadline.timeout(threading.TIMEOUT_MAX) - LLM_RESERVE_S)
+                )
+            else:
+                response = _call_llm(llm, prompt, user_query, missing_keys, hold, deadline, session_id)
             raw = response.content if hasattr(response, "content") else str(response)
             llm_data = _sanitize_llm_output(_extract_json(raw))
+        except FutureTimeout:
+            # Abandoned: its slot goes to the next caller (a streamed call
+            # also stops generating at the deadline)
+            hold.release()
+            deadline.degrade("intent_llm")
+            llm_data = {}
         except Exception:
             llm_data = {}
 
         for k, v in llm_data.items():
             if k not in temp_state:
                 continue
-            if temp_state.get(k) is not None:
+            if k != "preferences" and temp_state.get(k) is not None:
                 continue
-            if k in final:
+            if k in final and k not in low_confidence:
                 continue
 
             if k == "preferences":
+                if not isinstance(v, dict):
+                    continue
                 final.setdefault("preferences", {})
                 for pk, pv in v.items():
                     if temp_state["preferences"].get(pk) is None:
@@ -439,4 +762,7 @@ def parse_travel_intent(llm, user_query: str, temp_state: dict) -> dict:
             else:
                 final[k] = v
 
+    if final.get("preferences") == {}:
+        final.pop("preferences")
+
     return final
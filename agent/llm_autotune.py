@@ -0,0 +1,229 @@
+import argparse
+import os
+import time
+from datetime import datetime
+
+from agent.admission import AdmissionController
+from agent.intent_parser import parse_travel_intent
+from agent.model_registry import (
+    MODEL_VARIANTS,
+    DEFAULT_N_BATCH,
+    host_key,
+    host_profiles_path,
+    load_host_profile,
+    save_host_profile,
+)
+
+
+# Standard extraction workload: messages that reach the LLM
+WORKLOAD_MESSAGES = [
+    "plan a relaxing trip somewhere sunny with my family",
+    "we want to see beaches and try seafood, nothing too pricey",
+    "my parents and I are thinking of a quiet hill station getaway next month",
+    "somewhere with history and good street food, maybe for a long weekend",
+]
+
+DEFAULT_BATCHES = (64, 128, 256, 512)
+DEFAULT_MAX_TOKENS = 96
+DEFAULT_REPEATS = 2
+
+# Configurations this close to the fastest count as equally fast;
+# the one with the smallest context and fewest threads is kept.
+TIE_TOLERANCE = 0.03
+
+EMPTY_STATE = {
+    "started": False,
+    "source": None,
+    "destination": None,
+    "trip_type": None,
+    "travel_date": None,
+    "return_date": None,
+    "days": None,
+    "travelers": None,
+    "preferences": {"budget": None, "interests": []},
+    "return_resolved": False,
+}
+
+
+class _PromptCapture:
+    def __init__(self):
+        self.prompts = []
+
+    def invoke(self, prompt, **kwargs):
+        self.prompts.append(prompt)
+        return "{}"
+
+
+def workload_prompts(messages=WORKLOAD_MESSAGES) -> list[str]:
+    """
+    The exact prompts parse_travel_intent sends for the workload.
+    """
+    capture = _PromptCapture()
+    admission = AdmissionController(max_concurrent=1)
+    for message in messages:
+        parse_travel_intent(capture, message, dict(EMPTY_STATE), admission=admission)
+    return capture.prompts
+
+
+def default_threads() -> list[int]:
+    cpus = os.cpu_count() or 2
+    return sorted({max(1, cpus * k // 4) for k in (1, 2, 3, 4)})
+
+
+def _llama_factory(variant: dict, n_threads: int, n_batch: int, n_ctx: int):
+    from llama_cpp import Llama
+
+    return Llama(
+        model_path=variant["model_path"],
+        n_ctx=n_ctx,
+        n_batch=n_batch,
+        n_threads=n_threads,
+        verbose=False,
+    )
+
+
+# MEASUREMENT
+
+def measure(llm, prompts: list[str], max_tokens: int, repeats: int) -> dict:
+    """
+    Prompt-eval and generation throughput of one loaded configuration.
+    Each prompt runs twice from an empty cache: once for a single token
+    (≈ prompt eval) and once in full; generation is the difference.
+    """
+    prompt_tokens = gen_tokens = 0
+    prompt_s = gen_s = total_s = 0.0
+    runs = 0
+
+    for _ in range(repeats):
+        for prompt in prompts:
+            llm.reset()
+            started = time.perf_counter()
+            first = llm.create_completion(prompt, max_tokens=1, temperature=0)
+            eval_s = time.perf_counter() - started
+
+            llm.reset()
+            started = time.perf_counter()
+            full = llm.create_completion(prompt, max_tokens=max_tokens, temperature=0)
+            run_s = time.perf_counter() - started
+
+            prompt_tokens += first["usage"]["prompt_tokens"]
+            prompt_s += eval_s
+            generated = full["usage"]["completion_tokens"] - 1
+            if generated > 0:
+                gen_tokens += generated
+                gen_s += max(run_s - eval_s, 1e-6)
+            total_s += run_s
+            runs += 1
+
+    return {
+        "prompt_tps": round(prompt_tokens / prompt_s, 1) if prompt_s else 0.0,
+        "gen_tps": round(gen_tokens / gen_s, 1) if gen_s else 0.0,
+        "extraction_ms": round(total_s / runs * 1000, 1) if runs else 0.0,
+    }
+
+
+def tune_model(
+    variant: dict,
+    prompts: list[str],
+    threads,
+    batches,
+    contexts,
+    max_tokens: int = DEFAULT_MAX_TOKENS,
+    repeats: int = DEFAULT_REPEATS,
+    factory=_llama_factory,
+    log=print,
+) -> tuple[dict | None, list[dict]]:
+    """
+    Grid search for one model. Returns (best settings, all results).
+    Contexts the workload does not fit in are skipped.
+    """
+    results = []
+
+    for n_ctx in contexts:
+        for n_batch in batches:
+            if n_batch > n_ctx:
+                continue
+            for n_threads in threads:
+                config = {"n_threads": n_threads, "n_batch": n_batch, "n_ctx": n_ctx}
+                llm = None
+                try:
+                    llm = factory(variant, n_threads, n_batch, n_ctx)
+                    result = {**config, **measure(llm, prompts, max_tokens, repeats)}
+                except ValueError as e:
+                    # llama.cpp: prompt + max_tokens exceed the context window
+                    log(f"  skip {config}: {e}")
+                    break
+                finally:
+                    del llm
+
+                results.append(result)
+                log(
+                    f"  threads={n_threads:<3} batch={n_batch:<4} ctx={n_ctx:<5} "
+                    f"prompt={result['prompt_tps']:7.1f} tok/s  gen={result['gen_tps']:6.1f} tok/s  "
+                    f"extraction={result['extraction_ms']:8.1f} ms"
+                )
+
+    if not results:
+        return None, results
+
+    fastest = min(r["extraction_ms"] for r in results)
+    close = [r for r in results if r["extraction_ms"] <= fastest * (1 + TIE_TOLERANCE)]
+    best = min(close, key=lambda r: (r["n_ctx"], r["n_threads"], r["n_batch"]))
+    return best, results
+
+
+# CLI
+
+def _int_list(text: str) -> list[int]:
+    return [int(x) for x in text.split(",") if x.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tune llama.cpp threads, batch and context for this host")
+    parser.add_argument("--models", default=",".join(MODEL_VARIANTS))
+    parser.add_argument("--threads", type=_int_list, default=None)
+    parser.add_argument("--batch", type=_int_list, default=list(DEFAULT_BATCHES))
+    parser.add_argument("--ctx", type=_int_list, default=None, help="Default: the variant's n_ctx, 1024, 2048")
+    parser.add_argument("--max-tokens", type=int, default=DEFAULT_MAX_TOKENS)
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS)
+    parser.add_argument("--profiles", default=host_profiles_path())
+    parser.add_argument("--dry-run", action="store_true", help="Measure only, do not save")
+    args = parser.parse_args()
+
+    threads = args.threads or default_threads()
+    prompts = workload_prompts()
+    profile = load_host_profile(args.profiles)
+
+    print(f"Host {host_key()}: {len(prompts)} prompts, threads={threads}, batch={args.batch}")
+
+    for name in args.models.split(","):
+        variant = MODEL_VARIANTS.get(name)
+        if variant is None:
+            raise SystemExit(f"Unknown model '{name}'")
+        if not os.path.exists(variant["model_path"]):
+            print(f"{variant['label']}: not installed, skipped")
+            continue
+
+        contexts = args.ctx or sorted({variant["n_ctx"], 1024, 2048})
+        print(f"{variant['label']}:")
+        best, _ = tune_model(
+            variant, prompts, threads, args.batch, contexts,
+            max_tokens=args.max_tokens, repeats=args.repeats,
+        )
+        if best is None:
+            print("  no configuration fits the workload; try a larger --ctx")
+            continue
+
+        print(f"  best: threads={best['n_threads']} batch={best['n_batch']} ctx={best['n_ctx']} "
+              f"({best['extraction_ms']} ms per extraction, default batch was {DEFAULT_N_BATCH})")
+        profile[name] = {**best, "tuned_at": datetime.now().isoformat(timespec="seconds")}
+
+    if args.dry_run:
+        return
+
+    save_host_profile(profile, args.profiles)
+    print(f"Saved profile to {args.profiles}; the model registry applies it on next load")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+import hashlib
+import json
+import math
+import os
+import random
+import threading
+import time
+
+from agent.hedged_llm import response_text
+
+
+MODES = ("record", "replay", "strict")
+
+# Served in replay mode for prompts the cassette has never seen:
+# a valid extraction in which the model found nothing.
+DEFAULT_MISS_RESPONSE = "{}"
+
+
+class CassetteMissError(RuntimeError):
+    pass
+
+
+def prompt_key(prompt) -> str:
+    """
+    Stable hash of a prompt; whitespace differences do not matter.
+    """
+    normalized = " ".join(str(prompt).split())
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+# LATENCY MODELS
+
+def parse_latency(spec: str | None):
+    """
+    Synthetic latency for replayed responses, as fn(rng, recorded_ms) → ms.
+    - None / "none":             no delay
+    - "recorded":                the latency seen while recording
+    - "const:200"                always 200 ms
+    - "uniform:100:400"          uniform between 100 and 400 ms
+    - "normal:300:50"            mean 300 ms, sd 50 ms
+    - "lognormal:300:0.5"        median 300 ms, sigma 0.5 (long tail)
+    """
+    if not spec or spec == "none":
+        return None
+
+    kind, *args = spec.split(":")
+    try:
+        args = [float(a) for a in args]
+    except ValueError:
+        raise ValueError(f"Invalid latency spec: {spec!r}")
+
+    if kind == "recorded" and not args:
+        return lambda rng, recorded_ms: recorded_ms or 0.0
+    if kind == "const" and len(args) == 1:
+        return lambda rng, recorded_ms: args[0]
+    if kind == "uniform" and len(args) == 2:
+        return lambda rng, recorded_ms: rng.uniform(args[0], args[1])
+    if kind == "normal" and len(args) == 2:
+        return lambda rng, recorded_ms: max(0.0, rng.gauss(args[0], args[1]))
+    if kind == "lognormal" and len(args) == 2:
+        mu = math.log(args[0])
+        return lambda rng, recorded_ms: rng.lognormvariate(mu, args[1])
+
+    raise ValueError(f"Invalid latency spec: {spec!r}")
+
+
+# CASSETTE FILE
+
+class Cassette:
+    """
+    Prompt-hash → response store backed by a JSONL file.
+    Recording appends one line per new prompt, so several processes
+    can record into the same file.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries = {}
+
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self._entries[entry["key"]] = entry
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key: str) -> dict | None:
+        return self._entries.get(key)
+
+    def put(self, key: str, prompt, response: str, latency_ms: float):
+        entry = {
+            "key": key,
+            "response": response,
+            "latency_ms": round(latency_ms, 1),
+            "prompt": " ".join(str(prompt).split())[-200:],   # for humans only
+        }
+        with self._lock:
+            if key in self._entries:
+                return
+            self._entries[key] = entry
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+
+# CASSETTE LLM
+
+class CassetteLLM:
+    """
+    Drop-in wrapper around a load_llm() instance.
+    - record: calls the real model and stores every new prompt's response
+    - replay: serves stored responses; unseen prompts go to the real model
+      when there is one, otherwise get an empty extraction
+    - strict: serves stored responses; unseen prompts raise CassetteMissError
+    Replayed responses can be delayed by a synthetic latency model.
+    """
+
+    def __init__(
+        self,
+        cassette: Cassette,
+        mode: str = "replay",
+        inner=None,
+        latency: str | None = None,
+        seed: int | None = None,
+        miss_response: str = DEFAULT_MISS_RESPONSE,
+    ):
+        if mode not in MODES:
+            raise ValueError(f"Unknown cassette mode: {mode!r}")
+        if mode == "record" and inner is None:
+            raise ValueError("Record mode needs a model to record from")
+
+        self.cassette = cassette
+        self.mode = mode
+        self.inner = inner
+        self.miss_response = miss_response
+        self._latency = parse_latency(latency)
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._stats = {"calls": 0, "hits": 0, "misses": 0, "recorded": 0}
+
+    def _count(self, key: str):
+        with self._lock:
+            self._stats[key] += 1
+
+    def _delay(self, recorded_ms: float | None):
+        if self._latency is None:
+            return
+        with self._lock:
+            ms = self._latency(self._rng, recorded_ms)
+        time.sleep(ms / 1000)
+
+    def _call_inner(self, prompt, user_query, missing_keys, kwargs) -> str:
+        invoke_for_intent = getattr(self.inner, "invoke_for_intent", None)
+        if invoke_for_intent and user_query is not None:
+            return response_text(invoke_for_intent(prompt, user_query, missing_keys, **kwargs))
+        return response_text(self.inner.invoke(prompt, **kwargs))
+
+    def invoke_for_intent(self, prompt, user_query: str = "", missing_keys=(), **kwargs) -> str:
+        return self._invoke(prompt, user_query, missing_keys, kwargs)
+
+    def invoke(self, prompt, **kwargs) -> str:
+        return self._invoke(prompt, None, (), kwargs)
+
+    def _invoke(self, prompt, user_query, missing_keys, kwargs) -> str:
+        self._count("calls")
+        key = prompt_key(prompt)
+        entry = self.cassette.get(key)
+
+        if entry is not None and self.mode != "record":
+            self._count("hits")
+            self._delay(entry.get("latency_ms"))
+            return entry["response"]
+
+        if self.mode == "strict":
+            self._count("misses")
+            raise CassetteMissError(f"Prompt not in cassette {self.cassette.path}: {key[:12]}")
+
+        if self.mode == "replay":
+            self._count("misses")
+            if self.inner is None:
+                self._delay(None)
+                return self.miss_response
+            return self._call_inner(prompt, user_query, missing_keys, kwargs)
+
+        # Record
+        if entry is not None:
+            self._count("hits")
+        started = time.perf_counter()
+        text = self._call_inner(prompt, user_query, missing_keys, kwargs)
+        if entry is None:
+            self.cassette.put(key, prompt, text, (time.perf_counter() - started) * 1000)
+            self._count("recorded")
+        return text
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+        stats["mode"] = self.mode
+        stats["entries"] = len(self.cassette)
+        return stats
+
+    def __repr__(self):
+        return f"CassetteLLM({self.mode}, {self.cassette.path!r})"
+
+
+def cassette_config_from_env() -> dict | None:
+    """
+    - LLM_CASSETTE: cassette file (JSONL)
+    - LLM_CASSETTE_MODE: record | replay | strict (default replay)
+    - LLM_CASSETTE_LATENCY: synthetic latency spec, see parse_latency
+    - LLM_CASSETTE_SEED: seed for the latency model
+    """
+    path = os.getenv("LLM_CASSETTE")
+    if not path:
+        return None
+
+    mode = os.getenv("LLM_CASSETTE_MODE", "replay")
+    if mode not in MODES:
+        raise ValueError(f"LLM_CASSETTE_MODE must be one of {MODES}, got {mode!r}")
+
+    seed = os.getenv("LLM_CASSETTE_SEED")
+    return {
+        "path": path,
+        "mode": mode,
+        "latency": os.getenv("LLM_CASSETTE_LATENCY"),
+        "seed": int(seed) if seed else None,
+    }
@@ -1,153 +1,231 @@
 import os
 import streamlit as st
 from dotenv import load_dotenv
-from langchain_community.llms import LlamaCpp
-from langchain_huggingface import HuggingFaceEndpoint, ChatHuggingFace
 
-load_dotenv()
+from agent.model_registry import ModelRegistry
+from agent.inference_server import configured_socket_path, client_model_info
+from agent.llm_scheduler import LLMScheduler
+from agent.hedged_llm import HedgedLLM
+from agent.remote_llm import RemoteLLM, FallbackLLM, remote_from_env
+from agent.model_router import ModelRouter, ROUTE_ORDER
+from agent.llm_cassette import Cassette, CassetteLLM, cassette_config_from_env
 
-PHI_MODEL_PATH = "llm_models/phi-3-mini-4k-instruct-q4.gguf"
-QWEN_MODEL_PATH = "llm_models/qwen2.5-3b-instruct-q4_k_m.gguf"
+load_dotenv()
 
+# SERVER-LEVEL CACHE (ONE-TIME LOAD)
 
+@st.cache_resource(show_spinner=False)
+def get_model_registry() -> ModelRegistry:
+    registry = ModelRegistry()
+    registry.start_reaper()
+    return registry
 
-# SERVER-LEVEL CACHE (ONE-TIME LOAD)
 
 @st.cache_resource(show_spinner=False)
 def preload_local_models():
-    cpu_threads = max(1, os.cpu_count() // 2)
+    registry = get_model_registry()
 
     models = {}
-    system_status = {
-        "phi_loaded": False,
-        "qwen_loaded": False,
-        "phi_error": None,
-        "qwen_error": None,
+    system_status = {}
+    for name in registry.variants:
+        system_status[f"{name}_loaded"] = False
+        system_status[f"{name}_error"] = None
+
+    # Only the variants that fit the RAM budget together are warmed up;
+    # the rest stay available on demand through the registry.
+
+    for name in registry.plan():
+        label = registry.variants[name]["label"]
+        with st.spinner(f" Loading {label} Model..."):
+            try:
+                registry.acquire(name)
+                models[name] = registry.model_info(name)
+                system_status[f"{name}_loaded"] = True
+
+            except Exception as e:
+                system_status[f"{name}_error"] = str(e)
+
+    for name in registry.variants:
+        if name not in models and not registry.is_installed(name):
+            system_status[f"{name}_error"] = (
+                f"Model file not found: {registry.variants[name]['model_path']}"
+            )
+
+    return {
+        "models": models,
+        "system_status": system_status
     }
 
- 
-    # PHI MODEL
-
-    with st.spinner(" Loading Phi-3 Mini Model..."):
-        try:
-            phi = LlamaCpp(
-                model_path=PHI_MODEL_PATH,
-                n_ctx=1024,
-                n_batch=128,
-                n_threads=cpu_threads,
-                temperature=0.2,
-                top_p=0.9,
-                repeat_penalty=1.1,
-                verbose=False,
-            )
 
-            phi.invoke("""
-                You are a travel intent extractor.
-                Extract travel details from:
-                "Plan a trip to Goa from Delhi for 5 days with 2 people."
-                Return JSON only.
-                """)
-            models["phi"] = {
-                "instance": phi,
-                "provider": "Local",
-                "model_name": "phi-3-mini-4k-q4",
-                "status": "loaded",
-            }
-            system_status["phi_loaded"] = True
-
-        except Exception as e:
-            system_status["phi_error"] = str(e)
-
-    # QWEN MODEL
-
-    with st.spinner(" Loading Qwen 2.5 Model..."):
-        try:
-            qwen = LlamaCpp(
-                model_path=QWEN_MODEL_PATH,
-                n_ctx=768,
-                n_batch=128,
-                n_threads=cpu_threads,
-                temperature=0.15,
-                top_p=0.85,
-                repeat_penalty=1.05,
-                verbose=False,
-            )
+@st.cache_resource(show_spinner=False)
+def get_model_scheduler(name: str) -> LLMScheduler:
+    """
+    One scheduler per local model, shared by every session in the process,
+    so concurrent extractions never hit the same llama.cpp context at once.
+    """
+    registry = get_model_registry()
+    return LLMScheduler(registry.model_info(name)["instance"])
+
+
+@st.cache_resource(show_spinner=False)
+def get_remote_llm() -> RemoteLLM | None:
+    """
+    One remote client per process: pooled connections and a single
+    circuit breaker shared by every session.
+    """
+    return remote_from_env()
+
+
+@st.cache_resource(show_spinner=False)
+def get_hedged_llm(local_model_choice: str | None) -> HedgedLLM:
+    """
+    One hedged client per local model: a single worker pool, and one
+    latency window that fills up across sessions, so the percentile
+    hedge delay is actually in use.
+    """
+    local = _resolve_local_model(local_model_choice)
+    return HedgedLLM(get_remote_llm(), local["instance"])
+
+
+def _resolve_local_model(local_model_choice: str | None):
+    # Shared daemon owns the weights → this process only needs a client
+    socket_path = configured_socket_path()
+    if socket_path:
+        return client_model_info(socket_path, local_model_choice)
+
+    preload_local_models()
+    registry = get_model_registry()
+    name = registry.resolve(local_model_choice)
+
+    if not registry.is_installed(name):
+        raise RuntimeError(
+            f"Requested model '{local_model_choice or name}' is not available"
+        )
+
+    info = registry.model_info(name)
+    info["instance"] = get_model_scheduler(name)
+    return info
+
+
+
+def _build_router() -> dict | None:
+    """
+    Every available backend behind one ModelRouter (LLM_ROUTER=1).
+    """
+    backends = {}
+    socket_path = configured_socket_path()
+    registry = get_model_registry()
+
+    for name in ROUTE_ORDER:
+        if name == "remote":
+            remote = get_remote_llm()
+            if remote:
+                backends[name] = remote
+        elif socket_path:
+            backends[name] = client_model_info(socket_path, name)["instance"]
+        elif name in registry.variants and registry.is_installed(name):
+            backends[name] = get_model_scheduler(name)
+
+    if not backends:
+        return None
+
+    return {
+        "instance": get_model_router(tuple(backends), backends),
+        "provider": "Router",
+        "model_name": " → ".join(backends),
+        "status": "adaptive",
+    }
+
+
+@st.cache_resource(show_spinner=False)
+def get_model_router(names: tuple, _backends: dict) -> ModelRouter:
+    """
+    One router per backend set, so what it learns is shared by all sessions.
+    """
+    return ModelRouter(_backends)
 
-            qwen.invoke("""
-                You are a travel intent extractor.
-                Extract travel details from:
-                "Plan a trip to Goa from Delhi for 5 days with 2 people."
-                Return JSON only.
-                """)
-            models["qwen"] = {
-                "instance": qwen,
-                "provider": "Local",
-                "model_name": "qwen2.5-3b-q4",
-                "status": "loaded",
-            }
-            system_status["qwen_loaded"] = True
-
-        except Exception as e:
-            system_status["qwen_error"] = str(e)
-
-        return {
-            "models": models,
-            "system_status": system_status
-        }
 
+@st.cache_resource(show_spinner=False)
+def get_cassette(path: str) -> Cassette:
+    """
+    One cassette per file, so concurrent sessions record into one store.
+    """
+    return Cassette(path)
 
 
 # MAIN LOADER
 
 def load_llm(force_local: bool = False, local_model_choice: str | None = None):
+    """
+    LLM_CASSETTE set → the model is wrapped in a CassetteLLM. Replay and
+    strict modes load no model at all (offline, deterministic runs).
+    """
+    config = cassette_config_from_env()
+    if not config:
+        return _load_llm(force_local, local_model_choice)
+
+    cassette = get_cassette(config["path"])
+    if config["mode"] == "record":
+        info = dict(_load_llm(force_local, local_model_choice))
+        info["instance"] = CassetteLLM(cassette, "record", inner=info["instance"])
+        info["status"] = f"{info['status']} (recording)"
+        return info
+
+    return {
+        "instance": CassetteLLM(
+            cassette,
+            config["mode"],
+            latency=config["latency"],
+            seed=config["seed"],
+        ),
+        "provider": "Cassette",
+        "model_name": os.path.basename(config["path"]),
+        "status": config["mode"],
+    }
 
 
-    preload = preload_local_models()
-    models = preload["models"]
+def _load_llm(force_local: bool, local_model_choice: str | None):
 
     if force_local:
-        if local_model_choice not in models:
-            raise RuntimeError(
-                f"Requested model '{local_model_choice}' is not available"
-            )
-        return models[local_model_choice]
-    hf_token = os.getenv("HUGGINGFACEHUB_API_TOKEN")
+        return _resolve_local_model(local_model_choice)
+
+    if os.getenv("LLM_ROUTER") == "1":
+        routed = _build_router()
+        if routed:
+            return routed
 
  
-    # Try HuggingFace API
- 
-    if not force_local and hf_token:
-        try:
-            endpoint = HuggingFaceEndpoint(
-                repo_id="mistralai/Mistral-7B-Instruct-v0.2",
-                task="conversational",
-                huggingfacehub_api_token=hf_token,
-                temperature=0.2,
-                max_new_tokens=512,
-            )
+    # Remote API (pooled client, circuit breaker → local)
+
+    remote = get_remote_llm()
+    if remote:
+        info = {
+            "instance": FallbackLLM(
+                remote,
+                lambda: _resolve_local_model(local_model_choice)["instance"],
+            ),
+            "provider": "HuggingFace",
+            "model_name": remote.repo_id,
+            "status": "connected" if remote.healthy() else "circuit open",
+        }
 
-            return {
-                "instance": ChatHuggingFace(llm=endpoint),
-                "provider": "HuggingFace",
-                "model_name": "mistralai/Mistral-7B-Instruct-v0.2",
-                "status": "connected",
-            }
+        # LLM_HEDGE=1 → a slow endpoint is backed up by the local model
+        if os.getenv("LLM_HEDGE") == "1":
+            try:
+                info["instance"] = get_hedged_llm(local_model_choice)
+                info["provider"] = "HuggingFace + Local (hedged)"
+            except RuntimeError:
+                pass
 
-        except Exception:
-            pass  
+        return info
 
  
     # LOCAL FALLBACK
 
-    preload = preload_local_models()
-    models = preload["models"]
-
-    choice = local_model_choice or "phi"
-
-    if choice not in models:
+    try:
+        return _resolve_local_model(local_model_choice)
+    except RuntimeError:
         raise RuntimeError("No usable local model found")
 
-    return models[choice]
-
 
 
@@ -0,0 +1,240 @@
+import inspect
+import queue
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+
+
+DEFAULT_MAX_BATCH = 4
+DEFAULT_BATCH_WINDOW_S = 0.005
+WAIT_SAMPLES = 1000
+
+_END = object()
+
+
+def session_kwargs(fn, session_id: str | None) -> dict:
+    """
+    {"session_id": session_id} for callables that take one (schedulers,
+    which serve sessions round-robin), {} for plain backends.
+    """
+    if session_id is None:
+        return {}
+    try:
+        accepted = "session_id" in inspect.signature(fn).parameters
+    except (TypeError, ValueError):
+        accepted = False
+    return {"session_id": session_id} if accepted else {}
+
+
+class _Request:
+    def __init__(self, prompt, kwargs: dict, stream: bool = False):
+        self.prompt = prompt
+        self.kwargs = kwargs
+        self.future = Future()
+        self.enqueued_at = time.perf_counter()
+
+        # Streaming: chunks are handed over through a queue, and the
+        # consumer can stop generation by setting `cancelled`
+        self.stream = stream
+        self.chunks = queue.SimpleQueue() if stream else None
+        self.cancelled = threading.Event()
+
+
+class LLMScheduler:
+    """
+    Single entry point for every call into one LLM backend.
+    - Concurrent callers are queued; each gets a Future
+    - Backends that evaluate several sequences at once receive batches
+    - Otherwise requests run one at a time, round-robin across sessions
+    - Queue wait time and batch size are recorded
+    """
+
+    def __init__(
+        self,
+        llm,
+        max_batch: int = DEFAULT_MAX_BATCH,
+        batch_window_s: float = DEFAULT_BATCH_WINDOW_S,
+        batch_fn=None,
+    ):
+        self.llm = llm
+
+        # Batch only when the backend really evaluates prompts together.
+        # Runnable.batch on LlamaCpp just fans out threads over one context.
+        if batch_fn is None and getattr(llm, "supports_batching", False):
+            batch_fn = llm.batch
+        self.batch_fn = batch_fn
+        self.max_batch = max_batch if batch_fn else 1
+        self.batch_window_s = batch_window_s
+
+        self._queues = OrderedDict()   # session -> deque[_Request]
+        self._pending = 0
+        self._cond = threading.Condition()
+        self._worker = None
+
+        self._requests = 0
+        self._batches = 0
+        self._max_batch_seen = 0
+        self._waits_ms = deque(maxlen=WAIT_SAMPLES)
+
+    # Public API
+
+    def submit(self, prompt, session_id: str | None = None, **kwargs) -> Future:
+        return self._enqueue(_Request(prompt, kwargs), session_id)
+
+    def _enqueue(self, request: _Request, session_id: str | None) -> Future:
+        # Anonymous requests each get their own lane → plain FIFO
+        key = session_id if session_id is not None else id(request)
+
+        with self._cond:
+            self._queues.setdefault(key, deque()).append(request)
+            self._pending += 1
+            self._ensure_worker()
+            self._cond.notify()
+
+        return request.future
+
+    def invoke(self, prompt, session_id: str | None = None, **kwargs):
+        return self.submit(prompt, session_id=session_id, **kwargs).result()
+
+    def stream(self, prompt, session_id: str | None = None, **kwargs):
+        """
+        Yields generated text chunks. Closing the generator early stops
+        generation at the next token and frees the backend.
+        """
+        request = _Request(prompt, kwargs, stream=True)
+        self._enqueue(request, session_id)
+        try:
+            while True:
+                chunk = request.chunks.get()
+                if chunk is _END:
+                    break
+                yield chunk
+            request.future.result()   # surface backend errors
+        finally:
+            request.cancelled.set()
+
+    @property
+    def batching(self) -> bool:
+        return self.batch_fn is not None
+
+    def stats(self) -> dict:
+        with self._cond:
+            waits = sorted(self._waits_ms)
+            batches = self._batches
+
+            def pct(p):
+                if not waits:
+                    return 0.0
+                return round(waits[min(len(waits) - 1, int(p * len(waits)))], 3)
+
+            return {
+                "queue_depth": self._pending,
+                "requests": self._requests,
+                "batches": batches,
+                "batching": self.batching,
+                "avg_batch_size": round(self._requests / batches, 2) if batches else 0.0,
+                "max_batch_size": self._max_batch_seen,
+                "queue_wait_ms": {
+                    "avg": round(sum(waits) / len(waits), 3) if waits else 0.0,
+                    "p50": pct(0.50),
+                    "p95": pct(0.95),
+                    "max": round(waits[-1], 3) if waits else 0.0,
+                },
+            }
+
+    # Dispatch
+
+    def _ensure_worker(self):
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(
+                target=self._run, name="llm-scheduler", daemon=True
+            )
+            self._worker.start()
+
+    def _next_batch(self) -> list:
+        """
+        Round-robin: take one request per session, rotating the session
+        order, until the batch is full.
+        """
+        batch = []
+        while self._queues and len(batch) < self.max_batch:
+            key, lane = next(iter(self._queues.items()))
+            batch.append(lane.popleft())
+            self._queues.pop(key)
+            if lane:
+                self._queues[key] = lane   # back of the rotation
+        self._pending -= len(batch)
+        return batch
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+
+                # Give concurrent callers a moment to join the batch
+                if self.batch_fn and self._pending < self.max_batch:
+                    self._cond.wait(self.batch_window_s)
+
+                batch = self._next_batch()
+
+                started = time.perf_counter()
+                for r in batch:
+                    self._waits_ms.append((started - r.enqueued_at) * 1000)
+                self._requests += len(batch)
+                self._batches += 1
+                self._max_batch_seen = max(self._max_batch_seen, len(batch))
+
+            self._execute(batch)
+
+    def _execute(self, batch: list):
+        live = [r for r in batch if r.future.set_running_or_notify_cancel()]
+        if not live:
+            return
+
+        streams = [r for r in live if r.stream]
+        live = [r for r in live if not r.stream]
+        for r in streams:
+            self._execute_stream(r)
+
+        if self.batch_fn and len(live) > 1:
+            try:
+                results = self.batch_fn([r.prompt for r in live])
+                for r, result in zip(live, results):
+                    r.future.set_result(result)
+            except Exception as e:
+                for r in live:
+                    r.future.set_exception(e)
+            return
+
+        for r in live:
+            try:
+                r.future.set_result(self.llm.invoke(r.prompt, **r.kwargs))
+            except Exception as e:
+                r.future.set_exception(e)
+
+    def _execute_stream(self, r: _Request):
+        stream = getattr(self.llm, "stream", None)
+        try:
+            if r.cancelled.is_set():
+                pass   # consumer gave up while queued
+            elif stream is None:
+                r.chunks.put(self.llm.invoke(r.prompt, **r.kwargs))
+            else:
+                chunks = stream(r.prompt, **r.kwargs)
+                try:
+                    for chunk in chunks:
+                        if r.cancelled.is_set():
+                            break
+                        r.chunks.put(chunk)
+                finally:
+                    chunks.close()
+            r.future.set_result(None)
+        except Exception as e:
+            r.future.set_exception(e)
+        finally:
+            r.chunks.put(_END)
+
+    def __repr__(self):
+        return f"LLMScheduler({self.llm!r})"
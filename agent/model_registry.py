@@ -0,0 +1,424 @@
+import gc
+import json
+import os
+import platform
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from langchain_community.llms import LlamaCpp
+
+
+# GGUF VARIANTS
+#
+# weights_mb   -> fallback size when the file is not on disk yet
+# kv_kb_per_token -> f16 KV cache cost (layers * kv_dim * 2 * 2 bytes)
+
+MODEL_VARIANTS = {
+    "phi": {
+        "label": "Phi-3 Mini",
+        "model_path": "llm_models/phi-3-mini-4k-instruct-q4.gguf",
+        "model_name": "phi-3-mini-4k-q4",
+        "family": "phi-3-mini-4k-instruct",
+        "quantization": "q4",
+        "n_ctx": 1024,
+        "weights_mb": 2320,
+        "kv_kb_per_token": 384,
+        "params": {
+            "temperature": 0.2,
+            "top_p": 0.9,
+            "repeat_penalty": 1.1,
+        },
+    },
+    "qwen": {
+        "label": "Qwen 2.5",
+        "model_path": "llm_models/qwen2.5-3b-instruct-q4_k_m.gguf",
+        "model_name": "qwen2.5-3b-q4",
+        "family": "qwen2.5-3b-instruct",
+        "quantization": "q4_k_m",
+        "n_ctx": 768,
+        "weights_mb": 2020,
+        "kv_kb_per_token": 36,
+        "params": {
+            "temperature": 0.15,
+            "top_p": 0.85,
+            "repeat_penalty": 1.05,
+        },
+    },
+}
+
+DEFAULT_MODEL = "phi"
+
+# Runtime scratch buffers llama.cpp allocates on top of weights + KV
+RUNTIME_OVERHEAD_MB = 150
+
+DEFAULT_RAM_BUDGET_MB = 6144
+DEFAULT_IDLE_TIMEOUT_S = 900
+
+DEFAULT_N_BATCH = 128
+
+# Per-host llama.cpp settings written by `python -m agent.llm_autotune`
+DEFAULT_HOST_PROFILES = "llm_models/host_profiles.json"
+TUNED_KEYS = ("n_threads", "n_batch", "n_ctx")
+
+WARMUP_PROMPT = """
+                You are a travel intent extractor.
+                Extract travel details from:
+                "Plan a trip to Goa from Delhi for 5 days with 2 people."
+                Return JSON only.
+                """
+
+
+def _env_number(name: str, default: float) -> float:
+    value = os.getenv(name)
+    if not value:
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        return default
+
+
+# HOST PROFILES
+#
+# {host_key: {variant_name: {"n_threads", "n_batch", "n_ctx", ...}}}
+
+def host_key() -> str:
+    return f"{platform.node()}|{platform.machine()}|{os.cpu_count()}cpu"
+
+
+def host_profiles_path() -> str:
+    return os.getenv("LLM_HOST_PROFILES", DEFAULT_HOST_PROFILES)
+
+
+def load_host_profile(path: str | None = None, key: str | None = None) -> dict:
+    """
+    Tuned settings of this host, per variant ({} when never tuned).
+    """
+    path = path or host_profiles_path()
+    try:
+        with open(path, encoding="utf-8") as f:
+            profiles = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return profiles.get(key or host_key(), {})
+
+
+def save_host_profile(profile: dict, path: str | None = None, key: str | None = None):
+    """
+    Stores this host's settings, keeping the other hosts' entries.
+    """
+    path = path or host_profiles_path()
+    try:
+        with open(path, encoding="utf-8") as f:
+            profiles = json.load(f)
+    except (OSError, ValueError):
+        profiles = {}
+
+    profiles[key or host_key()] = profile
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(profiles, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def apply_profile(variants: dict, profile: dict) -> dict:
+    """
+    Copies of the variants with the tuned settings filled in.
+    """
+    tuned = {}
+    for name, variant in variants.items():
+        settings = profile.get(name, {})
+        tuned[name] = {
+            **variant,
+            **{k: settings[k] for k in TUNED_KEYS if k in settings},
+            "tuned": any(k in settings for k in TUNED_KEYS),
+        }
+    return tuned
+
+
+def _load_llama(variant: dict, n_threads: int):
+    llm = LlamaCpp(
+        model_path=variant["model_path"],
+        n_ctx=variant["n_ctx"],
+        n_batch=variant.get("n_batch", DEFAULT_N_BATCH),
+        n_threads=variant.get("n_threads", n_threads),
+        verbose=False,
+        **variant["params"],
+    )
+    llm.invoke(WARMUP_PROMPT)
+    return llm
+
+
+# MANAGED HANDLE
+#
+# Agents keep this handle instead of the LlamaCpp object, so the registry
+# stays free to unload the real model while a session sits idle.
+
+class ManagedModel:
+    def __init__(self, registry: "ModelRegistry", name: str):
+        self.registry = registry
+        self.name = name
+
+    def invoke(self, prompt, **kwargs):
+        with self.registry.use(self.name) as llm:
+            return llm.invoke(prompt, **kwargs)
+
+    def stream(self, prompt, **kwargs):
+        with self.registry.use(self.name) as llm:
+            yield from llm.stream(prompt, **kwargs)
+
+    def __repr__(self):
+        return f"ManagedModel({self.name!r})"
+
+
+# REGISTRY
+
+class ModelRegistry:
+    """
+    Keeps local GGUF models resident under a RAM budget.
+    - Variants describe model, quantization, context size and footprint
+    - Models load on demand; least recently used idle ones make room
+    - Models idle longer than the threshold are unloaded
+    - Threads, batch and context size come from this host's tuned
+      profile when there is one
+    """
+
+    def __init__(
+        self,
+        variants: dict | None = None,
+        ram_budget_mb: float | None = None,
+        idle_timeout_s: float | None = None,
+        loader=None,
+        profile: dict | None = None,
+    ):
+        self.profile = load_host_profile() if profile is None else profile
+        self.variants = apply_profile(variants or MODEL_VARIANTS, self.profile)
+        self.ram_budget_mb = (
+            ram_budget_mb if ram_budget_mb is not None
+            else _env_number("LLM_RAM_BUDGET_MB", DEFAULT_RAM_BUDGET_MB)
+        )
+        self.idle_timeout_s = (
+            idle_timeout_s if idle_timeout_s is not None
+            else _env_number("LLM_IDLE_TIMEOUT_S", DEFAULT_IDLE_TIMEOUT_S)
+        )
+        self.n_threads = max(1, (os.cpu_count() or 2) // 2)
+        self._loader = loader or (lambda variant: _load_llama(variant, self.n_threads))
+
+        self._lock = threading.RLock()
+        self._loaded = {}      # name -> instance
+        self._last_used = {}   # name -> monotonic timestamp
+        self._in_use = {}      # name -> active invocations
+        self._loading = {}     # name -> Event set once its load ends
+        self._errors = {}
+        self._reaper = None
+
+    # Footprint
+
+    def is_installed(self, name: str) -> bool:
+        return name in self.variants and Path(self.variants[name]["model_path"]).exists()
+
+    def footprint_mb(self, name: str) -> float:
+        variant = self.variants[name]
+        path = Path(variant["model_path"])
+        weights_mb = (
+            path.stat().st_size / (1024 * 1024) if path.exists()
+            else variant["weights_mb"]
+        )
+        kv_mb = variant["n_ctx"] * variant["kv_kb_per_token"] / 1024
+        return round(weights_mb + kv_mb + RUNTIME_OVERHEAD_MB, 1)
+
+    def resident_mb(self) -> float:
+        with self._lock:
+            return sum(self.footprint_mb(n) for n in self._loaded)
+
+    def _committed_mb(self) -> float:
+        # Resident models plus the ones loading right now
+        return self.resident_mb() + sum(self.footprint_mb(n) for n in self._loading)
+
+    # Selection
+
+    def resolve(self, choice: str | None) -> str:
+        name = (choice or DEFAULT_MODEL).lower().strip()
+        if name not in self.variants:
+            raise RuntimeError(f"Requested model '{choice}' is not available")
+        return name
+
+    def plan(self, preferred: list[str] | None = None) -> list[str]:
+        """
+        Installed variants that fit the RAM budget together,
+        in preference order (default model first).
+        """
+        order = preferred or sorted(
+            self.variants, key=lambda n: (n != DEFAULT_MODEL, n)
+        )
+
+        selected = []
+        used = 0.0
+        for name in order:
+            if not self.is_installed(name):
+                continue
+            size = self.footprint_mb(name)
+            if used + size <= self.ram_budget_mb:
+                selected.append(name)
+                used += size
+
+        return selected
+
+    # Loading / eviction
+
+    def acquire(self, name: str, hold: bool = False):
+        """
+        The loaded model, loading it first when needed. The load runs
+        outside the registry lock: other models stay usable meanwhile,
+        and concurrent callers of the same model wait for the one load.
+        With hold=True the model is marked in use before it is returned.
+        """
+        while True:
+            with self._lock:
+                self._last_used[name] = time.monotonic()
+                if name in self._loaded:
+                    if hold:
+                        self._in_use[name] = self._in_use.get(name, 0) + 1
+                    return self._loaded[name]
+
+                loading = self._loading.get(name)
+                if loading is None:
+                    if not self.is_installed(name):
+                        raise RuntimeError(
+                            f"Model file not found: {self.variants[name]['model_path']}"
+                        )
+                    self._make_room(self.footprint_mb(name), keep=name)
+                    self._loading[name] = threading.Event()
+
+            if loading is not None:
+                # Another caller is loading it: wait, then use its result
+                loading.wait()
+                with self._lock:
+                    if name not in self._loaded and name in self._errors:
+                        raise RuntimeError(self._errors[name])
+                continue
+
+            try:
+                instance = self._loader(self.variants[name])
+            except Exception as e:
+                with self._lock:
+                    self._errors[name] = str(e)
+                    self._loading.pop(name).set()
+                raise
+
+            with self._lock:
+                self._errors.pop(name, None)
+                self._loaded[name] = instance
+                self._last_used[name] = time.monotonic()
+                if hold:
+                    self._in_use[name] = self._in_use.get(name, 0) + 1
+                self._loading.pop(name).set()
+                return instance
+
+    @contextmanager
+    def use(self, name: str):
+        """Holds the model resident for the duration of one call."""
+        instance = self.acquire(name, hold=True)
+        try:
+            yield instance
+        finally:
+            with self._lock:
+                self._in_use[name] -= 1
+                self._last_used[name] = time.monotonic()
+
+    def _make_room(self, needed_mb: float, keep: str):
+        if needed_mb > self.ram_budget_mb:
+            raise RuntimeError(
+                f"Model '{keep}' needs {needed_mb:.0f} MB, "
+                f"over the {self.ram_budget_mb:.0f} MB budget"
+            )
+
+        idle = sorted(
+            (n for n in self._loaded if n != keep and not self._in_use.get(n)),
+            key=lambda n: self._last_used.get(n, 0),
+        )
+        while self._committed_mb() + needed_mb > self.ram_budget_mb:
+            if not idle:
+                raise RuntimeError(
+                    f"Not enough model memory for '{keep}' "
+                    f"({self._committed_mb():.0f} MB in use)"
+                )
+            self.unload(idle.pop(0))
+
+    def unload(self, name: str) -> bool:
+        with self._lock:
+            if self._in_use.get(name):
+                return False
+            instance = self._loaded.pop(name, None)
+        if instance is None:
+            return False
+        del instance
+        gc.collect()
+        return True
+
+    def evict_idle(self, now: float | None = None) -> list[str]:
+        now = now if now is not None else time.monotonic()
+        with self._lock:
+            stale = [
+                n for n in self._loaded
+                if not self._in_use.get(n)
+                and now - self._last_used.get(n, now) > self.idle_timeout_s
+            ]
+        return [n for n in stale if self.unload(n)]
+
+    def start_reaper(self, interval_s: float | None = None):
+        if self._reaper is not None:
+            return
+        interval = interval_s or max(5.0, self.idle_timeout_s / 4)
+
+        def _loop():
+            while True:
+                time.sleep(interval)
+                self.evict_idle()
+
+        self._reaper = threading.Thread(
+            target=_loop, name="model-registry-reaper", daemon=True
+        )
+        self._reaper.start()
+
+    # Info
+
+    def model_info(self, name: str) -> dict:
+        variant = self.variants[name]
+        return {
+            "instance": ManagedModel(self, name),
+            "provider": "Local",
+            "model_name": variant["model_name"],
+            "status": "loaded" if name in self._loaded else "on_demand",
+        }
+
+    def status(self) -> dict:
+        with self._lock:
+            now = time.monotonic()
+            return {
+                "ram_budget_mb": self.ram_budget_mb,
+                "resident_mb": self.resident_mb(),
+                "idle_timeout_s": self.idle_timeout_s,
+                "models": {
+                    name: {
+                        "label": v["label"],
+                        "quantization": v["quantization"],
+                        "n_ctx": v["n_ctx"],
+                        "n_batch": v.get("n_batch", DEFAULT_N_BATCH),
+                        "n_threads": v.get("n_threads", self.n_threads),
+                        "tuned": v.get("tuned", False),
+                        "footprint_mb": self.footprint_mb(name),
+                        "installed": self.is_installed(name),
+                        "loaded": name in self._loaded,
+                        "idle_s": (
+                            round(now - self._last_used[name], 1)
+                            if name in self._last_used else None
+                        ),
+                        "error": self._errors.get(name),
+                    }
+                    for name, v in self.variants.items()
+                },
+            }
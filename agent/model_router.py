@@ -0,0 +1,226 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+
+from agent.hedged_llm import is_valid_intent
+from agent.llm_scheduler import session_kwargs
+
+
+# Escalation order: the deterministic fast path in parse_travel_intent
+# comes first, then the cheapest model likely to succeed.
+ROUTE_ORDER = ("qwen", "phi", "remote")
+
+# Starting guesses, replaced by observations as calls come in
+PRIOR_LATENCY_S = {"qwen": 1.0, "phi": 1.5, "remote": 3.0}
+
+# Longest message (in words) a backend is trusted with.
+# Qwen runs with the smallest context window.
+MAX_WORDS = {"qwen": 40}
+
+EWMA_ALPHA = 0.2
+MIN_VALIDITY = 0.1
+
+# Decisions kept in memory (the JSONL log, when set, keeps all of them)
+DECISION_HISTORY = 1000
+RECENT_DECISIONS = 10
+
+
+class _BackendStats:
+    __slots__ = ("latency_s", "validity", "calls", "valid", "errors", "first_choice")
+
+    def __init__(self, prior_latency_s: float):
+        self.latency_s = prior_latency_s
+        self.validity = 1.0
+        self.calls = 0
+        self.valid = 0
+        self.errors = 0
+        self.first_choice = 0
+
+    def observe(self, latency_s: float, valid: bool, alpha: float):
+        self.calls += 1
+        self.valid += valid
+        self.latency_s += alpha * (latency_s - self.latency_s)
+        self.validity += alpha * (float(valid) - self.validity)
+
+    def expected_cost_s(self) -> float:
+        # Expected time until a valid answer
+        return self.latency_s / max(self.validity, MIN_VALIDITY)
+
+
+class ModelRouter:
+    """
+    Picks a backend per extraction call.
+    - Backends too small for the message are tried last
+    - The rest are ordered by expected time to a valid answer
+      (EWMA latency / EWMA validity), learned from every call
+    - Unhealthy backends (open circuit) go last
+    - An invalid answer escalates to the next backend
+    - Every decision is recorded: the latest DECISION_HISTORY in memory
+      (stats(), decisions()), and all of them in a JSONL log when one
+      is configured
+    """
+
+    def __init__(
+        self,
+        backends: dict,
+        max_words: dict | None = None,
+        alpha: float = EWMA_ALPHA,
+        log_path: str | None = None,
+    ):
+        if not backends:
+            raise ValueError("ModelRouter needs at least one backend")
+
+        self.backends = dict(backends)
+        self.max_words = MAX_WORDS if max_words is None else max_words
+        self.alpha = alpha
+        self.log_path = log_path or os.getenv("LLM_ROUTER_LOG")
+
+        self._rank = {name: i for i, name in enumerate(self.backends)}
+        self._stats = {
+            name: _BackendStats(PRIOR_LATENCY_S.get(name, 2.0))
+            for name in self.backends
+        }
+        self._lock = threading.Lock()
+        self._log_lock = threading.Lock()
+        self._decisions = deque(maxlen=DECISION_HISTORY)
+        self._decision_count = 0
+
+    # Routing
+
+    def _healthy(self, name: str) -> bool:
+        healthy = getattr(self.backends[name], "healthy", None)
+        return healthy() if callable(healthy) else True
+
+    def plan(self, user_query: str, missing_keys=()) -> list[str]:
+        """
+        Backends to try, in order.
+        """
+        words = len(user_query.split())
+
+        # Asking for several slots at once from a long message is the
+        # hard case; the smallest model is only tried last there.
+        hard = words > 12 and len(missing_keys) >= 3
+        cheapest = next(iter(self.backends))
+
+        with self._lock:
+            costs = {n: s.expected_cost_s() for n, s in self._stats.items()}
+
+        def key(name):
+            return (
+                not self._healthy(name),
+                words > self.max_words.get(name, float("inf")),
+                hard and name == cheapest and len(self.backends) > 1,
+                costs[name],
+                self._rank[name],
+            )
+
+        return sorted(self.backends, key=key)
+
+    def invoke_for_intent(
+        self, prompt, user_query: str = "", missing_keys=(), session_id: str | None = None, **kwargs
+    ):
+        order = self.plan(user_query, missing_keys)
+        with self._lock:
+            self._stats[order[0]].first_choice += 1
+        attempts = []
+        result = None
+
+        for name in order:
+            started = time.perf_counter()
+            try:
+                backend = self.backends[name]
+                result = backend.invoke(prompt, **kwargs, **session_kwargs(backend.invoke, session_id))
+                valid = is_valid_intent(result)
+                error = None
+            except Exception as e:
+                valid, error = False, type(e).__name__
+            latency = time.perf_counter() - started
+
+            with self._lock:
+                stats = self._stats[name]
+                stats.observe(latency, valid, self.alpha)
+                stats.errors += error is not None
+
+            attempts.append({
+                "backend": name,
+                "latency_ms": round(latency * 1000, 1),
+                "valid": valid,
+                "error": error,
+            })
+            if valid:
+                break
+
+        self._record(user_query, missing_keys, order, attempts)
+
+        if result is None:
+            raise RuntimeError("No backend produced a response")
+        return result
+
+    def invoke(self, prompt, **kwargs):
+        return self.invoke_for_intent(prompt, "", (), **kwargs)
+
+    # Reporting
+
+    def _record(self, user_query, missing_keys, order, attempts):
+        record = {
+            "ts": round(time.time(), 3),
+            "words": len(user_query.split()),
+            "chars": len(user_query),
+            "missing": list(missing_keys),
+            "plan": order,
+            "attempts": attempts,
+            "chosen": next((a["backend"] for a in attempts if a["valid"]), None),
+        }
+        with self._lock:
+            self._decisions.append(record)
+            self._decision_count += 1
+
+        if self.log_path:
+            with self._log_lock:
+                with open(self.log_path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(record) + "\n")
+
+    def decisions(self, limit: int | None = None) -> list[dict]:
+        """
+        Latest routing decisions, oldest first (at most DECISION_HISTORY).
+        """
+        with self._lock:
+            records = list(self._decisions)
+        return records[-limit:] if limit else records
+
+    def stats(self) -> dict:
+        with self._lock:
+            chosen = {}
+            for record in self._decisions:
+                name = record["chosen"] or "none"
+                chosen[name] = chosen.get(name, 0) + 1
+
+            return {
+                "backends": self._backend_stats(),
+                "decisions": {
+                    "total": self._decision_count,
+                    "kept": len(self._decisions),
+                    "chosen": chosen,
+                    "recent": list(self._decisions)[-RECENT_DECISIONS:],
+                },
+            }
+
+    def _backend_stats(self) -> dict:
+        # Caller holds self._lock
+        return {
+            name: {
+                "first_choice": s.first_choice,
+                "calls": s.calls,
+                "valid": s.valid,
+                "errors": s.errors,
+                "ewma_latency_ms": round(s.latency_s * 1000, 1),
+                "ewma_validity": round(s.validity, 3),
+                "expected_cost_ms": round(s.expected_cost_s() * 1000, 1),
+            }
+            for name, s in self._stats.items()
+        }
+
+    def __repr__(self):
+        return f"ModelRouter({' → '.join(self.backends)})"
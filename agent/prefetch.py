@@ -0,0 +1,68 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+# Background lookups of every session; kept apart from the final-stage
+# pool so speculation never delays a turn that is actually planning.
+PREFETCH_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix="prefetch")
+
+
+class Prefetcher:
+    """
+    Per-session store of speculative tool calls.
+    - start(): runs a call in the background, once per key
+    - retain(): drops calls that no longer match the trip
+    - take(): hands a result to the final stage (once); if the call is
+      missing, failed or does not finish in time, the fallback runs
+    """
+
+    def __init__(self, executor: ThreadPoolExecutor = PREFETCH_POOL):
+        self._executor = executor
+        self._futures = {}
+        self._lock = threading.Lock()
+        self._stats = {
+            "started": 0,
+            "used": 0,
+            "waited": 0,
+            "missed": 0,
+            "discarded": 0,
+        }
+
+    def start(self, key: tuple, fn):
+        with self._lock:
+            if key in self._futures:
+                return
+            self._futures[key] = self._executor.submit(fn)
+            self._stats["started"] += 1
+
+    def retain(self, keys):
+        with self._lock:
+            for key in [k for k in self._futures if k not in keys]:
+                self._futures.pop(key).cancel()
+                self._stats["discarded"] += 1
+
+    def clear(self):
+        self.retain(())
+
+    def take(self, key: tuple, fallback, timeout: float | None = None):
+        with self._lock:
+            future = self._futures.pop(key, None)
+            if future is not None and not future.done():
+                self._stats["waited"] += 1
+
+        if future is not None:
+            try:
+                result = future.result(timeout=timeout)
+                with self._lock:
+                    self._stats["used"] += 1
+                return result
+            except Exception:
+                pass
+
+        with self._lock:
+            self._stats["missed"] += 1
+        return fallback()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {**self._stats, "pending": len(self._futures)}
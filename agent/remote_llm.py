@@ -0,0 +1,284 @@
+import os
+import random
+import threading
+import time
+from collections import deque
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+# Chat-completion route ChatHuggingFace(HuggingFaceEndpoint(task="conversational"))
+# calls; the endpoint applies the model's own chat template
+HF_CHAT_URL = "https://router.huggingface.co/hf-inference/models/{repo_id}/v1/chat/completions"
+DEFAULT_REPO_ID = "mistralai/Mistral-7B-Instruct-v0.2"
+
+DEFAULT_TIMEOUT_S = 20.0
+DEFAULT_MAX_RETRIES = 2
+DEFAULT_BACKOFF_S = 0.25
+DEFAULT_POOL_SIZE = 16
+
+DEFAULT_FAILURE_THRESHOLD = 3
+DEFAULT_RESET_TIMEOUT_S = 30.0
+
+RETRY_STATUS = {429, 500, 502, 503, 504}
+LATENCY_SAMPLES = 500
+
+
+class RemoteLLMError(RuntimeError):
+    pass
+
+
+class CircuitOpenError(RemoteLLMError):
+    pass
+
+
+# CIRCUIT BREAKER
+
+class CircuitBreaker:
+    """
+    - closed:    calls go through; consecutive failures are counted
+    - open:      after `failure_threshold` failures, calls are refused
+                 until `reset_timeout_s` has passed
+    - half_open: one probe call is let through; success closes the
+                 circuit, failure opens it again
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        reset_timeout_s: float = DEFAULT_RESET_TIMEOUT_S,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout_s = reset_timeout_s
+        self._lock = threading.Lock()
+        self._state = "closed"
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == "open" and time.monotonic() - self._opened_at >= self.reset_timeout_s:
+                return "half_open"
+            return self._state
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._state == "closed":
+                return True
+            if time.monotonic() - self._opened_at < self.reset_timeout_s:
+                return False
+            # Half-open: a single probe at a time
+            if self._probing:
+                return False
+            self._probing = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self._state = "closed"
+            self._failures = 0
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._probing or self._failures >= self.failure_threshold:
+                self._state = "open"
+                self._opened_at = time.monotonic()
+            self._probing = False
+
+
+# REMOTE CLIENT
+
+class RemoteLLM:
+    """
+    Chat-completion client for a hosted endpoint (Hugging Face router,
+    OpenAI-compatible shape), meant to be shared by the whole process.
+    - One pooled keep-alive session
+    - Bounded retries with exponential backoff and full jitter
+    - Circuit breaker: while the endpoint is unhealthy calls fail
+      immediately with CircuitOpenError
+    """
+
+    def __init__(
+        self,
+        url: str | None = None,
+        token: str | None = None,
+        repo_id: str = DEFAULT_REPO_ID,
+        timeout_s: float = DEFAULT_TIMEOUT_S,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        backoff_s: float = DEFAULT_BACKOFF_S,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        breaker: CircuitBreaker | None = None,
+        temperature: float = 0.2,
+        max_new_tokens: int = 512,
+    ):
+        self.repo_id = repo_id
+        self.url = url or HF_CHAT_URL.format(repo_id=repo_id)
+        self.timeout_s = timeout_s
+        self.max_retries = max_retries
+        self.backoff_s = backoff_s
+        self.breaker = breaker or CircuitBreaker()
+        self.parameters = {
+            "temperature": temperature,
+            "max_tokens": max_new_tokens,
+        }
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        if token:
+            self.session.headers["Authorization"] = f"Bearer {token}"
+
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=LATENCY_SAMPLES)
+        self._stats = {
+            "requests": 0,
+            "successes": 0,
+            "failures": 0,
+            "retries": 0,
+            "short_circuited": 0,
+        }
+
+    def _count(self, key: str, n: int = 1):
+        with self._lock:
+            self._stats[key] += n
+
+    def payload(self, prompt: str) -> dict:
+        # Same request ChatHuggingFace sends for a plain-text prompt
+        return {
+            "model": self.repo_id,
+            "messages": [{"role": "user", "content": prompt}],
+            **self.parameters,
+        }
+
+    def healthy(self) -> bool:
+        return self.breaker.state != "open"
+
+    def _post(self, prompt: str) -> str:
+        r = self.session.post(
+            self.url,
+            json=self.payload(prompt),
+            timeout=self.timeout_s,
+        )
+        if r.status_code in RETRY_STATUS:
+            raise RemoteLLMError(f"Endpoint returned {r.status_code}")
+        if r.status_code != 200:
+            # Client errors (bad token, bad request) will not improve on retry
+            raise ValueError(f"Endpoint returned {r.status_code}: {r.text[:200]}")
+
+        try:
+            return r.json()["choices"][0]["message"]["content"]
+        except (ValueError, KeyError, IndexError, TypeError):
+            raise RemoteLLMError("Unexpected response shape")
+
+    def invoke(self, prompt, **kwargs) -> str:
+        self._count("requests")
+
+        if not self.breaker.allow():
+            self._count("short_circuited")
+            raise CircuitOpenError("Remote LLM circuit is open")
+
+        last_error = None
+        started = time.perf_counter()
+
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                self._count("retries")
+                time.sleep(random.uniform(0, self.backoff_s * 2 ** (attempt - 1)))
+            try:
+                text = self._post(prompt)
+            except ValueError as e:
+                last_error = e
+                break
+            except (requests.RequestException, RemoteLLMError) as e:
+                last_error = e
+                continue
+
+            self.breaker.record_success()
+            self._count("successes")
+            with self._lock:
+                self._latencies.append(time.perf_counter() - started)
+            return text
+
+        self.breaker.record_failure()
+        self._count("failures")
+        raise RemoteLLMError(f"Remote LLM failed: {last_error}") from last_error
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+            samples = sorted(self._latencies)
+
+        def pct(p):
+            if not samples:
+                return None
+            return round(samples[min(len(samples) - 1, int(p * len(samples)))] * 1000, 1)
+
+        stats["circuit"] = self.breaker.state
+        stats["latency_ms"] = {"p50": pct(0.50), "p95": pct(0.95)}
+        return stats
+
+    def __repr__(self):
+        return f"RemoteLLM({self.url!r})"
+
+
+def remote_from_env() -> RemoteLLM | None:
+    """
+    Client configured from the environment, or None when no endpoint
+    is configured.
+    - HUGGINGFACEHUB_API_TOKEN: token for the hosted API
+    - LLM_REMOTE_URL: explicit endpoint (e.g. a local stand-in)
+    - LLM_REMOTE_TIMEOUT_S, LLM_REMOTE_RETRIES
+    """
+    token = os.getenv("HUGGINGFACEHUB_API_TOKEN")
+    url = os.getenv("LLM_REMOTE_URL")
+    if not token and not url:
+        return None
+
+    return RemoteLLM(
+        url=url,
+        token=token,
+        timeout_s=float(os.getenv("LLM_REMOTE_TIMEOUT_S", DEFAULT_TIMEOUT_S)),
+        max_retries=int(os.getenv("LLM_REMOTE_RETRIES", DEFAULT_MAX_RETRIES)),
+    )
+
+
+# REMOTE → LOCAL ROUTING
+
+class FallbackLLM:
+    """
+    Remote first, local when the remote call fails. While the circuit
+    is open the remote is skipped entirely, so turns do not pay its
+    timeout. The local model is only resolved when first needed.
+    """
+
+    def __init__(self, remote: RemoteLLM, local_factory):
+        self.remote = remote
+        self._local_factory = local_factory
+        self._local = None
+        self._lock = threading.Lock()
+
+    def _local_llm(self):
+        with self._lock:
+            if self._local is None:
+                self._local = self._local_factory()
+            return self._local
+
+    def invoke(self, prompt, **kwargs):
+        if self.remote.healthy():
+            try:
+                return self.remote.invoke(prompt, **kwargs)
+            except RemoteLLMError:
+                pass
+        return self._local_llm().invoke(prompt, **kwargs)
+
+    def stats(self) -> dict:
+        return self.remote.stats()
+
+    def __repr__(self):
+        return f"FallbackLLM({self.remote!r})"
@@ -0,0 +1,180 @@
+import json
+
+
+# Binary layout version of to_bytes()
+FORMAT_VERSION = 1
+
+
+class _Journaled:
+    """
+    Slotted record with dict-style access whose field writes are
+    journaled, so a snapshot is a journal position and rollback undoes
+    only the fields written since.
+    """
+
+    __slots__ = ("_journal",)
+    FIELDS: tuple = ()
+
+    def __setattr__(self, field, value):
+        if field in self.FIELDS:
+            value = self._coerce(field, value)
+            old = getattr(self, field)
+            if old == value:
+                return
+            self._journal.append((self, field, old))
+        object.__setattr__(self, field, value)
+
+    @staticmethod
+    def _coerce(field, value):
+        return value
+
+    # Dict-style access (the agent and intent parser use mappings)
+
+    def __getitem__(self, field):
+        if field not in self.FIELDS:
+            raise KeyError(field)
+        return getattr(self, field)
+
+    def __setitem__(self, field, value):
+        if field not in self.FIELDS:
+            raise KeyError(field)
+        setattr(self, field, value)
+
+    def __contains__(self, field):
+        return field in self.FIELDS
+
+    def get(self, field, default=None):
+        return getattr(self, field) if field in self.FIELDS else default
+
+    def keys(self):
+        return self.FIELDS
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+
+class TripPreferences(_Journaled):
+    __slots__ = ("budget", "interests")
+    FIELDS = ("budget", "interests")
+
+    def __init__(self, journal: list):
+        object.__setattr__(self, "_journal", journal)
+        object.__setattr__(self, "budget", None)
+        object.__setattr__(self, "interests", ())
+
+    @staticmethod
+    def _coerce(field, value):
+        # Stored immutable, so snapshots can share it
+        if field == "interests":
+            return tuple(value or ())
+        return value
+
+    def update(self, values: dict):
+        # Preferences the agent does not know are ignored
+        for field, value in values.items():
+            if field in self.FIELDS:
+                setattr(self, field, value)
+
+    def to_dict(self) -> dict:
+        return {"budget": self.budget, "interests": list(self.interests)}
+
+
+class TripState(_Journaled):
+    """
+    Slot values of one conversation.
+    - Read and written like the dict it replaces (state["days"] = 5)
+    - snapshot() / changed_since() / rollback() cost O(fields written
+      since the snapshot), not a deep copy
+    - to_dict() is the JSON form (intent prompt, FINAL_INTENT_JSON);
+      to_bytes() / from_bytes() the compact form for persistence
+    """
+
+    __slots__ = (
+        "started",
+        "source",
+        "destination",
+        "trip_type",
+        "travel_date",
+        "return_date",
+        "days",
+        "travelers",
+        "preferences",
+        "return_resolved",
+    )
+    # Same order as the JSON state the intent prompt shows
+    FIELDS = __slots__
+    VALUE_FIELDS = tuple(f for f in FIELDS if f != "preferences")
+
+    def __init__(self):
+        journal = []
+        object.__setattr__(self, "_journal", journal)
+        for field in self.VALUE_FIELDS:
+            object.__setattr__(self, field, None)
+        object.__setattr__(self, "started", False)
+        object.__setattr__(self, "return_resolved", False)
+        object.__setattr__(self, "preferences", TripPreferences(journal))
+
+    def __setattr__(self, field, value):
+        if field == "preferences":
+            self.preferences.update(value)
+            return
+        super().__setattr__(field, value)
+
+    # SNAPSHOTS
+
+    def snapshot(self) -> int:
+        return len(self._journal)
+
+    def changed_since(self, snapshot: int) -> set:
+        """
+        Fields whose value differs from the snapshot; a field changed
+        and changed back does not count.
+        """
+        first = {}
+        for target, field, old in self._journal[snapshot:]:
+            first.setdefault((id(target), field), (target, field, old))
+
+        changed = set()
+        for target, field, old in first.values():
+            if getattr(target, field) != old:
+                changed.add(field if target is self else f"preferences.{field}")
+        return changed
+
+    def rollback(self, snapshot: int):
+        journal = self._journal
+        while len(journal) > snapshot:
+            target, field, old = journal.pop()
+            object.__setattr__(target, field, old)
+
+    def release(self):
+        """Forgets the journal; earlier snapshots can no longer be used."""
+        self._journal.clear()
+
+    # SERIALIZATION
+
+    def to_dict(self) -> dict:
+        data = {field: getattr(self, field) for field in self.FIELDS}
+        data["preferences"] = self.preferences.to_dict()
+        return data
+
+    def to_bytes(self) -> bytes:
+        values = [getattr(self, field) for field in self.VALUE_FIELDS]
+        values.append(self.preferences.budget)
+        values.append(list(self.preferences.interests))
+        return bytes([FORMAT_VERSION]) + json.dumps(
+            values, separators=(",", ":"), ensure_ascii=False
+        ).encode("utf-8")
+
+    @classmethod
+    def from_bytes(cls, blob: bytes) -> "TripState":
+        if not blob or blob[0] != FORMAT_VERSION:
+            raise ValueError("Unsupported trip state format")
+        values = json.loads(blob[1:].decode("utf-8"))
+
+        state = cls()
+        for field, value in zip(cls.VALUE_FIELDS, values):
+            object.__setattr__(state, field, value)
+        budget, interests = values[len(cls.VALUE_FIELDS):]
+        object.__setattr__(state.preferences, "budget", budget)
+        object.__setattr__(state.preferences, "interests", tuple(interests))
+        return state
@@ -0,0 +1,332 @@
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from agent.travel_agent import TravelAgent
+from utils.deadline import Deadline
+
+
+# CONFIGURATION
+
+DEFAULT_MAX_LIVE = int(os.getenv("SESSION_MAX_LIVE", "1000"))
+DEFAULT_IDLE_S = float(os.getenv("SESSION_IDLE_S", "300"))
+DEFAULT_TTL_S = float(os.getenv("SESSION_TTL_S", str(7 * 24 * 3600)))
+DEFAULT_DB_PATH = os.getenv("SESSION_DB", "sessions.db")
+
+# How often run() purges expired rows from the backend
+PURGE_EVERY_S = 60.0
+
+
+# BACKENDS
+#
+# A backend keeps one blob per session with a version that grows on
+# every save; a worker holding an older version knows the session moved on.
+# A save names the version it was computed from and fails with
+# SessionConflict if another worker saved in between.
+
+# Turns run again on the newer state before a conflict is raised
+SAVE_ATTEMPTS = 3
+
+# on_partial(RESET, None) before a turn runs again: the plan components
+# received so far were built from state that was not saved
+RESET = "reset"
+
+
+class SessionConflict(RuntimeError):
+    pass
+
+class MemoryBackend:
+    """
+    Blobs kept in this process: one worker, or tests.
+    """
+
+    def __init__(self):
+        self._rows = {}   # session_id -> (version, blob, updated_at)
+        self._lock = threading.Lock()
+
+    def version(self, session_id: str) -> int | None:
+        row = self._rows.get(session_id)
+        return row[0] if row else None
+
+    def load(self, session_id: str) -> tuple[int, bytes] | None:
+        row = self._rows.get(session_id)
+        return (row[0], row[1]) if row else None
+
+    def save(self, session_id: str, blob: bytes, expected: int | None) -> int:
+        with self._lock:
+            version = self.version(session_id)
+            if version != expected:
+                raise SessionConflict(session_id)
+            self._rows[session_id] = ((version or 0) + 1, blob, time.time())
+            return (version or 0) + 1
+
+    def delete(self, session_id: str):
+        with self._lock:
+            self._rows.pop(session_id, None)
+
+    def purge(self, older_than: float) -> int:
+        with self._lock:
+            expired = [k for k, row in self._rows.items() if row[2] < older_than]
+            for k in expired:
+                del self._rows[k]
+            return len(expired)
+
+    def count(self) -> int:
+        return len(self._rows)
+
+
+class SQLiteBackend:
+    """
+    Blobs in a local SQLite file (WAL), shared by the worker processes
+    of one host.
+    """
+
+    def __init__(self, path: str = DEFAULT_DB_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=5.0)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS sessions ("
+            " session_id TEXT PRIMARY KEY,"
+            " version INTEGER NOT NULL,"
+            " blob BLOB NOT NULL,"
+            " updated_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS sessions_updated_at ON sessions(updated_at)")
+
+    def version(self, session_id: str) -> int | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT version FROM sessions WHERE session_id = ?", (session_id,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def load(self, session_id: str) -> tuple[int, bytes] | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT version, blob FROM sessions WHERE session_id = ?", (session_id,)
+            ).fetchone()
+        return (row[0], bytes(row[1])) if row else None
+
+    def save(self, session_id: str, blob: bytes, expected: int | None) -> int:
+        with self._lock:
+            if expected is None:
+                saved = self._conn.execute(
+                    "INSERT OR IGNORE INTO sessions (session_id, version, blob, updated_at)"
+                    " VALUES (?, 1, ?, ?)",
+                    (session_id, blob, time.time()),
+                ).rowcount
+            else:
+                saved = self._conn.execute(
+                    "UPDATE sessions SET version = version + 1, blob = ?, updated_at = ?"
+                    " WHERE session_id = ? AND version = ?",
+                    (blob, time.time(), session_id, expected),
+                ).rowcount
+        if not saved:
+            raise SessionConflict(session_id)
+        return (expected or 0) + 1
+
+    def delete(self, session_id: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+
+    def purge(self, older_than: float) -> int:
+        with self._lock:
+            return self._conn.execute(
+                "DELETE FROM sessions WHERE updated_at < ?", (older_than,)
+            ).rowcount
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+
+# STORE
+
+class _Live:
+    __slots__ = ("agent", "version", "last_used", "lock", "users")
+
+    def __init__(self):
+        self.agent = None
+        self.version = None
+        self.last_used = time.monotonic()
+        self.lock = threading.Lock()
+        self.users = 0   # turns running or waiting on it; never evicted then
+
+
+class SessionStore:
+    """
+    TravelAgent sessions that are not pinned to one process.
+    - Every turn's state is saved to the backend, so any worker can
+      continue the session
+    - Recently used agents stay live (LRU, max_live); one that another
+      worker has advanced since is rehydrated from the backend
+    - Agents idle for idle_s are dropped from memory; backend rows
+      untouched for ttl_s are purged
+    - All agents share one model and the process-wide datasets
+    """
+
+    def __init__(
+        self,
+        model_info: dict,
+        backend=None,
+        max_live: int = DEFAULT_MAX_LIVE,
+        idle_s: float = DEFAULT_IDLE_S,
+        ttl_s: float = DEFAULT_TTL_S,
+        **agent_kwargs,
+    ):
+        self.model_info = model_info
+        self.backend = backend or MemoryBackend()
+        self.max_live = max_live
+        self.idle_s = idle_s
+        self.ttl_s = ttl_s
+        self.agent_kwargs = agent_kwargs
+
+        self._live: "OrderedDict[str, _Live]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._last_purge = time.monotonic()
+        self._stats = {
+            "turns": 0,
+            "live_hits": 0,
+            "rehydrated": 0,
+            "created": 0,
+            "conflicts": 0,
+            "evicted_idle": 0,
+            "evicted_lru": 0,
+            "purged": 0,
+        }
+
+    def _count(self, key: str, n: int = 1):
+        with self._lock:
+            self._stats[key] += n
+
+    def _new_agent(self) -> TravelAgent:
+        return TravelAgent(model_info=self.model_info, **self.agent_kwargs)
+
+    def _checkout(self, session_id: str) -> _Live:
+        with self._lock:
+            live = self._live.get(session_id)
+            if live is None:
+                live = self._live[session_id] = _Live()
+            else:
+                self._live.move_to_end(session_id)
+            live.users += 1
+            return live
+
+    def _checkin(self, live: _Live):
+        with self._lock:
+            live.users -= 1
+
+    def _refresh(self, live: _Live, session_id: str):
+        # Caller holds live.lock
+        version = self.backend.version(session_id)
+        if live.agent is not None and live.version == version:
+            self._count("live_hits")
+            return
+
+        row = self.backend.load(session_id) if version is not None else None
+        if row is None:
+            live.agent = self._new_agent()
+            live.agent.session_id = session_id
+            live.version = None
+            self._count("created")
+        else:
+            live.version, blob = row
+            try:
+                live.agent = TravelAgent.from_blob(blob, self.model_info, **self.agent_kwargs)
+                self._count("rehydrated")
+            except ValueError:
+                # Written by an older layout: start over, saving on top of it
+                live.agent = self._new_agent()
+                live.agent.session_id = session_id
+                self._count("created")
+
+    def run(
+        self,
+        session_id: str | None,
+        message: str,
+        deadline: Deadline | None = None,
+        on_partial=None,
+    ) -> dict:
+        """
+        One turn of a session; an unknown or missing id starts a new one.
+        The response carries the id under SESSION_ID.
+        If another worker saves the session during the turn, the turn runs
+        again on its state (SessionConflict after SAVE_ATTEMPTS); on_partial
+        receives (RESET, None) first.
+        """
+        session_id = session_id or uuid.uuid4().hex
+        live = self._checkout(session_id)
+
+        try:
+            with live.lock:
+                for attempt in range(SAVE_ATTEMPTS):
+                    self._refresh(live, session_id)
+                    response = live.agent.run(message, deadline=deadline, on_partial=on_partial)
+                    try:
+                        live.version = self.backend.save(session_id, live.agent.to_blob(), live.version)
+                        break
+                    except SessionConflict:
+                        live.agent = None   # reload the newer state
+                        self._count("conflicts")
+                        if attempt == SAVE_ATTEMPTS - 1:
+                            raise
+                        if on_partial:
+                            on_partial(RESET, None)
+                live.last_used = time.monotonic()
+        finally:
+            self._checkin(live)
+
+        self._count("turns")
+        self.evict()
+        response["SESSION_ID"] = session_id
+        return response
+
+    def end(self, session_id: str):
+        with self._lock:
+            self._live.pop(session_id, None)
+        self.backend.delete(session_id)
+
+    # EVICTION
+
+    def evict(self):
+        """
+        Drops idle and surplus agents from memory; their state is
+        already in the backend. Agents in use by a turn are skipped.
+        """
+        now = time.monotonic()
+        with self._lock:
+            for session_id, live in list(self._live.items()):
+                if live.users:
+                    continue
+                if now - live.last_used > self.idle_s:
+                    self._stats["evicted_idle"] += 1
+                elif len(self._live) > self.max_live:
+                    self._stats["evicted_lru"] += 1
+                else:
+                    break
+                del self._live[session_id]
+
+            purge = now - self._last_purge >= PURGE_EVERY_S
+            if purge:
+                self._last_purge = now
+
+        if purge:
+            self.purge_expired()
+
+    def purge_expired(self) -> int:
+        purged = self.backend.purge(time.time() - self.ttl_s)
+        self._count("purged", purged)
+        return purged
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["live"] = len(self._live)
+        stats["stored"] = self.backend.count()
+        return stats
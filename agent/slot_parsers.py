@@ -0,0 +1,155 @@
+from datetime import date
+from typing import Any, NamedTuple
+
+from agent.travel_lexicon import scan_message, count_travelers, FILLER_WORDS, CITY_NOISE_WORDS
+from utils.date_parser import parse_date
+
+
+# SLOT ANSWER PARSERS
+#
+# While the agent waits on one slot the reply is usually just that value
+# ("Mumbai", "3", "round trip", "luxury", "next friday"). Each parser reads
+# it straight from the scanned message and reports which tokens it used;
+# anything left over means the reply says more, and the full intent
+# extractor should see it.
+
+
+class SlotAnswer(NamedTuple):
+    value: Any
+    extra: bool   # the reply carries more than the slot value
+
+
+def _span_value(spans: list, kind: str):
+    for s in spans:
+        if s.kind == kind:
+            return s.value, range(s.first_token, s.last_token)
+    return None
+
+
+def _lone_number(tokens: list, spans: list):
+    """
+    The only number in the reply, unless a phrase claims it
+    ("5 days" does not answer "how many travelers").
+    """
+    covered = {i for s in spans for i in range(s.first_token, s.last_token)}
+    numbers = [
+        i for i, t in enumerate(tokens)
+        if t.number is not None and i not in covered
+    ]
+    if len(numbers) != 1:
+        return None
+    return tokens[numbers[0]].number, numbers
+
+
+def _parse_city(text, tokens, spans, today):
+    """
+    Known city or alias first; otherwise the first plain word, so
+    validation can say the place is not supported.
+    """
+    found = _span_value(spans, "city")
+    if found:
+        return found
+
+    for i, t in enumerate(tokens):
+        if (
+            t.text.isalpha() and len(t.text) > 2
+            and t.text not in CITY_NOISE_WORDS
+            and t.text not in FILLER_WORDS
+        ):
+            return t.text.title(), [i]
+    return None
+
+
+def _parse_count(kind: str):
+    """
+    "3", "three", or a phrase of the slot's own kind ("a week",
+    "me and my wife").
+    """
+    def parse(text, tokens, spans, today):
+        found = _span_value(spans, kind) or _lone_number(tokens, spans)
+        if found and isinstance(found[0], int) and found[0] > 0:
+            return found
+        return None
+    return parse
+
+
+def _parse_travelers(text, tokens, spans, today):
+    """
+    "3", or a headcount phrase ("me and my wife", "2 adults and 2 kids").
+    """
+    headcount = count_travelers(tokens, spans)
+    found = (headcount[0], headcount[2]) if headcount else _lone_number(tokens, spans)
+    if found and isinstance(found[0], int) and found[0] > 0:
+        return found
+    return None
+
+
+def _parse_trip_type(text, tokens, spans, today):
+    found = _span_value(spans, "trip_type")
+    if found:
+        return found
+
+    for i, t in enumerate(tokens):
+        if t.text == "round":
+            return "round_trip", [i]
+        if t.text in ("one", "oneway", "single"):
+            return "one_way", [i]
+    return None
+
+
+def _parse_budget(text, tokens, spans, today):
+    return _span_value(spans, "budget")
+
+
+def _parse_travel_date(text, tokens, spans, today):
+    """
+    ISO or natural date. Past dates are returned too; the agent
+    answers those with a specific message.
+    """
+    expr = parse_date(text, today)
+    if not expr:
+        return None
+    start, end = expr.span
+    used = [i for i, t in enumerate(tokens) if start <= t.start < end]
+    return expr.start.isoformat(), used
+
+
+SLOT_PARSERS = {
+    "source": _parse_city,
+    "destination": _parse_city,
+    "days": _parse_count("days"),
+    "travelers": _parse_travelers,
+    "trip_type": _parse_trip_type,
+    "budget": _parse_budget,
+    "travel_date": _parse_travel_date,
+}
+
+
+def parse_slot_answer(slot: str, text: str, today: date | None = None) -> SlotAnswer | None:
+    """
+    Reads the answer to a pending slot question.
+
+    Returns:
+        SlotAnswer(value, extra), or None when the reply holds no
+        value for the slot
+    """
+    parser = SLOT_PARSERS.get(slot)
+    if parser is None or not text or not text.strip():
+        return None
+
+    text = text.lower().strip()
+    tokens, spans = scan_message(text)
+
+    found = parser(text, tokens, spans, today or date.today())
+    if found is None:
+        return None
+
+    value, used = found
+    used = set(used)
+    extra = any(
+        i not in used
+        and t.text not in FILLER_WORDS
+        and t.text not in CITY_NOISE_WORDS
+        for i, t in enumerate(tokens)
+    )
+    return SlotAnswer(value, extra)
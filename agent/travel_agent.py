@@ -1,27 +1,94 @@
 from datetime import datetime, timedelta, date
+import json
+import os
 import random
 import re
-from agent.intent_parser import parse_travel_intent
+import uuid
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from agent.intent_parser import parse_travel_intent, _rule_based_extract
+from agent.slot_parsers import parse_slot_answer
+from agent.travel_lexicon import scan_message, CITY_NOISE_WORDS
 from agent.llm_loader import load_llm
+from agent.prefetch import Prefetcher
+from agent.session_state import TripState
 
 from tools.flight_tool import search_flights
 from tools.hotel_tool import search_hotels
 from tools.places_tool import search_places
 from tools.weather_lookup_tool import weather_lookup
 from tools.budget_tool import estimate_trip_budget
+from tools.fare_calendar import fare_window, cheapest_dates
+from tools.trip_optimizer import optimize_trip
+from utils.date_parser import parse_date
+from utils.deadline import Deadline
 from utils.flight_city_extractor import FlightCityExtractor
+from utils.task_graph import TaskGraph
+
+
+def _turn_budget_from_env() -> float | None:
+    value = os.getenv("TURN_BUDGET_S")
+    try:
+        return float(value) if value else None
+    except ValueError:
+        return None
+
+
+# Default latency budget of one turn, in seconds (TURN_BUDGET_S env).
+# Unset: no deadline, since local CPU extraction alone can take longer
+# than a tight budget. Servers with an SLO set it (e.g. 2 for p99 < 2 s)
+# or pass a Deadline per turn.
+TURN_BUDGET_S = _turn_budget_from_env()
+
+# Final-stage tool calls of every session run here, independent ones
+# side by side
+TOOL_POOL = ThreadPoolExecutor(max_workers=16, thread_name_prefix="trip-tools")
+
+# Alternatives offered when there is no flight on the requested day:
+# the cheapest dates within this many days of it
+OUTBOUND_FLEX_DAYS = 7
+RETURN_FLEX_DAYS = 3
+MAX_DATE_OPTIONS = 5
+
+# Cheapest complete packages (flights, hotel, start date) offered with
+# a plan, over start dates within this many days of the chosen one
+PACKAGE_FLEX_DAYS = 3
+PACKAGE_OPTIONS = 3
+
+# Fields a form-mode request must fill
+FORM_FIELDS = ("source", "destination", "trip_type", "travel_date", "days", "travelers", "budget")
+
+# Layout version of TravelAgent.to_blob()
+SESSION_BLOB_VERSION = 2
+
+
+@lru_cache(maxsize=None)
+def shared_city_extractor(json_path: str = "data/flights.json") -> FlightCityExtractor:
+    """
+    Route index shared by every agent in the process (read-only).
+    """
+    return FlightCityExtractor(json_path=json_path)
 
 
 class TravelAgent:
-    def __init__(self, force_local=False, local_model_choice=None):
-        model_info = load_llm(
+    def __init__(
+        self,
+        force_local=False,
+        local_model_choice=None,
+        model_info=None,
+        prefetch=True,
+        turn_budget_s=TURN_BUDGET_S,
+    ):
+        # model_info: a ready load_llm()-style dict (benchmarks, servers)
+        # prefetch: start the final stage's lookups while slots are asked
+        # turn_budget_s: deadline of a turn run without one (None: no limit)
+        model_info = model_info or load_llm(
             force_local=force_local,
             local_model_choice=local_model_choice
         )
         self.force_finalize = False
-        self.city_extractor = FlightCityExtractor(
-            json_path="data/flights.json"
-        )
+        self.city_extractor = shared_city_extractor()
 
         self.llm = model_info["instance"]
         self.model_provider = model_info["provider"]
@@ -29,53 +96,177 @@ class TravelAgent:
         self.model_status = model_info["status"]
         self.model_info = model_info
 
-        self.state = {
-            "started": False,
-            "source": None,
-            "destination": None,
-            "trip_type": None,  
-            "travel_date": None,
-            "return_date": None,
-            "days": None,
-            "travelers": None,
-            "preferences": {
-                "budget": None,
-                "interests": []
-            },
-            "return_resolved": False
-        }
+        self.state = TripState()
 
         self.pending_slot = None
         self.pending_outbound_options = None
         self.pending_return_options = None
         self._reflection_count = 0
         self._parsed_this_turn = False
+        self._deadline = None
+        self._on_partial = None
+        self.turn_budget_s = turn_budget_s
+
+        # Key for per-session fairness in the LLM admission queue
+        self.session_id = uuid.uuid4().hex
+
+        self.prefetch_enabled = prefetch
+        self.prefetch = Prefetcher()
+
+        # Plan components of the last plan with the inputs they were
+        # built from; an edit recomputes only those whose inputs changed
+        self._plan_nodes = {}
         
     
-    def _reset_state(self):
-       
-        self.state = {
-            "started": False,
-            "source": None,
-            "destination": None,
-            "trip_type": None,
-            "travel_date": None,
-            "return_date": None,
-            "days": None,
-            "travelers": None,
-            "preferences": {
-                "budget": None,
-                "interests": []
-            },
-            "return_resolved": False
+    # PERSISTENCE
+    #
+    # Blobs are JSON, never pickle: they are read back from a database
+    # shared by every worker. Tuples and dates in the plan nodes are
+    # tagged so their fingerprints still compare equal after a reload.
+
+    @staticmethod
+    def _encode(value):
+        if isinstance(value, tuple):
+            return {"__tuple__": [TravelAgent._encode(v) for v in value]}
+        if isinstance(value, list):
+            return [TravelAgent._encode(v) for v in value]
+        if isinstance(value, dict):
+            return {k: TravelAgent._encode(v) for k, v in value.items()}
+        if isinstance(value, datetime):
+            return {"__datetime__": value.isoformat()}
+        if isinstance(value, date):
+            return {"__date__": value.isoformat()}
+        return value
+
+    @staticmethod
+    def _decode(obj: dict):
+        if "__tuple__" in obj:
+            return tuple(obj["__tuple__"])
+        if "__datetime__" in obj:
+            return datetime.fromisoformat(obj["__datetime__"])
+        if "__date__" in obj:
+            return date.fromisoformat(obj["__date__"])
+        return obj
+
+    def to_blob(self) -> bytes:
+        """
+        Conversation state between turns, for a session store. The model,
+        datasets and in-flight prefetches are not part of it.
+        """
+        data = {
+            "version": SESSION_BLOB_VERSION,
+            "session_id": self.session_id,
+            "state": self.state.to_bytes().decode("utf-8"),
+            "pending_slot": self.pending_slot,
+            "pending_outbound_options": self.pending_outbound_options,
+            "pending_return_options": self.pending_return_options,
+            "reflection_count": self._reflection_count,
+            "force_finalize": self.force_finalize,
+            "plan_nodes": self._plan_nodes,
         }
+        text = json.dumps(self._encode(data), separators=(",", ":"), ensure_ascii=False)
+        return zlib.compress(text.encode("utf-8"), 1)
+
+    def load_blob(self, blob: bytes):
+        try:
+            data = json.loads(zlib.decompress(blob).decode("utf-8"), object_hook=self._decode)
+        except (zlib.error, UnicodeDecodeError, ValueError):
+            raise ValueError("Unsupported session blob version")
+        if not isinstance(data, dict) or data.get("version") != SESSION_BLOB_VERSION:
+            raise ValueError("Unsupported session blob version")
+
+        self.session_id = data["session_id"]
+        self.state = TripState.from_bytes(data["state"].encode("utf-8"))
+        self.pending_slot = data["pending_slot"]
+        self.pending_outbound_options = data["pending_outbound_options"]
+        self.pending_return_options = data["pending_return_options"]
+        self._reflection_count = data["reflection_count"]
+        self.force_finalize = data["force_finalize"]
+        self._plan_nodes = data["plan_nodes"]
+        self.prefetch.clear()
+        return self
+
+    @classmethod
+    def from_blob(cls, blob: bytes, model_info: dict, **kwargs) -> "TravelAgent":
+        return cls(model_info=model_info, **kwargs).load_blob(blob)
+
+    def _reset_state(self):
+        self.state = TripState()
         self.pending_slot = None
         self.pending_outbound_options = None
         self.pending_return_options = None
         self._reflection_count = 0
         self._parsed_this_turn = False
-        
-        
+        self.prefetch.clear()
+        self._plan_nodes = {}
+
+
+    # SPECULATIVE PREFETCH
+
+    @staticmethod
+    def _prefetch_key(*parts) -> tuple:
+        return tuple(str(p).lower() for p in parts)
+
+    def _speculative_calls(self) -> dict:
+        """
+        Final-stage lookups that are already determined by the slots
+        filled so far, keyed as the final stage asks for them.
+        - Flights both ways until the trip type is known
+        - Both hotel orders until the budget tier is known
+        - Weather once the dates are known
+        """
+        source, destination = self.state["source"], self.state["destination"]
+        if not source or not destination:
+            return {}
+        if not self.city_extractor.is_valid_route(
+            self.city_extractor.normalize(source),
+            self.city_extractor.normalize(destination),
+        ):
+            return {}
+
+        key = self._prefetch_key
+        calls = {
+            key("flights", source, destination): lambda: search_flights(source, destination),
+            key("places", destination): lambda: search_places(destination),
+        }
+        if self.state["trip_type"] != "one_way":
+            calls[key("flights", destination, source)] = lambda: search_flights(destination, source)
+
+        budget_tier = self.state["preferences"]["budget"]
+        if budget_tier:
+            orders = ["price_low_to_high" if budget_tier == "budget" else "highest_rated"]
+        else:
+            orders = ["price_low_to_high", "highest_rated"]
+        for order in orders:
+            calls[key("hotels", destination, order)] = (
+                lambda order=order: search_hotels(destination, order)
+            )
+
+        if self.state["travel_date"] and self.state["days"]:
+            start = datetime.fromisoformat(self.state["travel_date"]).date()
+            end = (
+                datetime.fromisoformat(self.state["return_date"]).date()
+                if self.state["trip_type"] == "round_trip" and self.state["return_date"]
+                else start + timedelta(days=self.state["days"] - 1)
+            )
+            calls[key("weather", destination, start, end)] = (
+                lambda: weather_lookup(destination, start.isoformat(), end.isoformat())
+            )
+
+        return calls
+
+    def _prefetch(self):
+        # Runs without the turn deadline: results are complete and land
+        # in the tool cache as well. Once a plan exists, edits are
+        # served from its components instead.
+        if not self.prefetch_enabled or self._plan_nodes:
+            return
+        calls = self._speculative_calls()
+        self.prefetch.retain(calls)
+        for k, fn in calls.items():
+            self.prefetch.start(k, fn)
+
+
     def _validate_current_state(self):
         #  Source validation
         if (
@@ -280,35 +471,12 @@ class TravelAgent:
         """
         Converts human-friendly dates to ISO format.
         Examples:
-        - 29 dec
-        - 29 december
-        - dec 29
-        - 29 dec 2025
+        - 2025-12-29
+        - 29 dec / dec 29 / 29th of december 2025
+        - tomorrow / next friday / in 3 days / this weekend
         """
-        text = text.lower().strip()
-
-        formats = [
-            "%d %b %Y", "%d %B %Y",
-            "%b %d %Y", "%B %d %Y",
-            "%d %b", "%d %B",
-            "%b %d", "%B %d"
-        ]
-
-        for fmt in formats:
-            try:
-                parsed = datetime.strptime(text, fmt)
-
-                # If year not provided → assume next occurrence
-                if "%Y" not in fmt:
-                    parsed = parsed.replace(year=date.today().year)
-                    if parsed.date() < date.today():
-                        parsed = parsed.replace(year=parsed.year + 1)
-
-                return parsed.date().isoformat()
-            except ValueError:
-                continue
-
-        return None
+        expr = parse_date(text.strip())
+        return expr.start.isoformat() if expr else None
 
     def _build_fallback_response(self):
         """
@@ -337,7 +505,7 @@ class TravelAgent:
         slot_guidance = {
             "source": "Please enter the **departure city** (for example: Delhi, Mumbai).",
             "destination": "Please enter the **destination city** (for example: Goa, Manali).",
-            "travel_date": "Please enter a **travel date** in YYYY-MM-DD format (for example: 2025-12-30).",
+            "travel_date": "Please enter a **travel date** (for example: 2025-12-30, 30 Dec or next friday).",
             "days": "Please enter the **number of days** for your trip (for example: 5 days).",
             "travelers": "Please tell me **how many travelers** (for example: 2 travelers).",
             "trip_type": "Please specify the **trip type** (one way or round trip)."
@@ -377,32 +545,27 @@ class TravelAgent:
         if not text:
             return None
 
-        # Remove dates, numbers, filler words
-        noise_words = [
-            "starting", "from", "date", "travel", "trip",
-            "going", "to", "please", "change", "destination",
-            "source", "city", "on"
-        ]
-
-        cleaned = text.lower()
+        tokens, spans = scan_message(text)
 
-        for w in noise_words:
-            cleaned = cleaned.replace(w, " ")
+        # Known city or alias anywhere in the text
+        for s in spans:
+            if s.kind == "city":
+                return s.value
 
-        # Keep only letters & spaces
-        cleaned = re.sub(r"[^a-z\s]", " ", cleaned)
-
-        # Split words
-        tokens = [t for t in cleaned.split() if len(t) > 2]
+        # Otherwise: first plain word that is not noise
+        words = [
+            t.text for t in tokens
+            if t.text.isalpha() and t.text not in CITY_NOISE_WORDS and len(t.text) > 2
+        ]
 
-        if not tokens:
+        if not words:
             return None
 
-        if len(tokens) >= 2:
-            candidate = f"{tokens[0]} {tokens[1]}".title()
+        if len(words) >= 2:
+            candidate = f"{words[0]} {words[1]}".title()
             if self.city_extractor.is_valid_city(candidate):
                 return candidate
-        return tokens[0].title()
+        return words[0].title()
         
     
     
@@ -414,13 +577,16 @@ class TravelAgent:
             return "estimated same price"
         return f"+₹{diff}" if diff > 0 else f"-₹{abs(diff)}"
 
-    def _outbound_date_candidates(self, travel_date: date):
-        offsets = [-2, -1, 1, 2, 3, 4, 5, 6, 7]
-        return sorted({
-            travel_date + timedelta(days=o)
-            for o in offsets
-            if travel_date + timedelta(days=o) > date.today()
-        })
+    def _cheapest_nearby_dates(self, source, destination, target: date, flex_days: int, earliest: date):
+        """
+        Cheapest days with flights within flex_days of target (not before
+        earliest), from the route's fare calendar: [(date, fare), ...]
+        """
+        calendar = fare_window(source, destination, target, flex_days, earliest=earliest)
+        return [
+            (date.fromisoformat(day["date"]), day["cheapest_fare"])
+            for day in cheapest_dates(calendar, k=MAX_DATE_OPTIONS, target=target)
+        ]
 
     def _return_date_candidates(self, base: date, days: int, start: date):
         options = []
@@ -570,28 +736,178 @@ class TravelAgent:
     
     # PAST DATE DETECTOR 
     def _detect_past_date(self, text: str):
-        import re
-        from datetime import date
+        expr = parse_date(text)
+        if expr and expr.start < date.today():
+            return expr.start.isoformat()
+        return None
+     
+    # SLOT ANSWERS
+    def _slot_value(self, slot: str):
+        if slot == "budget":
+            return self.state["preferences"].get("budget")
+        return self.state.get(slot)
 
-        m = re.search(r"(20\d{2}-\d{2}-\d{2})", text)
-        if not m:
-            return None
+    def _apply_slot_answer(self, slot: str, answer):
+        """
+        Stores a parsed slot answer.
+        Returns a NEED_INPUT response when the answer is unusable.
+        """
+        if answer is None:
+            messages = {
+                "days": "Please enter a valid positive number for days.",
+                "travelers": "Please enter a valid positive number for travelers.",
+                "trip_type": "Please type one-way or round-trip.",
+                "budget": "Please choose **budget**, **mid-range** or **luxury**.",
+                "travel_date": (
+                    "I couldn’t understand that date 🤔\n\n"
+                    "Please enter something like:\n"
+                    "• 2025-12-29\n"
+                    "• 29 Dec\n"
+                    "• next friday"
+                ),
+            }
+            return {
+                "status": "NEED_INPUT",
+                "question": messages.get(slot, f"Please enter a valid city name for {slot}.")
+            }
 
-        try:
-            d = date.fromisoformat(m.group(1))
-            if d < date.today():
-                return m.group(1)
-        except Exception:
-            pass
+        if slot == "travel_date" and date.fromisoformat(answer.value) < date.today():
+            return {
+                "status": "NEED_INPUT",
+                "question": "Please enter a **future date**."
+            }
 
+        if slot == "budget":
+            self.state["preferences"]["budget"] = answer.value
+        else:
+            self.state[slot] = answer.value
         return None
-     
+
+    # PLAN EDITS
+    def _apply_plan_edit(self, user_query: str) -> bool:
+        """
+        After a plan is COMPLETED, a message restating a trip field
+        ("make it luxury", "4 travelers") replaces that field. The intent
+        parser never overwrites filled slots, so edits are read here.
+        Returns True when the trip changed.
+        """
+        changed = set()
+        for k, v in _rule_based_extract(user_query).items():
+            if k == "preferences":
+                for pk, pv in v.items():
+                    if pv is not None and self.state["preferences"].get(pk) != pv:
+                        self.state["preferences"][pk] = pv
+                        changed.add(pk)
+            elif k in self.state and v is not None and self.state[k] != v:
+                self.state[k] = v
+                changed.add(k)
+
+        if "trip_type" in changed and self.state["trip_type"] == "one_way":
+            self.state["return_date"] = None
+            self.state["return_resolved"] = True
+        elif changed & {"trip_type", "travel_date", "days"}:
+            # Re-derived from the new dates by the flight stage
+            self.state["return_date"] = None
+            self.state["return_resolved"] = False
+
+        return bool(changed)
+
+    # FORM MODE
+    def plan_form(self, form: dict, deadline: Deadline | None = None, on_partial=None) -> dict:
+        """
+        One-shot planning from a fully specified trip, as the form does:
+        no questions are asked, problems come back as FORM_ERROR.
+        """
+        missing = [f for f in FORM_FIELDS if form.get(f) in (None, "")]
+        if missing:
+            return {
+                "status": "FORM_ERROR",
+                "message": f"❌ Missing fields: {', '.join(missing)}"
+            }
+        days, travelers = form["days"], form["travelers"]
+        try:
+            travel_date = date.fromisoformat(form["travel_date"])
+        except (TypeError, ValueError):
+            travel_date = None
+        if travel_date is None or not all(
+            isinstance(n, int) and not isinstance(n, bool) for n in (days, travelers)
+        ):
+            return {
+                "status": "FORM_ERROR",
+                "message": "❌ travel_date must be YYYY-MM-DD; days and travelers must be whole numbers."
+            }
+        text_fields = ("source", "destination", "trip_type", "budget")
+        if not all(isinstance(form[f], str) for f in text_fields):
+            return {
+                "status": "FORM_ERROR",
+                "message": f"❌ {', '.join(text_fields)} must be text."
+            }
+        interests = form.get("interests")
+        if interests is None:
+            interests = []
+        if not isinstance(interests, list) or not all(isinstance(i, str) for i in interests):
+            return {
+                "status": "FORM_ERROR",
+                "message": "❌ interests must be a list of text."
+            }
+        trip_type = str(form["trip_type"]).lower().replace("-", "_").replace(" ", "_")
+        if trip_type not in ("one_way", "round_trip") or days < 1 or travelers < 1:
+            return {
+                "status": "FORM_ERROR",
+                "message": "❌ trip_type must be one_way or round_trip; days and travelers must be positive."
+            }
+
+        self._reset_state()
+        self.state["source"] = form["source"]
+        self.state["destination"] = form["destination"]
+        self.state["trip_type"] = trip_type
+        self.state["travel_date"] = travel_date.isoformat()
+        self.state["days"] = days
+        self.state["travelers"] = travelers
+        self.state["preferences"].update({
+            "budget": form["budget"],
+            "interests": interests,
+        })
+        self.state["started"] = True
+        self.force_finalize = True
+
+        return self.run("plan my trip", deadline=deadline, on_partial=on_partial)
+
     # MAIN RUN
-    def run(self, user_query: str) -> dict:
-        import copy
-        state_snapshot = copy.deepcopy(self.state)
+    def run(self, user_query: str, deadline: Deadline | None = None, on_partial=None) -> dict:
+        """
+        One conversation turn under a latency budget (the given deadline,
+        or turn_budget_s). Stages that had to take their cheap path are
+        listed in the response under DEGRADED.
+        on_partial(component, result) receives plan components (hotel,
+        weather, places, budget, itinerary) as they become ready.
+        A turn that raises leaves the trip fields as they were.
+        """
+        self._deadline = deadline or Deadline(self.turn_budget_s)
+        self._on_partial = on_partial
+
+        # Only this turn's writes are journaled
+        state = self.state
+        state.release()
+        state_snapshot = state.snapshot()
+        try:
+            response = self._run_turn(user_query, state_snapshot)
+        except Exception:
+            self.state = state
+            state.rollback(state_snapshot)
+            raise
+        finally:
+            self._on_partial = None
+
+        degraded = self._deadline.degraded
+        if degraded:
+            response["DEGRADED"] = degraded
+        return response
+
+    def _run_turn(self, user_query: str, state_snapshot: int) -> dict:
         self._parsed_this_turn = False
         user_lower = user_query.lower().strip()
+        deadline = self._deadline
 
         if not user_query or not user_query.strip():
             return {"status": "NEED_INPUT", "question": "Please enter a valid response."}
@@ -607,7 +923,10 @@ class TravelAgent:
                 }
 
             
-            extracted = parse_travel_intent(self.llm, user_query, self.state.copy())
+            extracted = parse_travel_intent(
+                self.llm, user_query, self.state.to_dict(),
+                deadline=deadline, session_id=self.session_id
+            )
 
             for k, v in extracted.items():
                 if k == "preferences":
@@ -620,6 +939,7 @@ class TravelAgent:
             slot, question = self._missing_slot()
             if slot:
                 self.pending_slot = slot
+                self._prefetch()
                 return {
                     "status": "NEED_INPUT",
                     "question": question
@@ -693,82 +1013,30 @@ class TravelAgent:
         
 
         # ---------- SLOT FILLING ----------
+        # A bare answer ("Mumbai", "3", "round trip") is read by the slot's
+        # own parser. The full extractor only runs when that fails or the
+        # reply says more ("goa for 5 days").
         if self.pending_slot:
             slot = self.pending_slot
             self.pending_slot = None
-            try:
-                if slot in ("days", "travelers"):
-                    value = int(user_query)
-                    if value <= 0:
-                        return {
-                            "status": "NEED_INPUT",
-                            "question": f"Please enter a valid positive number for {slot}."
-                        }
-                    self.state[slot] = value
-                    self._reflection_count = 0 
-
-                elif slot == "trip_type":
-                    if "round" in user_lower:
-                        self.state["trip_type"] = "round_trip"
-                        self._reflection_count = 0 
-                    elif "one" in user_lower:
-                        self.state["trip_type"] = "one_way"
-                        self._reflection_count = 0 
-                    else:
-                        return {
-                            "status": "NEED_INPUT",
-                            "question": "Please type one-way or round-trip."
-                        }
-
-                elif slot == "budget":
-                    self.state["preferences"]["budget"] = user_lower
-                    self._reflection_count = 0 
 
-                elif slot == "travel_date":
-                    iso_date = self._parse_human_date(user_query)
+            answer = parse_slot_answer(slot, user_query)
+            before = self._slot_value(slot)
 
-                    if not iso_date:
-                        return {
-                            "status": "NEED_INPUT",
-                            "question": (
-                                "I couldn’t understand that date 🤔\n\n"
-                                "Please enter something like:\n"
-                                "• 2025-12-29\n"
-                                "• 29 Dec\n"
-                                "• December 29"
-                            )
-                        }
+            if answer is None or answer.extra:
+                self._safe_parse(user_query)
+                self._parsed_this_turn = True
 
-                    d = datetime.fromisoformat(iso_date).date()
-                    if d < date.today():
-                        return {
-                            "status": "NEED_INPUT",
-                            "question": "Please enter a **future date**."
-                        }
+            if self._slot_value(slot) == before:
+                error = self._apply_slot_answer(slot, answer)
+                if error:
+                    self.pending_slot = slot
+                    return error
 
-                    self.state["travel_date"] = iso_date
-                    self._reflection_count = 0
-                    self.pending_slot = None 
+            self._reflection_count = 0
 
-                else:
-                    if slot in ("source", "destination"):
-                        city = self._extract_city(user_query)
-                        if not city:
-                            return {
-                                "status": "NEED_INPUT",
-                                "question": f"Please enter a valid city name for {slot}."
-                            }
-                        self.state[slot] = city
-                        self._reflection_count = 0 
-                    else:
-                        self.state[slot] = user_query.strip()
-                        self.pending_slot = None 
-
-            except Exception:
-                return {
-                    "status": "NEED_INPUT",
-                    "question": f"Invalid value for {slot}. Please try again."
-                }
+        elif self._plan_nodes and self._apply_plan_edit(user_query):
+            self._reflection_count = 0
 
         else:
             if not self._parsed_this_turn:
@@ -777,10 +1045,19 @@ class TravelAgent:
 
         validation = self._validate_current_state()
         if validation:
+            if self.force_finalize:
+                # Form mode: nobody is there to answer, drop the prompt line
+                self.pending_slot = None
+                return {
+                    "status": "FORM_ERROR",
+                    "message": validation["question"].rsplit("\n\n", 1)[0],
+                }
             return validation
 
+        self._prefetch()
+
         if (
-            self.state == state_snapshot
+            not self.state.changed_since(state_snapshot)
             and not self.pending_slot
             and not self.pending_outbound_options
             and not self.pending_return_options
@@ -798,9 +1075,35 @@ class TravelAgent:
                     "question": self._build_reflective_prompt(question)}
 
 
-        # ---------- OUTBOUND ----------
+        # ---------- FLIGHT SEARCH (outbound ‖ return) ----------
         travel_date = datetime.fromisoformat(self.state["travel_date"]).date()
-        outbound_data = search_flights(self.state["source"], self.state["destination"])
+        round_trip = self.state["trip_type"] == "round_trip"
+        source, destination = self.state["source"], self.state["destination"]
+
+        key = self._prefetch_key
+        flight_search = TaskGraph().add(
+            "outbound_flights",
+            lambda: self.prefetch.take(
+                key("flights", source, destination),
+                lambda: search_flights(source, destination, deadline=deadline),
+            ),
+            inputs=key(source, destination),
+        )
+        if round_trip:
+            flight_search.add(
+                "return_flights",
+                lambda: self.prefetch.take(
+                    key("flights", destination, source),
+                    lambda: search_flights(destination, source, deadline=deadline),
+                ),
+                inputs=key(destination, source),
+            )
+        found = flight_search.run(TOOL_POOL, previous=self._plan_nodes)
+        self._plan_nodes.update(flight_search.nodes)
+        tool_timings = dict(flight_search.timings)
+
+        # ---------- OUTBOUND ----------
+        outbound_data = found["outbound_flights"]
         available_days = outbound_data.get("available_weekdays", [])
 
         base_price = (
@@ -809,14 +1112,17 @@ class TravelAgent:
         )
 
         if travel_date.strftime("%A").lower() not in available_days:
-            candidates = self._outbound_date_candidates(travel_date)
-            valid_dates = [d for d in candidates if d.strftime("%A").lower() in available_days]
+            nearby = self._cheapest_nearby_dates(
+                source, destination, travel_date, OUTBOUND_FLEX_DAYS,
+                earliest=date.today() + timedelta(days=1),
+            )
+            valid_dates = [d for d, _ in nearby]
 
             #  FORM MODE → FRIENDLY MESSAGE (NO NEED_INPUT)
             if self.force_finalize:
                 suggestions = "\n".join(
-                    f"• {d.isoformat()} ({d.strftime('%A')})"
-                    for d in valid_dates[:3]
+                    f"• {d.isoformat()} ({d.strftime('%A')}) – from ₹{fare}"
+                    for d, fare in nearby[:3]
                 ) or "No nearby available dates."
 
                 return {
@@ -824,7 +1130,7 @@ class TravelAgent:
                     "message": (
                         f"❌ **Flights are not available on "
                         f"{travel_date.strftime('%A')} ({travel_date.isoformat()})**\n\n"
-                        f"**Nearest available dates:**\n"
+                        f"**Cheapest nearby dates:**\n"
                         f"{suggestions}\n\n"
                         f"👉 Please change the travel date in the form and try again."
                     )
@@ -835,10 +1141,11 @@ class TravelAgent:
             return {
                 "status": "NEED_INPUT",
                 "question": (
-                    f"Flights are not available on {self.state['travel_date']}.\n\n" +
+                    f"Flights are not available on {self.state['travel_date']}.\n\n"
+                    "Cheapest nearby dates:\n" +
                     "\n".join(
-                        f"{i+1}) {d.isoformat()}"
-                        for i, d in enumerate(valid_dates)
+                        f"{i+1}) {d.isoformat()} ({d.strftime('%A')}) – from ₹{fare}"
+                        for i, (d, fare) in enumerate(nearby)
                     ) +
                     "\n\nChoose a number or type 'cancel'."
                 )
@@ -850,11 +1157,11 @@ class TravelAgent:
         # ---------- RETURN ----------
         return_flight = None
 
-        if self.state["trip_type"] == "round_trip":
+        if round_trip:
             start = travel_date
             planned_return = start + timedelta(days=self.state["days"] - 1)
 
-            return_data = search_flights(self.state["destination"], self.state["source"])
+            return_data = found["return_flights"]
             #  ROUTE DOES NOT EXIST AT ALL
             if not return_data or not return_data.get("direct_flights"):
                 return {
@@ -870,23 +1177,18 @@ class TravelAgent:
             # Return not available on planned date
             if planned_return.strftime("%A").lower() not in return_days:
 
-                #  Try nearby day-count adjustments
-                day_offsets = [-3, -2, -1, 1, 2, 3]
-                valid_day_options = []
-
-                for offset in day_offsets:
-                    new_days = self.state["days"] + offset
-                    if new_days <= 1:
-                        continue
-
-                    candidate_return = start + timedelta(days=new_days - 1)
-                    if candidate_return.strftime("%A").lower() in return_days:
-                        valid_day_options.append((new_days, candidate_return))
+                #  Cheapest return days within a few days of the plan
+                nearby = self._cheapest_nearby_dates(
+                    destination, source, planned_return, RETURN_FLEX_DAYS,
+                    earliest=start + timedelta(days=1),
+                )
+                valid_day_options = [((d - start).days + 1, d) for d, _ in nearby]
+                return_fares = dict(nearby)
 
                 #  FORM MODE → FRIENDLY MESSAGE
                 if self.force_finalize:
                     suggestions = "\n".join(
-                        f"• **{days} days** → return on {d.strftime('%A')} ({d.isoformat()})"
+                        f"• **{days} days** → return on {d.strftime('%A')} ({d.isoformat()}) – from ₹{return_fares[d]}"
                         for days, d in valid_day_options[:3]
                     ) or "No nearby return options found."
 
@@ -908,9 +1210,9 @@ class TravelAgent:
                     "status": "NEED_INPUT",
                     "question": (
                         "❌ Return flights are not available for your current trip duration.\n\n"
-                        "Here are the nearest available return options:\n"
+                        "Here are the cheapest nearby return options:\n"
                         + "\n".join(
-                            f"{i+1}) **{days} days** → return on {d.strftime('%A')} ({d.isoformat()})"
+                            f"{i+1}) **{days} days** → return on {d.strftime('%A')} ({d.isoformat()}) – from ₹{return_fares[d]}"
                             for i, (days, d) in enumerate(valid_day_options)
                         )
                         + "\n\nChoose a number or type **one-way**."
@@ -922,86 +1224,136 @@ class TravelAgent:
             self.state["return_resolved"] = True
             return_flight = return_data.get("direct_flights", [None])[0]
 
-
-
-            
-
-        if self.state["trip_type"] == "round_trip":
-            return_data = search_flights(self.state["destination"], self.state["source"])
-            return_flights = return_data.get("direct_flights", [])
-            return_flight = return_flights[0] if return_flights else None
-        else:
-            return_flight = None
-
-        # ---------- FINAL ----------
-        hotel = search_hotels(
-            self.state["destination"],
-            "price_low_to_high" if self.state["preferences"]["budget"] == "budget" else "highest_rated"
-        ).get("hotels", [None])[0]
+        # ---------- FINAL (hotel ‖ weather ‖ places → budget, itinerary) ----------
+        days = self.state["days"]
+        travelers = self.state["travelers"]
+        budget_tier = self.state["preferences"]["budget"]
 
         start_date = travel_date
         end_date = (
             datetime.fromisoformat(self.state["return_date"]).date()
-            if self.state["trip_type"] == "round_trip" and self.state["return_date"]
-            else start_date + timedelta(days=self.state["days"] - 1)
+            if round_trip and self.state["return_date"]
+            else start_date + timedelta(days=days - 1)
         )
 
-        try:
-            weather = weather_lookup(
-                self.state["destination"],
-                start_date.isoformat(),
-                end_date.isoformat()
+        hotel_order = "price_low_to_high" if budget_tier == "budget" else "highest_rated"
+
+        def find_hotel():
+            return self.prefetch.take(
+                key("hotels", destination, hotel_order),
+                lambda: search_hotels(destination, hotel_order)
+            ).get("hotels", [None])[0]
+
+        def find_weather():
+            try:
+                return self.prefetch.take(
+                    key("weather", destination, start_date, end_date),
+                    lambda: weather_lookup(
+                        destination,
+                        start_date.isoformat(),
+                        end_date.isoformat(),
+                        deadline=deadline
+                    ),
+                    timeout=deadline.remaining()
+                )
+            except Exception as e:
+                print(f"⚠️ Weather fallback used: {e}")
+                deadline.degrade("weather")
+                return {
+                    "supported": False,
+                    "city": destination,
+                    "message": f"Weather data is not available for {destination}.",
+                    "daily_forecast": []
+                }
+
+        def find_places():
+            raw_places = self.prefetch.take(
+                key("places", destination),
+                lambda: search_places(destination)
+            ).get("places", [])
+            for p in raw_places[:max(days * 2, 3)]:
+                p["rating"] = p.get("rating", "N/A")
+            return raw_places
+
+        def estimate_budget(hotel):
+            return estimate_trip_budget(
+                outbound_flight,
+                hotel,
+                days,
+                travelers,
+                return_flight=return_flight,
+                budget_tier=budget_tier or "budget"
+            )
+
+        def build_itinerary(hotel, places, weather):
+            return self._generate_day_wise_itinerary(
+                travel_date,
+                days,
+                hotel,
+                places,
+                weather,
+                outbound_flight=outbound_flight,
+                return_flight=return_flight,
             )
-        except Exception as e:
-            print(f"⚠️ Weather fallback used: {e}")
-            weather = {
-                "supported": False,
-                "city": self.state["destination"],
-                "message": f"Weather data is not available for {self.state['destination']}.",
-                "daily_forecast": []
-            }
 
-        budget = estimate_trip_budget(
-        outbound_flight,
-        hotel,
-        self.state["days"],
-        self.state["travelers"],
-        return_flight=return_flight,
-        budget_tier=self.state["preferences"]["budget"] or "budget"
-    )
-
-
-        raw_places = search_places(self.state["destination"]).get("places", [])
-        places = []
-        for p in raw_places[:max(self.state["days"] * 2, 3)]:
-            p["rating"] = p.get("rating", "N/A")
-            places.append(p)
-
-        day_wise_itinerary = self._generate_day_wise_itinerary(
-            travel_date,
-            self.state["days"],
-            hotel,
-            raw_places,
-            weather,
-            outbound_flight=outbound_flight,
-            return_flight=return_flight,
+        def find_packages():
+            # Budget travelers get the cheapest packages, others the best value
+            return optimize_trip(
+                source,
+                destination,
+                max(travel_date - timedelta(days=PACKAGE_FLEX_DAYS), date.today() + timedelta(days=1)),
+                travel_date + timedelta(days=PACKAGE_FLEX_DAYS),
+                days,
+                travelers,
+                round_trip=round_trip,
+                budget_tier=budget_tier or "budget",
+                objective="cost" if budget_tier in (None, "budget") else "value",
+                top_k=PACKAGE_OPTIONS,
+                target=travel_date,
+            )["packages"]
+
+        # Each component lists the trip fields it depends on
+        flights = (outbound_flight, return_flight)
+        final_stage = (
+            TaskGraph()
+            .add("hotel", find_hotel, inputs=key(destination, hotel_order))
+            .add("weather", find_weather, inputs=(*key(destination), start_date, end_date))
+            .add("places", find_places, inputs=(*key(destination), days))
+            .add(
+                "budget", estimate_budget, deps=("hotel",),
+                inputs=(*flights, days, travelers, budget_tier),
+            )
+            .add(
+                "itinerary", build_itinerary, deps=("hotel", "places", "weather"),
+                inputs=(*flights, travel_date, days),
+            )
+            .add(
+                "packages", find_packages,
+                inputs=(*key(source, destination), travel_date, days, travelers, budget_tier, round_trip),
+            )
         )
-        
+        plan = final_stage.run(TOOL_POOL, previous=self._plan_nodes, on_result=self._on_partial)
+        self._plan_nodes.update(final_stage.nodes)
+        tool_timings.update(final_stage.timings)
+
         self.force_finalize = False
 
         return {
             "status": "COMPLETED",
-            "FINAL_INTENT_JSON": self.state,
+            "FINAL_INTENT_JSON": self.state.to_dict(),
             "TRIP_PLAN": {
                 "FLIGHT": {
                 "outbound": outbound_flight,
                 "return": return_flight},
-                "HOTEL": hotel,
-                "PLACES": raw_places,
-                "WEATHER": weather,
-                "BUDGET_ESTIMATE": budget,
-                "DAY_WISE_ITINERARY": day_wise_itinerary
-            }
+                "HOTEL": plan["hotel"],
+                "PLACES": plan["places"],
+                "WEATHER": plan["weather"],
+                "BUDGET_ESTIMATE": plan["budget"],
+                "DAY_WISE_ITINERARY": plan["itinerary"]
+            },
+            "PACKAGE_OPTIONS": plan["packages"],
+            "TOOL_TIMINGS": tool_timings,
+            "RECOMPUTED": flight_search.recomputed + final_stage.recomputed
         }
 
     # SAFE PARSER
@@ -1011,7 +1363,9 @@ class TravelAgent:
             extracted = parse_travel_intent(
                 self.llm,
                 user_query,
-                self.state.copy()
+                self.state.to_dict(),
+                deadline=self._deadline,
+                session_id=self.session_id
             )
 
             for k, v in extracted.items():
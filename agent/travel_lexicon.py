@@ -0,0 +1,250 @@
+from functools import lru_cache
+
+from utils.gazetteer import known_cities
+from utils.phrase_matcher import PhraseMatcher, NUM, maximal_spans
+
+
+# Every phrase the deterministic parsers recognise, compiled into a single
+# Aho-Corasick automaton. Entries are (phrase, value, confidence); "<num>"
+# matches digits and number words, callables receive the captured number.
+
+NUMBER_WORDS = {
+    "one": 1, "two": 2, "three": 3, "four": 4, "five": 5,
+    "six": 6, "seven": 7, "eight": 8, "nine": 9, "ten": 10,
+    "eleven": 11, "twelve": 12, "thirteen": 13, "fourteen": 14,
+    "fifteen": 15, "sixteen": 16, "seventeen": 17, "eighteen": 18,
+    "nineteen": 19, "twenty": 20, "thirty": 30,
+    "a couple of": 2, "a couple": 2, "couple of": 2, "a pair of": 2,
+    "a few": 3, "a dozen": 12,
+}
+
+COMPANIONS = [
+    "wife", "husband", "partner", "spouse", "girlfriend", "boyfriend", "fiance",
+    "fiancee", "friend", "mom", "mother", "dad", "father", "brother", "sister",
+    "son", "daughter", "colleague", "buddy",
+]
+
+GROUP_NOUNS = [
+    "friends", "others", "colleagues", "kids", "children", "family members",
+]
+
+PEOPLE_NOUNS = [
+    "people", "person", "persons", "traveler", "travelers", "traveller",
+    "travellers", "pax", "adult", "adults", "guest", "guests", "member", "members",
+]
+
+CHILD_NOUNS = [
+    "kid", "kids", "child", "children", "infant", "infants", "baby", "babies",
+    "toddler", "toddlers", "teen", "teens", "teenager", "teenagers",
+]
+
+# "<num> <people noun>" groups add up: "2 adults and 2 kids" is 4
+HEADCOUNT_PHRASES = [
+    (f"{NUM} {noun}", lambda n: n, 0.95) for noun in PEOPLE_NOUNS + CHILD_NOUNS
+]
+
+HEADCOUNT_NOUNS = set(PEOPLE_NOUNS + CHILD_NOUNS + GROUP_NOUNS)
+
+# Headcounts the LLM should double-check
+UNSURE_HEADCOUNT_CONFIDENCE = 0.6
+
+TRAVELER_PHRASES = (
+    [(f"{NUM} of us", lambda n: n, 0.95)]
+    + [
+        (f"{lead} {NUM}", lambda n: n, 0.9)
+        for lead in ("we are", "we're", "party of", "group of", "family of")
+    ]
+    + [
+        (f"{me} {joiner} {NUM} {group}", lambda n: n + 1, 0.9)
+        for me in ("me", "myself", "i")
+        for joiner in ("and", "with", "+")
+        for group in GROUP_NOUNS
+    ]
+    + [
+        (f"{me} {joiner} my {c}", 2, 0.95)
+        for me in ("me", "myself", "i")
+        for joiner in ("and", "with", "+")
+        for c in COMPANIONS
+    ]
+    + [(f"with my {c}", 2, 0.85) for c in COMPANIONS]
+    + [
+        (p, 1, 0.9)
+        for p in ("solo", "alone", "just me", "only me", "by myself", "on my own")
+    ]
+    + [("couple", 2, 0.7), ("honeymoon", 2, 0.7)]
+)
+
+DAY_PHRASES = [
+    ("a week and a half", 10, 0.9),
+    ("one week and a half", 10, 0.9),
+    (f"{NUM} and a half weeks", lambda n: round(7 * (n + 0.5)), 0.9),
+    (f"{NUM} day", lambda n: n, 0.95),
+    (f"{NUM} days", lambda n: n, 0.95),
+    (f"{NUM} night", lambda n: n + 1, 0.8),
+    (f"{NUM} nights", lambda n: n + 1, 0.8),
+    (f"{NUM} week", lambda n: 7 * n, 0.9),
+    (f"{NUM} weeks", lambda n: 7 * n, 0.9),
+    ("a week", 7, 0.9),
+    ("week long", 7, 0.9),
+    ("fortnight", 14, 0.9),
+    ("a fortnight", 14, 0.9),
+    ("long weekend", 3, 0.8),
+    ("a weekend", 2, 0.75),
+    ("weekend trip", 2, 0.75),
+    ("weekend getaway", 2, 0.75),
+    ("day trip", 1, 0.8),
+]
+
+# "in 3 days" names a date, not a duration; the longer span wins
+RELATIVE_DATE_PHRASES = [
+    (f"{lead} {NUM} {unit}", None, 1.0)
+    for lead in ("in", "after", "within")
+    for unit in ("day", "days", "week", "weeks")
+]
+
+BUDGET_PHRASES = (
+    [
+        (p, "budget", 0.95)
+        for p in (
+            "on a budget", "on a tight budget", "tight budget", "shoestring",
+            "on a shoestring", "low cost", "cheap", "cheapest", "inexpensive",
+            "affordable", "economical", "budget friendly", "backpacking", "backpacker",
+        )
+    ]
+    + [("budget", "budget", 0.8)]
+    + [
+        (p, "luxury", 0.95)
+        for p in (
+            "luxury", "luxurious", "premium", "lavish", "upscale", "high end",
+            "splurge", "5 star", "five star",
+        )
+    ]
+    + [
+        (p, "mid-range", 0.9)
+        for p in ("mid range", "midrange", "mid", "moderate", "standard", "mid level")
+    ]
+    + [("comfortable", "mid-range", 0.7)]
+)
+
+TRIP_TYPE_PHRASES = (
+    [
+        (p, "round_trip", 0.95)
+        for p in ("round trip", "roundtrip", "return trip", "two way", "2 way", "both ways")
+    ]
+    + [(p, "one_way", 0.95) for p in ("one way", "single trip", "no return")]
+    + [("return", "round_trip", 0.7), ("returning", "round_trip", 0.7)]
+)
+
+SOURCE_CUES = [
+    "from", "leaving", "leaving from", "departing", "departing from",
+    "starting from", "flying out of", "out of",
+]
+
+DESTINATION_CUES = [
+    "to", "visit", "visiting", "explore", "in", "towards", "for", "into",
+]
+
+# Words that carry no slot information on their own
+FILLER_WORDS = {
+    "a", "an", "the", "i", "we", "us", "me", "my", "our", "you", "your", "it", "is",
+    "am", "are", "be", "to", "from", "for", "of", "on", "in", "at", "and", "or", "with",
+    "want", "wanna", "would", "like", "love", "need", "plan", "planning", "trip",
+    "travel", "traveling", "travelling", "vacation", "holiday", "holidays", "tour",
+    "go", "going", "visit", "fly", "flying", "please", "can", "could", "help", "book",
+    "hi", "hello", "hey", "thanks", "thank", "ok", "okay", "yes", "yeah", "sure",
+    "sounds", "good", "great", "correct", "lets", "let's", "let", "make", "this",
+    "that", "some", "take", "get", "family", "business", "around", "about", "there",
+    "just", "so", "now", "then", "also", "too", "nice", "somewhere", "journey", "flight",
+    "flights", "people", "days", "day", "starting", "start", "leaving", "total",
+    "thinking", "looking", "hoping", "wish", "maybe", "again", "all", "something",
+    "out", "change", "destination", "source", "city", "instead", "actually",
+}
+
+# Words that surround a city name in slot answers ("change destination to Goa")
+CITY_NOISE_WORDS = {
+    "starting", "from", "date", "travel", "trip", "going", "to", "please", "change",
+    "destination", "source", "city", "on",
+}
+
+
+@lru_cache(maxsize=1)
+def travel_matcher() -> PhraseMatcher:
+    """
+    The compiled matcher (built once per process).
+
+    Span kinds: travelers, headcount, days, relative_date, budget,
+    trip_type, city, source_cue, destination_cue
+    """
+    matcher = PhraseMatcher(NUMBER_WORDS)
+
+    for kind, phrases in (
+        ("travelers", TRAVELER_PHRASES),
+        ("headcount", HEADCOUNT_PHRASES),
+        ("days", DAY_PHRASES),
+        ("relative_date", RELATIVE_DATE_PHRASES),
+        ("budget", BUDGET_PHRASES),
+        ("trip_type", TRIP_TYPE_PHRASES),
+    ):
+        for phrase, value, confidence in phrases:
+            matcher.add(phrase, kind, value, confidence)
+
+    for name, city in known_cities().items():
+        matcher.add(name, "city", city)
+
+    for cue in SOURCE_CUES:
+        matcher.add(cue, "source_cue")
+    for cue in DESTINATION_CUES:
+        matcher.add(cue, "destination_cue")
+
+    return matcher.compile()
+
+
+def scan_message(text: str):
+    """
+    Tokens and maximal spans of one message (lowercased, single pass).
+    """
+    tokens, spans = travel_matcher().scan(text.lower())
+    return tokens, maximal_spans(spans)
+
+
+def count_travelers(tokens: list, spans: list):
+    """
+    Number of travelers a message gives: (count, confidence, token
+    indices), or None.
+    - "<num> <people noun>" groups add up ("2 adults and 2 kids" → 4)
+    - A phrase overlapping a group names the same people ("we are 4 people")
+    - Unsure (LLM double-checks) when the count mixes groups with other
+      phrases, counts only children, or leaves people words unexplained
+      ("2 adults plus kids")
+    """
+    groups = [s for s in spans if s.kind == "headcount"]
+    grouped = {i for s in groups for i in range(s.first_token, s.last_token)}
+    phrases = [
+        s for s in spans
+        if s.kind == "travelers"
+        and not grouped.intersection(range(s.first_token, s.last_token))
+    ]
+    if not groups and not phrases:
+        return None
+
+    if groups:
+        count = sum(s.value for s in groups)
+        confidence = min(s.confidence for s in groups)
+        if all(tokens[s.last_token - 1].text in CHILD_NOUNS for s in groups):
+            confidence = min(confidence, UNSURE_HEADCOUNT_CONFIDENCE)
+        used = set(grouped)
+        if phrases:
+            best = max(phrases, key=lambda s: (s.confidence, -s.start, s.size))
+            count += best.value
+            confidence = min(confidence, UNSURE_HEADCOUNT_CONFIDENCE)
+            used.update(range(best.first_token, best.last_token))
+    else:
+        best = max(phrases, key=lambda s: (s.confidence, -s.start, s.size))
+        count, confidence = best.value, best.confidence
+        used = set(range(best.first_token, best.last_token))
+
+    covered = {i for s in spans for i in range(s.first_token, s.last_token)}
+    if any(t.text in HEADCOUNT_NOUNS and i not in covered for i, t in enumerate(tokens)):
+        confidence = min(confidence, UNSURE_HEADCOUNT_CONFIDENCE)
+
+    return count, confidence, sorted(used)
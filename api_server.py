@@ -0,0 +1,265 @@
+"""
+Headless HTTP API over TravelAgent (ASGI, no Streamlit).
+
+    python api_server.py [--host 127.0.0.1] [--port 8000] [--workers 16] [--db sessions.db] [--stub-llm]
+    uvicorn --factory api_server:create_app
+
+Endpoints:
+- POST   /v1/turn              {"session_id": null | "...", "message": "..."}
+- POST   /v1/plan              {"source", "destination", "trip_type", "travel_date",
+                                "days", "travelers", "budget", "interests"?}
+- DELETE /v1/sessions/<id>
+- GET    /v1/health
+
+Add ?stream=1 to /v1/turn or /v1/plan for NDJSON: one line per plan
+component as it becomes ready, then the full response. A "reset" line
+means the turn is running again (another request saved the session
+first): discard the components received before it.
+"""
+import argparse
+import asyncio
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs
+
+from agent.admission import admission_stats
+from agent.session_store import RESET, SessionConflict, SessionStore, SQLiteBackend
+from agent.travel_agent import TravelAgent
+from tools.tool_cache import tool_cache_stats
+
+
+# CONFIGURATION
+
+API_WORKERS = int(os.getenv("API_WORKERS", "16"))
+MAX_BODY_BYTES = 64 * 1024
+MAX_MESSAGE_CHARS = 2000
+
+_DONE = object()
+
+
+class StubLLM:
+    """Answers every extraction with {} (load tests, no model installed)."""
+
+    def invoke(self, prompt, **kwargs):
+        return "{}"
+
+
+def stub_model_info() -> dict:
+    return {"instance": StubLLM(), "provider": "Stub", "model_name": "stub", "status": "ok"}
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def _encode(payload: dict) -> bytes:
+    # Plans hold dates and other non-JSON values in places
+    return json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8")
+
+
+# APP
+
+class TravelAPI:
+    """
+    ASGI app. Turns run on a thread pool so the event loop only moves
+    bytes; every turn shares the process-wide model, datasets, tool
+    cache and session store. For more cores, run several processes on
+    one SQLite session file (uvicorn --workers N).
+    """
+
+    def __init__(self, model_info: dict, store: SessionStore | None = None, workers: int = API_WORKERS):
+        self.model_info = model_info
+        self.store = store or SessionStore(model_info)
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="api-turns")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            return
+
+        try:
+            await self._route(scope, receive, send)
+        except HTTPError as e:
+            await self._respond(send, e.status, {"error": e.message})
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                self.pool.shutdown(wait=False, cancel_futures=True)
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def _route(self, scope, receive, send):
+        method, path = scope["method"], scope["path"].rstrip("/")
+        stream = parse_qs(scope.get("query_string", b"").decode()).get("stream") == ["1"]
+
+        if path == "/v1/health":
+            self._allow(method, "GET")
+            await self._respond(send, 200, self.health())
+
+        elif path == "/v1/turn":
+            self._allow(method, "POST")
+            body = await self._read_json(receive)
+            message = body.get("message")
+            if not isinstance(message, str) or not message.strip():
+                raise HTTPError(400, "'message' must be a non-empty string")
+            if len(message) > MAX_MESSAGE_CHARS:
+                raise HTTPError(413, "'message' is too long")
+            session_id = body.get("session_id")
+            if session_id is not None and not isinstance(session_id, str):
+                raise HTTPError(400, "'session_id' must be a string")
+
+            job = lambda on_partial: self.store.run(session_id, message, on_partial=on_partial)
+            await self._run(send, job, stream)
+
+        elif path == "/v1/plan":
+            self._allow(method, "POST")
+            form = await self._read_json(receive)
+            job = lambda on_partial: TravelAgent(model_info=self.model_info).plan_form(
+                form, on_partial=on_partial
+            )
+            await self._run(send, job, stream)
+
+        elif path.startswith("/v1/sessions/"):
+            self._allow(method, "DELETE")
+            self.store.end(path.rsplit("/", 1)[1])
+            await self._respond(send, 200, {"status": "ended"})
+
+        else:
+            raise HTTPError(404, "Not found")
+
+    @staticmethod
+    def _allow(method: str, allowed: str):
+        if method != allowed:
+            raise HTTPError(405, f"Use {allowed}")
+
+    # REQUEST / RESPONSE
+
+    @staticmethod
+    async def _read_json(receive) -> dict:
+        chunks, size = [], 0
+        while True:
+            message = await receive()
+            chunk = message.get("body", b"")
+            size += len(chunk)
+            if size > MAX_BODY_BYTES:
+                raise HTTPError(413, "Request body too large")
+            chunks.append(chunk)
+            if not message.get("more_body"):
+                break
+        try:
+            body = json.loads(b"".join(chunks) or b"{}")
+        except ValueError:
+            raise HTTPError(400, "Body must be JSON")
+        if not isinstance(body, dict):
+            raise HTTPError(400, "Body must be a JSON object")
+        return body
+
+    @staticmethod
+    async def _respond(send, status: int, payload: dict):
+        body = _encode(payload)
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+    async def _run(self, send, job, stream: bool):
+        loop = asyncio.get_running_loop()
+        if not stream:
+            try:
+                response = await loop.run_in_executor(self.pool, job, None)
+            except SessionConflict:
+                raise HTTPError(409, "Session was updated by another request; retry the turn")
+            except Exception as e:
+                raise HTTPError(500, f"{type(e).__name__}: {e}")
+            await self._respond(send, 200, response)
+            return
+
+        queue = asyncio.Queue()
+
+        def on_partial(component, result):
+            if component == RESET:
+                item = {"event": "reset"}
+            else:
+                item = {"event": "partial", "component": component, "result": result}
+            loop.call_soon_threadsafe(queue.put_nowait, item)
+
+        future = loop.run_in_executor(self.pool, job, on_partial)
+        # Runs on the loop after every queued partial
+        future.add_done_callback(lambda _: queue.put_nowait(_DONE))
+
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [(b"content-type", b"application/x-ndjson")],
+        })
+        while True:
+            item = await queue.get()
+            if item is _DONE:
+                break
+            await send({"type": "http.response.body", "body": _encode(item) + b"\n", "more_body": True})
+
+        try:
+            last = {"event": "response", "response": future.result()}
+        except Exception as e:
+            last = {"event": "error", "error": str(e)}
+        await send({"type": "http.response.body", "body": _encode(last) + b"\n"})
+
+    def health(self) -> dict:
+        return {
+            "status": "ok",
+            "model": self.model_info["model_name"],
+            "sessions": self.store.stats(),
+            "tool_cache": tool_cache_stats(),
+            "admission": admission_stats(),
+        }
+
+
+def create_app(model_info: dict | None = None, db: str | None = None, workers: int = API_WORKERS) -> TravelAPI:
+    """
+    App factory. Without a model_info the configured model is loaded;
+    API_STUB_LLM=1 uses the stub, SESSION_DB a shared session file.
+    """
+    if model_info is None:
+        if os.getenv("API_STUB_LLM") == "1":
+            model_info = stub_model_info()
+        else:
+            from agent.llm_loader import load_llm
+            model_info = load_llm()
+
+    db = db or os.getenv("SESSION_DB")
+    backend = SQLiteBackend(db) if db else None
+    return TravelAPI(model_info, SessionStore(model_info, backend=backend), workers=workers)
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Headless travel planning API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=API_WORKERS, help="Turn threads")
+    parser.add_argument("--db", default=None, help="SQLite session file (default: in memory)")
+    parser.add_argument("--stub-llm", action="store_true")
+    args = parser.parse_args()
+
+    app = create_app(stub_model_info() if args.stub_llm else None, db=args.db, workers=args.workers)
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+"""
+Bulk trip planning: fully specified trips in, plans out.
+
+    python batch_plan.py trips.jsonl plans.jsonl [--workers 8] [--pdf-dir pdfs/]
+    cat trips.jsonl | python batch_plan.py - - > plans.jsonl
+
+Each input line is a form-mode request (see TravelAgent.plan_form):
+
+    {"id": "emp-001", "source": "Mumbai", "destination": "Goa", "trip_type": "round_trip",
+     "travel_date": "2026-11-10", "days": 5, "travelers": 2, "budget": "budget"}
+
+Each output line is the agent's response (COMPLETED or FORM_ERROR) with
+the request's id, in input order. Throughput goes to stderr.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+import tools.flight_tool as flight_tool
+from agent.travel_agent import TravelAgent, shared_city_extractor
+from tools.flight_tool import search_flights
+from tools.hotel_tool import search_hotels
+from tools.places_tool import search_places
+
+
+DEFAULT_CHUNKSIZE = 8
+HOTEL_ORDERS = ("price_low_to_high", "highest_rated")
+
+
+class _NoLLM:
+    # Form mode fills every slot, so extraction never needs a model
+    def invoke(self, prompt, **kwargs):
+        return "{}"
+
+
+def form_model_info() -> dict:
+    return {"instance": _NoLLM(), "provider": "None", "model_name": "form-only", "status": "ok"}
+
+
+# WORKERS
+
+_agent = None
+_pdf_dir = None
+
+
+def _init_worker(pdf_dir: str | None):
+    global _agent, _pdf_dir
+    # Results travel back to the parent; tool chatter must not end up
+    # in an output written to stdout
+    sys.stdout = sys.stderr
+    flight_tool.DEBUG = False
+    _agent = TravelAgent(model_info=form_model_info(), prefetch=False)
+    _pdf_dir = pdf_dir
+
+
+def _plan_line(item: tuple) -> str:
+    index, line = item
+    try:
+        form = json.loads(line)
+        if not isinstance(form, dict):
+            raise ValueError("not a JSON object")
+    except ValueError as e:
+        return json.dumps({"id": index, "status": "FORM_ERROR", "message": f"❌ Invalid JSON: {e}"})
+
+    request_id = form.get("id", index)
+    try:
+        response = _agent.plan_form(form)
+    except Exception as e:
+        response = {"status": "FORM_ERROR", "message": f"❌ {type(e).__name__}: {e}"}
+    if response["status"] not in ("COMPLETED", "FORM_ERROR"):
+        # Nobody can answer a question in a batch
+        message = response.get("message") or response.get("question") or response["status"]
+        response = {"status": "FORM_ERROR", "message": message}
+
+    if _pdf_dir and response["status"] == "COMPLETED":
+        from pdf.trip_pdf_genertor import generate_trip_pdf
+
+        path = os.path.join(_pdf_dir, f"{request_id}.pdf")
+        try:
+            generate_trip_pdf(response, path)
+            response["PDF"] = path
+        except Exception as e:
+            # The plan stands without its PDF
+            response["PDF_ERROR"] = str(e)
+
+    return json.dumps({"id": request_id, **response}, ensure_ascii=False, default=str)
+
+
+# SHARED DATA
+
+def warm_shared_data(lines: list[str]):
+    """
+    Loads the route index and every route's and city's tool results
+    once, before the workers fork: they inherit them (copy-on-write)
+    and every lookup is a cache hit.
+    """
+    shared_city_extractor()
+    routes, cities = set(), set()
+    for line in lines:
+        try:
+            form = json.loads(line)
+            src, dst = str(form["source"]).strip(), str(form["destination"]).strip()
+        except (ValueError, KeyError, TypeError, AttributeError):
+            continue
+        routes.update({(src.lower(), dst.lower()), (dst.lower(), src.lower())})
+        cities.add(dst.lower())
+
+    flight_tool.DEBUG = False
+    for src, dst in routes:
+        search_flights(src, dst)
+    for city in cities:
+        search_places(city)
+        for order in HOTEL_ORDERS:
+            search_hotels(city, order)
+
+
+# BATCH
+
+def plan_batch(
+    lines: list[str],
+    out,
+    workers: int | None = None,
+    pdf_dir: str | None = None,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+) -> dict:
+    """
+    Plans every line on a process pool and writes results to `out` as
+    they complete (in input order). Returns throughput stats.
+    """
+    workers = workers or os.cpu_count() or 1
+    if pdf_dir:
+        os.makedirs(pdf_dir, exist_ok=True)
+
+    started = time.perf_counter()
+    items = [(i, line) for i, line in enumerate(lines) if line.strip()]
+    statuses = {}
+
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context("fork" if "fork" in methods else None)
+    if context.get_start_method() == "fork":
+        warm_shared_data(lines)
+
+    with context.Pool(workers, initializer=_init_worker, initargs=(pdf_dir,)) as pool:
+        for result in pool.imap(_plan_line, items, chunksize=chunksize):
+            out.write(result + "\n")
+            status = json.loads(result)["status"]
+            statuses[status] = statuses.get(status, 0) + 1
+
+    elapsed = time.perf_counter() - started
+    return {
+        "plans": len(items),
+        "workers": workers,
+        "seconds": round(elapsed, 2),
+        "plans_per_s": round(len(items) / elapsed, 1) if elapsed else 0.0,
+        "statuses": statuses,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Plan trips in bulk from JSON Lines")
+    parser.add_argument("input", help="JSONL of trip forms, or - for stdin")
+    parser.add_argument("output", help="JSONL of responses, or - for stdout")
+    parser.add_argument("--workers", type=int, default=None, help="Default: one per CPU")
+    parser.add_argument("--pdf-dir", default=None, help="Also write a PDF per completed plan")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE)
+    args = parser.parse_args()
+
+    source = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    with source:
+        lines = source.read().splitlines()
+
+    out = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    sys.stdout = sys.stderr
+    try:
+        stats = plan_batch(lines, out, args.workers, args.pdf_dir, args.chunksize)
+    finally:
+        if out is not sys.__stdout__:
+            out.close()
+
+    print(
+        f"{stats['plans']} plans in {stats['seconds']}s on {stats['workers']} workers: "
+        f"{stats['plans_per_s']} plans/s {stats['statuses']}",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
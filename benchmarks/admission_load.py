@@ -0,0 +1,158 @@
+"""
+Synthetic overload of the LLM extraction path, with and without
+admission control.
+
+    python -m benchmarks.admission_load [--overload 5] [--duration-s 3]
+
+Turns arrive open-loop (Poisson) from many sessions at `--overload`
+times what the stub backend can serve. Each turn needs the LLM.
+- unbounded:  no deadline, no admission; the backlog and latency grow
+              for as long as the overload lasts
+- deadline:   turns give up at the deadline, but every call still
+              reaches the backend, which ends up serving abandoned work
+              long after the overload is over (drain)
+- admission:  a bounded, fair queue in front of the backend; excess
+              turns are shed to rules-only straight away, p99 stays near
+              max_wait + service time
+"""
+import argparse
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from agent.admission import AdmissionController
+from agent.intent_parser import parse_travel_intent
+from utils.deadline import Deadline
+
+
+MESSAGE = "plan a relaxing trip somewhere sunny with my family"
+
+STATE = {
+    "started": False,
+    "source": None,
+    "destination": None,
+    "trip_type": None,
+    "travel_date": None,
+    "return_date": None,
+    "days": None,
+    "travelers": None,
+    "preferences": {"budget": None, "interests": []},
+    "return_resolved": False,
+}
+
+
+class CapacityLLM:
+    """
+    Stub backend serving `slots` calls at a time, `service_ms` each.
+    """
+
+    def __init__(self, service_ms: float, slots: int):
+        self.service_s = service_ms / 1000
+        self._slots = threading.Semaphore(slots)
+        self._lock = threading.Lock()
+        self.waiting = 0
+        self.served = 0
+
+    def invoke(self, prompt, **kwargs):
+        with self._lock:
+            self.waiting += 1
+        with self._slots:
+            with self._lock:
+                self.waiting -= 1
+            time.sleep(self.service_s)
+            with self._lock:
+                self.served += 1
+        return '{"destination": "Goa"}'
+
+
+def run(mode: str, rate: float, duration_s: float, args) -> dict:
+    llm = CapacityLLM(args.service_ms, args.slots)
+    if mode == "admission":
+        admission = AdmissionController(
+            max_concurrent=args.slots,
+            max_queue=args.max_queue,
+            max_wait_s=args.max_wait_s,
+        )
+    else:
+        # Effectively no admission control
+        admission = AdmissionController(max_concurrent=10**9, max_queue=10**9, max_wait_s=3600)
+
+    latencies, answered = [], []
+    lock = threading.Lock()
+    rng = random.Random(7)
+
+    def turn(session_id):
+        deadline = Deadline(args.budget_s) if mode != "unbounded" else None
+        started = time.perf_counter()
+        result = parse_travel_intent(
+            llm, MESSAGE, dict(STATE), deadline=deadline,
+            session_id=session_id, admission=admission,
+        )
+        with lock:
+            latencies.append(time.perf_counter() - started)
+            answered.append("destination" in result)
+
+    pool = ThreadPoolExecutor(max_workers=512)
+    started = time.perf_counter()
+    next_at = started
+    sent = 0
+    while next_at - started < duration_s:
+        delay = next_at - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        pool.submit(turn, f"s{rng.randrange(args.sessions)}")
+        sent += 1
+        next_at += rng.expovariate(rate)
+
+    backlog = llm.waiting
+    pool.shutdown(wait=True)
+    finished = time.perf_counter()
+
+    # Abandoned calls are still queued for the backend; wait for them
+    # so the next mode starts clean
+    stats = admission.stats()
+    while llm.served < stats["admitted"]:
+        time.sleep(0.01)
+    drain_s = time.perf_counter() - finished
+
+    latencies.sort()
+    return {
+        "sent": sent,
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p99_ms": latencies[min(len(latencies) - 1, int(0.99 * len(latencies)))] * 1000,
+        "answered": sum(answered),
+        "backend_served": llm.served,
+        "backlog_at_end": backlog,
+        "drain_s": drain_s,
+        "shed_rate": stats["shed_rate"] if mode == "admission" else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--overload", type=float, default=5.0)
+    parser.add_argument("--duration-s", type=float, default=3.0)
+    parser.add_argument("--service-ms", type=float, default=50)
+    parser.add_argument("--slots", type=int, default=2)
+    parser.add_argument("--sessions", type=int, default=50)
+    parser.add_argument("--budget-s", type=float, default=2.0)
+    parser.add_argument("--max-queue", type=int, default=8)
+    parser.add_argument("--max-wait-s", type=float, default=0.5)
+    parser.add_argument("--modes", default="unbounded,deadline,admission")
+    args = parser.parse_args()
+
+    capacity = args.slots / (args.service_ms / 1000)
+    rate = capacity * args.overload
+    print(f"capacity={capacity:.0f}/s  offered={rate:.0f}/s  ({args.overload:g}x)")
+
+    for mode in args.modes.split(","):
+        r = run(mode, rate, args.duration_s, args)
+        print(f"{mode:<10} sent={r['sent']:<5} p50={r['p50_ms']:8.1f} ms  p99={r['p99_ms']:8.1f} ms  "
+              f"answered={r['answered']:<5} served={r['backend_served']:<5} "
+              f"backlog={r['backlog_at_end']:<5} drain={r['drain_s']:5.1f} s  "
+              f"shed_rate={r['shed_rate']:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Load test of the headless API with the stub LLM: the server runs in
+this process, clients are threads speaking plain HTTP/1.1.
+
+    python -m benchmarks.api_load [--clients 16] [--conversations 200] [--mode turn|plan]
+
+turn: each client drives whole conversations through /v1/turn
+plan: each client posts one-shot forms to /v1/plan
+"""
+import argparse
+import http.client
+import json
+import statistics
+import threading
+import time
+
+import uvicorn
+
+import tools.flight_tool as flight_tool
+from api_server import create_app, stub_model_info
+
+
+CONVERSATION = [
+    "plan a trip from mumbai to goa",
+    "round trip",
+    "10 nov",
+    "5",
+    "2",
+    "budget",
+]
+
+FORM = {
+    "source": "Mumbai",
+    "destination": "Goa",
+    "trip_type": "round_trip",
+    "travel_date": "2026-11-10",
+    "days": 5,
+    "travelers": 2,
+    "budget": "budget",
+}
+
+
+def start_server(port: int, workers: int) -> uvicorn.Server:
+    app = create_app(stub_model_info(), workers=workers)
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+
+def post(conn: http.client.HTTPConnection, path: str, payload: dict) -> dict:
+    conn.request("POST", path, body=json.dumps(payload), headers={"Content-Type": "application/json"})
+    response = conn.getresponse()
+    body = response.read()
+    if response.status != 200:
+        raise RuntimeError(f"{path}: HTTP {response.status} {body[:200]!r}")
+    return json.loads(body)
+
+
+def client(port: int, mode: str, jobs: list, latencies: list, statuses: list, lock):
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    while True:
+        with lock:
+            if not jobs:
+                break
+            jobs.pop()
+
+        if mode == "plan":
+            started = time.perf_counter()
+            response = post(conn, "/v1/plan", FORM)
+            timings = [time.perf_counter() - started]
+        else:
+            session_id, timings = None, []
+            for message in CONVERSATION:
+                started = time.perf_counter()
+                response = post(conn, "/v1/turn", {"session_id": session_id, "message": message})
+                timings.append(time.perf_counter() - started)
+                session_id = response["SESSION_ID"]
+
+        with lock:
+            latencies.extend(timings)
+            statuses.append(response["status"])
+    conn.close()
+
+
+def pct(values: list, p: float) -> float:
+    return values[min(len(values) - 1, int(p * len(values)))] * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--conversations", type=int, default=200)
+    parser.add_argument("--mode", choices=("turn", "plan"), default="turn")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=16)
+    args = parser.parse_args()
+
+    flight_tool.DEBUG = False
+    server = start_server(args.port, args.workers)
+
+    jobs = list(range(args.conversations))
+    latencies, statuses, lock = [], [], threading.Lock()
+    threads = [
+        threading.Thread(target=client, args=(args.port, args.mode, jobs, latencies, statuses, lock))
+        for _ in range(args.clients)
+    ]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+    server.should_exit = True
+
+    latencies.sort()
+    print(f"{args.mode}: {len(latencies)} requests from {args.clients} clients in {elapsed:.2f}s")
+    print(f"  {len(latencies) / elapsed:.1f} req/s   "
+          f"p50={pct(latencies, 0.50):.1f} ms  p95={pct(latencies, 0.95):.1f} ms  "
+          f"p99={pct(latencies, 0.99):.1f} ms  mean={statistics.mean(latencies) * 1000:.1f} ms")
+    print(f"  final status: {dict((s, statuses.count(s)) for s in set(statuses))}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Throughput of batch_plan.py by worker count, on generated trips over
+every route in the dataset.
+
+    python -m benchmarks.batch_scaling [--plans 2000] [--workers 1,2,4,8]
+"""
+import argparse
+import io
+import json
+import os
+import random
+from datetime import date, timedelta
+
+from agent.travel_agent import shared_city_extractor
+from batch_plan import plan_batch
+import tools.flight_tool as flight_tool
+from tools.flight_tool import search_flights
+
+
+def _weekdays(source: str, destination: str) -> set:
+    return set(search_flights(source, destination).get("available_weekdays", []))
+
+
+def generate_forms(n: int, seed: int = 7) -> list[str]:
+    """
+    Trips on days with flights, so most of them complete.
+    """
+    rng = random.Random(seed)
+    cities = shared_city_extractor()
+    routes = [(s, d) for s in cities.all_sources() for d in cities.destinations_from(s)]
+    weekdays = {route: _weekdays(*route) for route in routes}
+    start = date.today() + timedelta(days=14)
+    day_name = lambda d: d.strftime("%A").lower()
+
+    lines = []
+    while len(lines) < n:
+        source, destination = rng.choice(routes)
+        travel_date = start + timedelta(days=rng.randrange(60))
+        if day_name(travel_date) not in weekdays[(source, destination)]:
+            continue
+
+        days = rng.randint(2, 7)
+        back = weekdays.get((destination, source), set())
+        round_trip = day_name(travel_date + timedelta(days=days - 1)) in back
+
+        lines.append(json.dumps({
+            "id": f"trip-{len(lines):05d}",
+            "source": source,
+            "destination": destination,
+            "trip_type": "round_trip" if round_trip else "one_way",
+            "travel_date": travel_date.isoformat(),
+            "days": days,
+            "travelers": rng.randint(1, 4),
+            "budget": rng.choice(("budget", "mid-range", "luxury")),
+        }))
+    return lines
+
+
+def main():
+    cpus = os.cpu_count() or 1
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--plans", type=int, default=2000)
+    parser.add_argument(
+        "--workers",
+        default=",".join(str(w) for w in sorted({1, 2, 4, cpus}) if w <= cpus),
+    )
+    args = parser.parse_args()
+
+    flight_tool.DEBUG = False
+    lines = generate_forms(args.plans)
+    baseline = None
+    for workers in (int(w) for w in args.workers.split(",")):
+        stats = plan_batch(lines, io.StringIO(), workers=workers)
+        baseline = baseline or stats["plans_per_s"]
+        print(
+            f"workers={workers:<3} {stats['plans_per_s']:8.1f} plans/s  "
+            f"speedup x{stats['plans_per_s'] / baseline:4.2f}  {stats['statuses']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Deterministic, offline end-to-end run of TravelAgent conversations
+with the LLM served from a cassette.
+
+    # once, with the real models available
+    python -m benchmarks.cassette_replay --cassette runs/llm.jsonl --mode record
+
+    # any time after, no model files or token needed
+    python -m benchmarks.cassette_replay --cassette runs/llm.jsonl
+    python -m benchmarks.cassette_replay --cassette runs/llm.jsonl --latency lognormal:800:0.4
+
+Strict mode (the default) fails on any prompt that was not recorded,
+so a change in what the agent asks the model shows up immediately.
+"""
+import argparse
+import random
+import sys
+import time
+
+import tools.flight_tool as flight_tool
+from agent.llm_cassette import Cassette, CassetteLLM
+from agent.travel_agent import TravelAgent
+from utils.deadline import Deadline
+
+
+CONVERSATIONS = [
+    [
+        "plan a relaxing trip from mumbai to goa somewhere sunny",
+        "round trip",
+        "in 5 days",
+        "5",
+        "2",
+        "budget",
+        "1",
+    ],
+    [
+        "I want a luxury holiday to kolkata from delhi with my wife, we love museums and food",
+        "one way",
+        "next friday",
+        "4",
+        "1",
+    ],
+    [
+        "plan a trip",
+        "bangalore",
+        "mumbai",
+        "one way",
+        "tomorrow",
+        "3",
+        "family of four",
+        "mid-range",
+    ],
+]
+
+
+def model_info(args) -> dict:
+    cassette = Cassette(args.cassette)
+
+    if args.mode == "record":
+        from agent.llm_loader import load_llm
+        info = dict(load_llm())
+        info["instance"] = CassetteLLM(cassette, "record", inner=info["instance"])
+        return info
+
+    return {
+        "instance": CassetteLLM(cassette, args.mode, latency=args.latency, seed=args.seed),
+        "provider": "Cassette",
+        "model_name": args.cassette,
+        "status": args.mode,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cassette", required=True)
+    parser.add_argument("--mode", choices=("record", "replay", "strict"), default="strict")
+    parser.add_argument("--latency", default=None, help="e.g. const:200, lognormal:800:0.4")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    flight_tool.DEBUG = False
+    random.seed(args.seed)
+    info = model_info(args)
+    repeat = 1 if args.mode == "record" else args.repeat
+
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for conversation in CONVERSATIONS:
+            agent = TravelAgent(model_info=info)
+            for message in conversation:
+                t0 = time.perf_counter()
+                # A generous deadline keeps runs deterministic
+                agent.run(message, deadline=Deadline(3600))
+                latencies.append(time.perf_counter() - t0)
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2] * 1000
+    p99 = latencies[min(len(latencies) - 1, int(0.99 * len(latencies)))] * 1000
+    print(f"turns={len(latencies)}  turns/s={len(latencies) / elapsed:.1f}  "
+          f"p50={p50:.2f} ms  p99={p99:.2f} ms")
+    stats = info["instance"].stats()
+    print(stats)
+
+    # The agent treats a failed extraction as "nothing found", so
+    # unseen prompts are reported here
+    if args.mode == "strict" and stats["misses"]:
+        print(f"{stats['misses']} prompt(s) not in the cassette; re-record it")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""
+Local stand-in for a hosted chat-completion endpoint (Hugging Face
+router shape), for exercising the remote LLM paths offline.
+
+    python -m benchmarks.fake_llm_endpoint --port 8799 --delay-ms 800 --fail-rate 0.2
+
+POST /<anything>   {"model", "messages": [...]} → {"choices": [{"message": {"content": "..."}}]}
+POST /_control     {"delay_ms": 50, "fail_rate": 0, "mode": "ok"} → new config
+GET  /_stats       connection and request counters
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+DEFAULT_REPLY = '{"destination": "Goa"}'
+
+# ok      → valid intent JSON after the delay
+# garbage → 200 with text that is not JSON
+# error   → 503 on every request
+MODES = ("ok", "garbage", "error")
+
+
+class FakeEndpointServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, delay_ms=0.0, jitter_ms=0.0, fail_rate=0.0, mode="ok", reply=DEFAULT_REPLY):
+        super().__init__(address, _Handler)
+        self.config = {
+            "delay_ms": delay_ms,
+            "jitter_ms": jitter_ms,
+            "fail_rate": fail_rate,
+            "mode": mode,
+            "reply": reply,
+        }
+        self.counters = {"connections": 0, "requests": 0, "ok": 0, "garbage": 0, "errors": 0}
+        self.lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/v1/chat/completions"
+
+    def configure(self, **changes):
+        with self.lock:
+            self.config.update({k: v for k, v in changes.items() if k in self.config})
+            return dict(self.config)
+
+
+def _chat_reply(content: str) -> dict:
+    return {
+        "object": "chat.completion",
+        "choices": [
+            {"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}
+        ],
+    }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"   # keep-alive, like the real endpoint
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.counters["connections"] += 1
+
+    def _send(self, code: int, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _body(self) -> dict:
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            return json.loads(self.rfile.read(length) or b"{}")
+        except json.JSONDecodeError:
+            return {}
+
+    def do_GET(self):
+        if self.path == "/_stats":
+            with self.server.lock:
+                self._send(200, dict(self.server.counters))
+        else:
+            self._send(404, {"error": "not found"})
+
+    def do_POST(self):
+        body = self._body()
+        if self.path == "/_control":
+            self._send(200, self.server.configure(**body))
+            return
+
+        with self.server.lock:
+            cfg = dict(self.server.config)
+            self.server.counters["requests"] += 1
+
+        delay = cfg["delay_ms"] + random.uniform(0, cfg["jitter_ms"])
+        time.sleep(delay / 1000)
+
+        if cfg["mode"] == "error" or random.random() < cfg["fail_rate"]:
+            outcome, code, payload = "errors", 503, {"error": "Model is overloaded"}
+        elif cfg["mode"] == "garbage":
+            outcome, code, payload = "garbage", 200, _chat_reply("Sure! Let me think about that trip.")
+        else:
+            outcome, code, payload = "ok", 200, _chat_reply(cfg["reply"])
+
+        with self.server.lock:
+            self.server.counters[outcome] += 1
+        self._send(code, payload)
+
+
+def start_fake_endpoint(port: int = 0, **config) -> FakeEndpointServer:
+    """
+    Serves in a daemon thread; call .shutdown() when done.
+    """
+    server = FakeEndpointServer(("127.0.0.1", port), **config)
+    threading.Thread(target=server.serve_forever, name="fake-llm-endpoint", daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=8799)
+    parser.add_argument("--delay-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    parser.add_argument("--mode", choices=MODES, default="ok")
+    args = parser.parse_args()
+
+    server = FakeEndpointServer(
+        ("127.0.0.1", args.port),
+        delay_ms=args.delay_ms,
+        jitter_ms=args.jitter_ms,
+        fail_rate=args.fail_rate,
+        mode=args.mode,
+    )
+    print(f"Fake LLM endpoint on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Replays a corpus of chat turns through parse_travel_intent and reports
+the share of turns resolved without an LLM call, plus how many turns
+produced the expected fields.
+
+    python -m benchmarks.fast_path_replay [--corpus benchmarks/replay_corpus.jsonl]
+"""
+import argparse
+import copy
+import json
+from datetime import date
+
+from agent.intent_parser import parse_travel_intent, fast_path_stats, reset_fast_path_stats
+
+
+# Relative dates in the corpus ("next friday") resolve against this day
+REPLAY_TODAY = date(2025, 1, 6)
+
+EMPTY_STATE = {
+    "started": True,
+    "source": None,
+    "destination": None,
+    "trip_type": None,
+    "travel_date": None,
+    "return_date": None,
+    "days": None,
+    "travelers": None,
+    "preferences": {"budget": None, "interests": []},
+    "return_resolved": False,
+}
+
+
+class CountingLLM:
+    """Stands in for the model: never answers, only counts calls."""
+
+    def __init__(self):
+        self.calls = []
+
+    def invoke(self, prompt):
+        self.calls.append(prompt)
+        return "{}"
+
+
+def load_corpus(path: str) -> list[dict]:
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def replay(corpus: list[dict], verbose: bool = False) -> dict:
+    reset_fast_path_stats()
+    llm = CountingLLM()
+    matched = 0
+
+    for turn in corpus:
+        state = copy.deepcopy(EMPTY_STATE)
+        state.update(turn.get("state", {}))
+
+        before = len(llm.calls)
+        extracted = parse_travel_intent(llm, turn["message"], state, today=REPLAY_TODAY)
+        ok = extracted == turn.get("expect", extracted)
+        matched += ok
+
+        if verbose or not ok:
+            route = "LLM " if len(llm.calls) > before else "rules"
+            mark = "ok  " if ok else "MISS"
+            print(f"{mark} {route} {turn['message']!r} -> {extracted}")
+
+    stats = fast_path_stats()
+    return {
+        "turns": stats["turns"],
+        "rules_only_ratio": stats["rules_only_ratio"],
+        "llm_calls": stats["llm_calls"],
+        "expected_fields_matched": matched,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--corpus", default="benchmarks/replay_corpus.jsonl")
+    parser.add_argument("-v", "--verbose", action="store_true")
+    args = parser.parse_args()
+
+    result = replay(load_corpus(args.corpus), verbose=args.verbose)
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
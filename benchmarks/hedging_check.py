@@ -0,0 +1,69 @@
+"""
+Checks HedgedLLM against two local fake endpoints (slow, failing,
+garbage and healthy primaries) and reports which backend answered
+and how long each call took.
+
+    python -m benchmarks.hedging_check
+"""
+import sys
+import time
+
+from agent.hedged_llm import HedgedLLM, MIN_SAMPLES
+from agent.remote_llm import RemoteLLM
+from benchmarks.fake_llm_endpoint import start_fake_endpoint
+
+
+SCENARIOS = [
+    # name, primary config, expected winner
+    ("healthy primary", {"delay_ms": 20}, "primary"),
+    ("slow primary", {"delay_ms": 1500}, "secondary"),
+    ("failing primary", {"delay_ms": 20, "mode": "error"}, "secondary"),
+    ("garbage primary", {"delay_ms": 20, "mode": "garbage"}, "secondary"),
+]
+
+
+def main():
+    primary_server = start_fake_endpoint()
+    secondary_server = start_fake_endpoint(delay_ms=100, reply='{"source": "Delhi"}')
+    failures = 0
+
+    print(f"{'scenario':<18}{'winner':>10}{'latency ms':>12}{'hedge delay ms':>16}")
+
+    for name, config, expected in SCENARIOS:
+        hedged = HedgedLLM(
+            RemoteLLM(url=primary_server.url, max_retries=0),
+            RemoteLLM(url=secondary_server.url, max_retries=0),
+            initial_delay_s=0.3,
+        )
+
+        # Fill the latency window from a healthy primary, so the hedge
+        # delay is its percentile rather than initial_delay_s
+        primary_server.configure(delay_ms=20, mode="ok")
+        for _ in range(MIN_SAMPLES):
+            hedged.invoke("warmup")
+        before = hedged.stats()
+        if before["hedge_delay_ms"] == hedged.initial_delay_s * 1000:
+            print(f"{name}: latency window not warm, percentile delay unused")
+            failures += 1
+
+        primary_server.configure(**{"delay_ms": 0, "mode": "ok", **config})
+
+        started = time.perf_counter()
+        hedged.invoke("plan a trip to goa")
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        after = hedged.stats()
+        winner = "primary" if after["primary_wins"] > before["primary_wins"] else "secondary"
+        ok = winner == expected
+        failures += not ok
+
+        print(f"{name:<18}{winner:>10}{elapsed_ms:>12.0f}{before['hedge_delay_ms']:>16}"
+              f"{'' if ok else '   ✗ expected ' + expected}")
+
+    primary_server.shutdown()
+    secondary_server.shutdown()
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
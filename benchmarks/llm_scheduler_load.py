@@ -0,0 +1,135 @@
+"""
+Load test for the LLM scheduler.
+
+Drives parse_travel_intent from many threads against stub backends that
+behave like a llama.cpp context (fixed cost per evaluation, unsafe to
+enter twice) and reports throughput against concurrency.
+
+    python -m benchmarks.llm_scheduler_load --requests 200
+"""
+import argparse
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from agent.intent_parser import parse_travel_intent
+from agent.llm_scheduler import LLMScheduler
+
+
+QUERIES = [
+    "thinking of a trip with my family",
+    "we want to go somewhere warm",
+    "plan something nice for the holidays",
+    "a relaxing getaway please",
+]
+
+EMPTY_STATE = {
+    "started": True,
+    "source": None,
+    "destination": None,
+    "trip_type": None,
+    "travel_date": None,
+    "return_date": None,
+    "days": None,
+    "travelers": None,
+    "preferences": {"budget": None, "interests": []},
+    "return_resolved": False,
+}
+
+
+class StubLlama:
+    """One evaluation costs `eval_ms`; overlapping calls are counted."""
+
+    def __init__(self, eval_ms: float):
+        self.eval_s = eval_ms / 1000
+        self._active = 0
+        self._lock = threading.Lock()
+        self.overlaps = 0
+
+    def _enter(self):
+        with self._lock:
+            self._active += 1
+            if self._active > 1:
+                self.overlaps += 1
+
+    def _exit(self):
+        with self._lock:
+            self._active -= 1
+
+    def invoke(self, prompt, **kwargs):
+        self._enter()
+        try:
+            time.sleep(self.eval_s)
+            return '{"destination": "Goa"}'
+        finally:
+            self._exit()
+
+
+class StubBatchLlama(StubLlama):
+    """Multi-sequence evaluation: extra sequences cost `seq_ms` each."""
+
+    supports_batching = True
+
+    def __init__(self, eval_ms: float, seq_ms: float):
+        super().__init__(eval_ms)
+        self.seq_s = seq_ms / 1000
+
+    def batch(self, prompts):
+        self._enter()
+        try:
+            time.sleep(self.eval_s + self.seq_s * (len(prompts) - 1))
+            return ['{"destination": "Goa"}'] * len(prompts)
+        finally:
+            self._exit()
+
+
+def run_level(llm, concurrency: int, requests: int) -> tuple[float, float]:
+    latencies = []
+
+    def one(i):
+        t0 = time.perf_counter()
+        parse_travel_intent(llm, QUERIES[i % len(QUERIES)], EMPTY_STATE)
+        latencies.append(time.perf_counter() - t0)
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, range(requests)))
+    elapsed = time.perf_counter() - t0
+
+    latencies.sort()
+    p95 = latencies[int(0.95 * (len(latencies) - 1))] * 1000
+    return requests / elapsed, p95
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--eval-ms", type=float, default=20.0)
+    parser.add_argument("--seq-ms", type=float, default=4.0)
+    parser.add_argument("--levels", default="1,2,4,8,16,32")
+    args = parser.parse_args()
+
+    levels = [int(x) for x in args.levels.split(",")]
+
+    print(f"{'mode':<12}{'conc':>6}{'req/s':>10}{'p95 ms':>10}{'overlaps':>10}"
+          f"{'avg batch':>11}{'wait p95 ms':>13}")
+
+    for level in levels:
+        direct = StubLlama(args.eval_ms)
+        rps, p95 = run_level(direct, level, args.requests)
+        print(f"{'direct':<12}{level:>6}{rps:>10.1f}{p95:>10.1f}{direct.overlaps:>10}"
+              f"{'-':>11}{'-':>13}")
+
+        for mode, backend in (
+            ("serialized", StubLlama(args.eval_ms)),
+            ("batched", StubBatchLlama(args.eval_ms, args.seq_ms)),
+        ):
+            scheduler = LLMScheduler(backend, max_batch=8)
+            rps, p95 = run_level(scheduler, level, args.requests)
+            stats = scheduler.stats()
+            print(f"{mode:<12}{level:>6}{rps:>10.1f}{p95:>10.1f}{backend.overlaps:>10}"
+                  f"{stats['avg_batch_size']:>11}{stats['queue_wait_ms']['p95']:>13}")
+
+
+if __name__ == "__main__":
+    main()
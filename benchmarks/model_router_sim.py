@@ -0,0 +1,84 @@
+"""
+Drives the ModelRouter with simulated backends and shows where calls
+go as it learns their latency and validity.
+
+    python -m benchmarks.model_router_sim [--turns 300] [--log /tmp/router.jsonl]
+
+Profiles (latency ms, share of valid JSON answers) are chosen to look
+like the deployed models: a small fast local model that struggles with
+long messages, a larger local one, and a slow but reliable API.
+"""
+import argparse
+import json
+import random
+import time
+
+from agent.intent_parser import parse_travel_intent, fast_path_stats, reset_fast_path_stats
+from agent.model_router import ModelRouter
+
+
+EMPTY_STATE = {
+    "started": True,
+    "source": None,
+    "destination": None,
+    "trip_type": None,
+    "travel_date": None,
+    "return_date": None,
+    "days": None,
+    "travelers": None,
+    "preferences": {"budget": None, "interests": []},
+    "return_resolved": False,
+}
+
+MESSAGES = [
+    "thinking of somewhere warm with my family",
+    "we want a quiet beach getaway, nothing too touristy",
+    "plan something nice for the holidays",
+    "my parents are visiting and we would love to take them somewhere scenic "
+    "where they can relax, eat well and see a few temples without too much walking",
+    "a relaxing getaway please",
+]
+
+
+class SimulatedLLM:
+    def __init__(self, latency_ms: float, valid_short: float, valid_long: float, scale: float):
+        self.latency_s = latency_ms / 1000 * scale
+        self.valid_short = valid_short
+        self.valid_long = valid_long
+
+    def invoke(self, prompt, **kwargs):
+        time.sleep(self.latency_s * random.uniform(0.8, 1.2))
+        long_message = len(prompt.rsplit("USER MESSAGE", 1)[-1].split()) > 20
+        p = self.valid_long if long_message else self.valid_short
+        return '{"destination": "Goa"}' if random.random() < p else "Sure, Goa sounds lovely!"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--turns", type=int, default=300)
+    parser.add_argument("--scale", type=float, default=0.01, help="latency scale (1.0 = real time)")
+    parser.add_argument("--log", default=None)
+    args = parser.parse_args()
+
+    random.seed(7)
+    router = ModelRouter(
+        {
+            "qwen": SimulatedLLM(900, valid_short=0.9, valid_long=0.3, scale=args.scale),
+            "phi": SimulatedLLM(1400, valid_short=0.95, valid_long=0.85, scale=args.scale),
+            "remote": SimulatedLLM(2500, valid_short=0.99, valid_long=0.99, scale=args.scale),
+        },
+        log_path=args.log,
+    )
+
+    reset_fast_path_stats()
+    for i in range(args.turns):
+        parse_travel_intent(router, MESSAGES[i % len(MESSAGES)], dict(EMPTY_STATE))
+
+    print(f"resolved by rules: {fast_path_stats()['rules_only']} / {args.turns}")
+    stats = router.stats()
+    print(json.dumps(stats["backends"], indent=2))
+    print(f"decisions recorded: {stats['decisions']['total']}  chosen: {stats['decisions']['chosen']}")
+
+
+if __name__ == "__main__":
+    main()
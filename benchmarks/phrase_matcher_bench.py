@@ -0,0 +1,60 @@
+"""
+Micro-benchmark for the compiled travel matcher.
+
+Reports messages per second for the raw single-pass scan, the full
+rule-based extraction and TravelAgent._extract_city.
+
+    python -m benchmarks.phrase_matcher_bench --seconds 2
+"""
+import argparse
+import json
+import time
+
+from agent.intent_parser import _rule_based_extract_scored
+from agent.travel_agent import TravelAgent
+from agent.travel_lexicon import scan_message, travel_matcher
+from utils.flight_city_extractor import FlightCityExtractor
+
+
+def _messages(path: str) -> list[str]:
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line)["message"] for line in f if line.strip()]
+
+
+def _rate(fn, messages: list[str], seconds: float) -> float:
+    done = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        for m in messages:
+            fn(m)
+        done += len(messages)
+    return done / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--corpus", default="benchmarks/replay_corpus.jsonl")
+    parser.add_argument("--seconds", type=float, default=2.0)
+    args = parser.parse_args()
+
+    messages = _messages(args.corpus)
+
+    t0 = time.perf_counter()
+    travel_matcher()
+    build_ms = (time.perf_counter() - t0) * 1000
+
+    # _extract_city only needs the route index, not a model
+    agent = TravelAgent.__new__(TravelAgent)
+    agent.city_extractor = FlightCityExtractor(json_path="data/flights.json")
+
+    print(f"matcher build: {build_ms:.2f} ms (once per process)")
+    for name, fn in (
+        ("scan_message", scan_message),
+        ("_rule_based_extract_scored", _rule_based_extract_scored),
+        ("TravelAgent._extract_city", agent._extract_city),
+    ):
+        print(f"{name:<28}{_rate(fn, messages, args.seconds):>12,.0f} msg/s")
+
+
+if __name__ == "__main__":
+    main()
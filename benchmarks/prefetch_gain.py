@@ -0,0 +1,83 @@
+"""
+Latency of the final "plan" turn with and without speculative prefetch,
+against slow tools (e.g. a remote weather API) and a user who takes a
+moment to answer each question.
+
+    python -m benchmarks.prefetch_gain [--tool-ms 400] [--think-ms 300] [--conversations 3]
+
+With prefetch the lookups start once the route is known and are done
+by the time the last slot is answered.
+"""
+import argparse
+import statistics
+import time
+
+import agent.travel_agent as travel_agent
+import tools.flight_tool as flight_tool
+from agent.travel_agent import TravelAgent
+from utils.deadline import Deadline
+
+
+CONVERSATION = [
+    "plan a trip from mumbai to goa",
+    "round trip",
+    "10 nov",
+    "5",
+    "2",
+    "budget",
+]
+
+SLOW_TOOLS = ("search_flights", "search_hotels", "search_places", "weather_lookup")
+
+
+class StubLLM:
+    def invoke(self, prompt, **kwargs):
+        return "{}"
+
+
+def _slowed(fn, delay_s: float):
+    def call(*args, **kwargs):
+        time.sleep(delay_s)
+        return fn(*args, **kwargs)
+    return call
+
+
+def run(conversations: int, think_s: float, prefetch: bool) -> list[float]:
+    info = {"instance": StubLLM(), "provider": "Stub", "model_name": "stub", "status": "ok"}
+    final_ms = []
+
+    for _ in range(conversations):
+        agent = TravelAgent(model_info=info, prefetch=prefetch)
+        for message in CONVERSATION:
+            time.sleep(think_s)
+            started = time.perf_counter()
+            response = agent.run(message, deadline=Deadline(10))
+        if response["status"] != "COMPLETED":
+            raise SystemExit(f"Conversation ended in {response['status']}")
+        final_ms.append((time.perf_counter() - started) * 1000)
+
+    return final_ms
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tool-ms", type=float, default=400)
+    parser.add_argument("--think-ms", type=float, default=300)
+    parser.add_argument("--conversations", type=int, default=3)
+    args = parser.parse_args()
+
+    flight_tool.DEBUG = False
+    for name in SLOW_TOOLS:
+        setattr(travel_agent, name, _slowed(getattr(travel_agent, name), args.tool_ms / 1000))
+
+    print(f"Tools +{args.tool_ms:.0f} ms each, {args.think_ms:.0f} ms think time per answer")
+    for prefetch in (False, True):
+        final_ms = run(args.conversations, args.think_ms / 1000, prefetch)
+        print(
+            f"  prefetch={'on ' if prefetch else 'off'}  final turn: "
+            f"median {statistics.median(final_ms):7.1f} ms  max {max(final_ms):7.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
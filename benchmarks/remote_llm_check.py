@@ -0,0 +1,88 @@
+"""
+Checks the pooled remote client and its circuit breaker against a
+local fake endpoint:
+- healthy endpoint: connections are reused across calls
+- failing endpoint: bounded retries, then the circuit opens and calls
+  go straight to the local model without touching the network
+- recovered endpoint: after the reset timeout one probe closes the circuit
+
+    python -m benchmarks.remote_llm_check
+"""
+import json
+import sys
+import time
+
+from agent.remote_llm import RemoteLLM, CircuitBreaker, FallbackLLM
+from benchmarks.fake_llm_endpoint import start_fake_endpoint
+
+
+class LocalStub:
+    def __init__(self):
+        self.calls = 0
+
+    def invoke(self, prompt, **kwargs):
+        self.calls += 1
+        return "{}"
+
+
+def timed(llm, n: int) -> float:
+    started = time.perf_counter()
+    for _ in range(n):
+        llm.invoke("plan a trip to goa")
+    return (time.perf_counter() - started) * 1000 / n
+
+
+def endpoint_stats(server) -> dict:
+    with server.lock:
+        return dict(server.counters)
+
+
+def main():
+    server = start_fake_endpoint(delay_ms=10)
+    remote = RemoteLLM(
+        url=server.url,
+        timeout_s=2.0,
+        max_retries=2,
+        backoff_s=0.05,
+        breaker=CircuitBreaker(failure_threshold=3, reset_timeout_s=1.0),
+    )
+    local = LocalStub()
+    llm = FallbackLLM(remote, lambda: local)
+    checks = []
+
+    # Healthy: keep-alive reuse
+    ms = timed(llm, 20)
+    stats = endpoint_stats(server)
+    print(f"healthy     {ms:7.1f} ms/call  connections={stats['connections']} requests={stats['requests']}")
+    checks.append(("connections reused", stats["connections"] == 1))
+
+    # Failing: retries, then open circuit
+    server.configure(mode="error")
+    ms = timed(llm, 3)
+    opened = remote.breaker.state
+    before = endpoint_stats(server)["requests"]
+    short_ms = timed(llm, 50)
+    after = endpoint_stats(server)["requests"]
+    print(f"failing     {ms:7.1f} ms/call  circuit={opened} retries={remote.stats()['retries']}")
+    print(f"open        {short_ms:7.3f} ms/call  endpoint requests while open={after - before} local calls={local.calls}")
+    checks.append(("circuit opens", opened == "open"))
+    checks.append(("no traffic while open", after == before))
+
+    # Recovered: half-open probe closes the circuit
+    server.configure(mode="ok")
+    time.sleep(1.1)
+    llm.invoke("plan a trip to goa")
+    print(f"recovered   circuit={remote.breaker.state}")
+    checks.append(("circuit closes", remote.breaker.state == "closed"))
+
+    print(json.dumps(remote.stats(), indent=2))
+    server.shutdown()
+
+    failed = [name for name, ok in checks if not ok]
+    for name in failed:
+        print(f"✗ {name}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Memory and per-turn snapshot cost of the slotted TripState against the
+nested dict it replaced.
+
+    python -m benchmarks.session_state_bench [--sessions 20000] [--turns 100000]
+"""
+import argparse
+import copy
+import time
+import tracemalloc
+
+from agent.session_state import TripState
+
+
+def dict_state() -> dict:
+    return {
+        "started": True,
+        "source": "Mumbai",
+        "destination": "Goa",
+        "trip_type": "round_trip",
+        "travel_date": "2026-11-10",
+        "return_date": None,
+        "days": 5,
+        "travelers": 2,
+        "preferences": {"budget": None, "interests": []},
+        "return_resolved": False,
+    }
+
+
+def slotted_state() -> TripState:
+    state = TripState()
+    for k, v in dict_state().items():
+        if k != "preferences":
+            state[k] = v
+    state.release()
+    return state
+
+
+def memory_per_session(factory, sessions: int) -> float:
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    states = [factory() for _ in range(sessions)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    used = sum(s.size_diff for s in after.compare_to(before, "filename"))
+    del states
+    return used / sessions
+
+
+def turn_with_deepcopy(state: dict):
+    snapshot = copy.deepcopy(state)
+    state["travelers"] = 3
+    changed = state != snapshot
+    state["travelers"] = 2
+    return changed
+
+
+def turn_with_journal(state: TripState):
+    state.release()
+    snapshot = state.snapshot()
+    state["travelers"] = 3
+    changed = state.changed_since(snapshot)
+    state.rollback(snapshot)
+    return changed
+
+
+def per_turn_us(turn, state, turns: int) -> float:
+    started = time.perf_counter()
+    for _ in range(turns):
+        turn(state)
+    return (time.perf_counter() - started) / turns * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type=int, default=20000)
+    parser.add_argument("--turns", type=int, default=100000)
+    args = parser.parse_args()
+
+    state = slotted_state()
+    print(f"{'':10} {'bytes/session':>14} {'snapshot+diff':>14} {'serialized':>11}")
+    print(
+        f"{'dict':10} {memory_per_session(dict_state, args.sessions):14.0f} "
+        f"{per_turn_us(turn_with_deepcopy, dict_state(), args.turns):11.2f} us "
+        f"{'-':>11}"
+    )
+    print(
+        f"{'TripState':10} {memory_per_session(slotted_state, args.sessions):14.0f} "
+        f"{per_turn_us(turn_with_journal, state, args.turns):11.2f} us "
+        f"{len(state.to_bytes()):9d} B"
+    )
+
+
+if __name__ == "__main__":
+    main()
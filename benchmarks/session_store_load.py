@@ -0,0 +1,88 @@
+"""
+Many interleaved conversations through a SessionStore that can keep
+only a few agents live, as when sessions outnumber a worker's memory
+or hop between workers.
+
+    python -m benchmarks.session_store_load [--sessions 200] [--max-live 20] [--db /tmp/sessions.db]
+
+Two stores on the same SQLite file stand in for two workers; turns of
+one conversation alternate between them.
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+import tools.flight_tool as flight_tool
+from agent.session_store import SessionStore, SQLiteBackend
+from utils.deadline import Deadline
+
+
+CONVERSATION = [
+    "plan a trip from mumbai to goa",
+    "round trip",
+    "10 nov",
+    "5",
+    "2",
+    "budget",
+    "make it luxury",
+]
+
+
+class StubLLM:
+    def invoke(self, prompt, **kwargs):
+        return "{}"
+
+
+def pct(values: list, p: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(p * len(values)))]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--max-live", type=int, default=20)
+    parser.add_argument("--db", default=None, help="Default: a temporary file")
+    args = parser.parse_args()
+
+    flight_tool.DEBUG = False
+    info = {"instance": StubLLM(), "provider": "Stub", "model_name": "stub", "status": "ok"}
+    db = args.db or os.path.join(tempfile.mkdtemp(), "sessions.db")
+    workers = [
+        SessionStore(info, backend=SQLiteBackend(db), max_live=args.max_live, prefetch=False)
+        for _ in range(2)
+    ]
+
+    session_ids = [None] * args.sessions
+    latencies, statuses = [], []
+    started = time.perf_counter()
+
+    # Round-robin over sessions, so each one's next turn finds it evicted
+    # or advanced by the other worker
+    for turn, message in enumerate(CONVERSATION):
+        for i in range(args.sessions):
+            store = workers[(i + turn) % 2]
+            t = time.perf_counter()
+            response = store.run(session_ids[i], message, deadline=Deadline(10))
+            latencies.append((time.perf_counter() - t) * 1000)
+            session_ids[i] = response["SESSION_ID"]
+            if turn == len(CONVERSATION) - 1:
+                statuses.append(response["status"])
+
+    elapsed = time.perf_counter() - started
+    completed = statuses.count("COMPLETED")
+    blob = workers[0].backend.load(session_ids[0])[1]
+
+    print(f"{args.sessions} sessions x {len(CONVERSATION)} turns in {elapsed:.2f}s "
+          f"({len(latencies) / elapsed:.0f} turns/s), {completed} edited plans completed")
+    print(f"turn ms  p50={pct(latencies, 0.50):.2f}  p95={pct(latencies, 0.95):.2f}  "
+          f"p99={pct(latencies, 0.99):.2f}  mean={statistics.mean(latencies):.2f}")
+    print(f"blob of a completed session: {len(blob)} bytes")
+    for n, store in enumerate(workers):
+        print(f"worker {n}: {store.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Time to result of LLM extractions, waiting for the full completion
+versus streaming with early stop at the end of the JSON object.
+
+    python -m benchmarks.stream_extraction [--token-ms 20] [--calls 10]
+
+The stub model answers like the local models do: a JSON object, then a
+paragraph of explanation nobody reads.
+"""
+import argparse
+import time
+
+from agent.admission import AdmissionController
+from agent.intent_parser import parse_travel_intent, stream_stats
+from agent.llm_scheduler import LLMScheduler
+
+
+ANSWER = '{"destination": "Goa", "preferences": {"budget": "luxury", "interests": ["beaches"]}}'
+EXPLANATION = (
+    " Explanation: the user mentioned Goa as the place they want to go, and the words"
+    " relaxing and sunny suggest beaches. Luxury was inferred from the tone of the"
+    " message. No source city, dates or number of travelers were given, so those"
+    " fields are left out as instructed."
+)
+
+MESSAGE = "plan a luxury beach holiday to goa somewhere sunny"
+
+STATE = {
+    "started": False,
+    "source": None,
+    "destination": None,
+    "trip_type": None,
+    "travel_date": None,
+    "return_date": None,
+    "days": None,
+    "travelers": None,
+    "preferences": {"budget": None, "interests": []},
+    "return_resolved": False,
+}
+
+
+def _tokens(text: str) -> list[str]:
+    # Roughly token-sized pieces
+    return [text[i:i + 4] for i in range(0, len(text), 4)]
+
+
+class TokenStubLLM:
+    def __init__(self, token_ms: float):
+        self.token_s = token_ms / 1000
+        self.tokens = _tokens(ANSWER + EXPLANATION)
+        self.generated = 0
+
+    def stream(self, prompt, **kwargs):
+        for token in self.tokens:
+            time.sleep(self.token_s)
+            self.generated += 1
+            yield token
+
+    def invoke(self, prompt, **kwargs):
+        return "".join(self.stream(prompt))
+
+
+class InvokeOnly:
+    def __init__(self, llm):
+        self.llm = llm
+
+    def invoke(self, prompt, **kwargs):
+        return self.llm.invoke(prompt, **kwargs)
+
+
+def run(llm, calls: int) -> tuple[float, dict]:
+    latencies = []
+    admission = AdmissionController()
+    for _ in range(calls):
+        started = time.perf_counter()
+        result = parse_travel_intent(llm, MESSAGE, dict(STATE), admission=admission)
+        latencies.append(time.perf_counter() - started)
+    return sum(latencies) / len(latencies) * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--token-ms", type=float, default=20)
+    parser.add_argument("--calls", type=int, default=10)
+    args = parser.parse_args()
+
+    for label, streaming in (("full completion", False), ("streamed", True)):
+        model = TokenStubLLM(args.token_ms)
+        scheduler = LLMScheduler(model)
+        llm = scheduler if streaming else InvokeOnly(scheduler)
+        avg_ms, result = run(llm, args.calls)
+        print(f"{label:<16} avg={avg_ms:7.1f} ms  tokens generated/call={model.generated / args.calls:5.1f}  "
+              f"result={result}")
+
+    print(stream_stats())
+
+
+if __name__ == "__main__":
+    main()
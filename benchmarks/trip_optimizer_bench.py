@@ -0,0 +1,105 @@
+"""
+Latency of the joint trip-package optimizer: every route in the dataset,
+then a synthetic catalog far larger than it.
+
+    python -m benchmarks.trip_optimizer_bench [--flights 2000] [--hotels 500] [--window 30] [--top-k 5]
+
+--flights is per direction; the window is the number of start dates.
+"""
+import argparse
+import random
+import statistics
+import time
+from datetime import date, datetime, timedelta
+
+import tools.flight_tool as flight_tool
+from agent.travel_agent import shared_city_extractor
+from tools.flight_tool import DATETIME_FORMAT
+from tools.trip_optimizer import optimize_trip, rank_packages
+
+
+SLOTS = ("morning", "afternoon", "evening", "night")
+
+
+def synthetic_flights(n: int, rng: random.Random) -> list:
+    base = datetime(2025, 1, 6)
+    return [
+        {
+            "flight_id": f"SYN{i:05d}",
+            "departure_time": (base + timedelta(days=rng.randrange(7), minutes=rng.randrange(1440))).strftime(DATETIME_FORMAT),
+            "price": rng.randint(1500, 15000),
+            "duration_minutes": rng.randint(60, 400),
+            "time_of_day": rng.choice(SLOTS),
+        }
+        for i in range(n)
+    ]
+
+
+def synthetic_hotels(n: int, rng: random.Random) -> list:
+    return [
+        {"hotel_id": f"SYNH{i:04d}", "name": f"Hotel {i}", "stars": rng.randint(1, 5),
+         "price_per_night": rng.randint(800, 20000)}
+        for i in range(n)
+    ]
+
+
+def timed(fn, runs: int) -> list:
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return sorted(timings)
+
+
+def report(label: str, timings: list):
+    p99 = timings[min(len(timings) - 1, int(0.99 * len(timings)))]
+    print(f"{label:<34} p50={statistics.median(timings):6.2f} ms  p99={p99:6.2f} ms  n={len(timings)}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--flights", type=int, default=2000)
+    parser.add_argument("--hotels", type=int, default=500)
+    parser.add_argument("--window", type=int, default=30)
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--runs", type=int, default=50)
+    args = parser.parse_args()
+
+    flight_tool.DEBUG = False
+    start = date.today() + timedelta(days=14)
+    end = start + timedelta(days=args.window - 1)
+
+    cities = shared_city_extractor()
+    routes = [(s, d) for s in cities.all_sources() for d in cities.destinations_from(s)]
+    for objective in ("cost", "value"):
+        timings = []
+        for source, destination in routes:
+            timings += timed(
+                lambda: optimize_trip(source, destination, start, end, 5, 2, objective=objective, top_k=args.top_k),
+                runs=5,
+            )
+        report(f"dataset, {len(routes)} routes, {objective}", sorted(timings))
+
+    rng = random.Random(7)
+    outbound, returns = synthetic_flights(args.flights, rng), synthetic_flights(args.flights, rng)
+    hotels = synthetic_hotels(args.hotels, rng)
+    dates = [start + timedelta(days=i) for i in range(args.window)]
+    combos = args.window * args.flights * args.flights * args.hotels // 49
+    print(f"synthetic: {args.flights} flights each way, {args.hotels} hotels, "
+          f"{args.window} dates (~{combos:,} valid combinations)")
+
+    for label, kwargs in (
+        ("cost", {}),
+        ("value", {"objective": "value"}),
+        ("cost, cap + 4★ + morning", {"max_total": 60000, "min_stars": 4, "time_of_day": "morning"}),
+    ):
+        timings = timed(
+            lambda: rank_packages(outbound, returns, hotels, dates, 5, 2, top_k=args.top_k, **kwargs),
+            runs=args.runs,
+        )
+        report(f"synthetic, {label}", timings)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Per-turn latency of full conversations against a slow stub LLM,
+with and without the turn deadline.
+
+    python -m benchmarks.turn_latency [--llm-ms 3000] [--conversations 20]
+
+Every conversation contains turns the rules cannot fully explain, so
+the LLM is consulted; with the deadline those turns fall back to the
+rule-based fields and report "intent_llm" as degraded.
+"""
+import argparse
+import time
+from collections import Counter
+
+import tools.flight_tool as flight_tool
+from agent.travel_agent import TravelAgent
+from utils.deadline import Deadline
+
+
+CONVERSATION = [
+    "plan a relaxing trip from mumbai to goa somewhere sunny",
+    "round trip",
+    "in 5 days",
+    "5",
+    "2",
+    "budget",
+    "1",
+]
+
+
+class SlowLLM:
+    def __init__(self, latency_ms: float):
+        self.latency_s = latency_ms / 1000
+
+    def invoke(self, prompt, **kwargs):
+        time.sleep(self.latency_s)
+        return "{}"
+
+
+def run(conversations: int, llm_ms: float, budget_s: float | None) -> tuple[list, Counter]:
+    info = {"instance": SlowLLM(llm_ms), "provider": "Stub", "model_name": "slow-stub", "status": "ok"}
+    latencies, degraded = [], Counter()
+
+    for _ in range(conversations):
+        agent = TravelAgent(model_info=info)
+        for message in CONVERSATION:
+            started = time.perf_counter()
+            response = agent.run(message, deadline=Deadline(budget_s or 3600))
+            latencies.append(time.perf_counter() - started)
+            degraded.update(response.get("DEGRADED", []))
+
+    return sorted(latencies), degraded
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--llm-ms", type=float, default=3000)
+    parser.add_argument("--conversations", type=int, default=5)
+    parser.add_argument("--budget-s", type=float, default=2.0)
+    args = parser.parse_args()
+
+    flight_tool.DEBUG = False
+
+    for label, budget in (("no deadline", None), (f"{args.budget_s:g}s deadline", args.budget_s)):
+        latencies, degraded = run(args.conversations, args.llm_ms, budget)
+        p50 = latencies[len(latencies) // 2] * 1000
+        p99 = latencies[min(len(latencies) - 1, int(0.99 * len(latencies)))] * 1000
+        print(f"{label:<14} turns={len(latencies):<4} p50={p50:8.1f} ms  p99={p99:8.1f} ms  "
+              f"degraded={dict(degraded)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,25 @@
+# ---------------- Tier-based Daily Costs ---------------- #
+# Per traveler per day
+
+TIER_DAILY_COSTS = {
+    "budget": {
+        "food": 400,
+        "local": 250,
+        "misc": 150,
+    },
+    "mid-range": {
+        "food": 700,
+        "local": 400,
+        "misc": 300,
+    },
+    "luxury": {
+        "food": 1200,
+        "local": 700,
+        "misc": 600,
+    },
+}
+
+
 def estimate_trip_budget(
     outbound_flight,
     hotel,
@@ -33,25 +55,7 @@ def estimate_trip_budget(
     breakdown["hotel"] = hotel_cost
 
     # ---------------- Tier-based Daily Costs ---------------- #
-    tier_costs = {
-        "budget": {
-            "food": 400,
-            "local": 250,
-            "misc": 150,
-        },
-        "mid-range": {
-            "food": 700,
-            "local": 400,
-            "misc": 300,
-        },
-        "luxury": {
-            "food": 1200,
-            "local": 700,
-            "misc": 600,
-        },
-    }
-
-    tier = tier_costs.get(budget_tier, tier_costs["budget"])
+    tier = TIER_DAILY_COSTS.get(budget_tier, TIER_DAILY_COSTS["budget"])
 
     food_cost = tier["food"] * travelers * days
     local_travel_cost = tier["local"] * travelers * days
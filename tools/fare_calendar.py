@@ -0,0 +1,156 @@
+import threading
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from utils.helpers import load_json, validate_fields
+from tools.flight_tool import FLIGHT_DATA_PATH, REQUIRED_FLIGHT_FIELDS, MIN_LAYOVER_MINUTES
+from tools.tool_cache import dataset_version
+
+
+# ---------------- Configuration ---------------- #
+
+WEEKDAYS = ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
+
+
+# ---------------- Route Index ---------------- #
+#
+# Flights repeat weekly on the weekday of their departure. The index
+# holds, per route and weekday, the cheapest fare and the number of
+# options (direct, and connecting as search_flights builds them), so a
+# calendar over any window is one lookup per date.
+
+_lock = threading.Lock()
+_index_version: Optional[tuple] = None
+_index: Dict[tuple, List[Dict[str, Any]]] = {}
+
+
+def _empty_week() -> List[Dict[str, Any]]:
+    return [{"cheapest_fare": None, "flights": 0, "direct_flights": 0} for _ in WEEKDAYS]
+
+
+def _add(week: List[Dict[str, Any]], weekday: int, fare: int, direct: bool):
+    cell = week[weekday]
+    cell["flights"] += 1
+    cell["direct_flights"] += direct
+    if cell["cheapest_fare"] is None or fare < cell["cheapest_fare"]:
+        cell["cheapest_fare"] = fare
+
+
+def _build_index(flights: List[Dict[str, Any]]) -> Dict[tuple, List[Dict[str, Any]]]:
+    index: Dict[tuple, List[Dict[str, Any]]] = {}
+    by_origin: Dict[str, List[tuple]] = {}
+
+    for f in flights:
+        src, dst = f["from"].lower(), f["to"].lower()
+        dep = datetime.fromisoformat(f["departure_time"])
+        arr = datetime.fromisoformat(f["arrival_time"])
+        by_origin.setdefault(src, []).append((dst, dep, arr, f["price"]))
+        _add(index.setdefault((src, dst), _empty_week()), dep.weekday(), f["price"], True)
+
+    # Connecting: same chains as search_flights, on the first leg's weekday
+    for src, legs in by_origin.items():
+        for via, dep1, arr1, price1 in legs:
+            for dst, dep2, _, price2 in by_origin.get(via, []):
+                if dst == src:
+                    continue
+                if (dep2 - arr1).total_seconds() / 60 < MIN_LAYOVER_MINUTES:
+                    continue
+                week = index.setdefault((src, dst), _empty_week())
+                _add(week, dep1.weekday(), price1 + price2, False)
+
+    return index
+
+
+def _route_week(source: str, destination: str) -> List[Dict[str, Any]]:
+    global _index_version, _index
+
+    version = dataset_version([FLIGHT_DATA_PATH])
+    with _lock:
+        if version != _index_version:
+            flights = load_json(FLIGHT_DATA_PATH)
+            validate_fields(flights, REQUIRED_FLIGHT_FIELDS)
+            _index, _index_version = _build_index(flights), version
+        index = _index
+
+    return index.get((source.strip().lower(), destination.strip().lower())) or _empty_week()
+
+
+# ---------------- Calendar ---------------- #
+
+def fare_calendar(source: str, destination: str, start: date, end: date) -> Dict[str, Any]:
+    """
+    Cheapest fare and number of flights for every date from start to
+    end (inclusive).
+
+    Returns:
+    {
+        "source": "Mumbai", "destination": "Goa",
+        "start": "2026-11-03", "end": "2026-11-17",
+        "days": [{"date", "weekday", "available", "cheapest_fare",
+                  "flights", "direct_flights"}, ...],
+        "cheapest": <cheapest available day> | None
+    }
+    """
+    if not source or not destination:
+        raise ValueError("Source and destination are required")
+
+    week = _route_week(source, destination)
+    days = []
+    d = start
+    while d <= end:
+        cell = week[d.weekday()]
+        days.append({
+            "date": d.isoformat(),
+            "weekday": WEEKDAYS[d.weekday()],
+            "available": cell["flights"] > 0,
+            **cell,
+        })
+        d += timedelta(days=1)
+
+    available = [day for day in days if day["available"]]
+    return {
+        "source": source,
+        "destination": destination,
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "days": days,
+        "cheapest": min(available, key=lambda day: day["cheapest_fare"], default=None),
+    }
+
+
+def fare_window(
+    source: str,
+    destination: str,
+    around: date,
+    days: int = 7,
+    earliest: Optional[date] = None,
+) -> Dict[str, Any]:
+    """
+    Calendar of ±days around a date, starting no earlier than `earliest`.
+    """
+    start = around - timedelta(days=days)
+    if earliest:
+        start = max(start, earliest)
+    return fare_calendar(source, destination, start, around + timedelta(days=days))
+
+
+def fare_month(source: str, destination: str, year: int, month: int) -> Dict[str, Any]:
+    start = date(year, month, 1)
+    end = (start + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+    return fare_calendar(source, destination, start, end)
+
+
+def cheapest_dates(
+    calendar: Dict[str, Any],
+    k: int = 3,
+    target: Optional[date] = None,
+) -> List[Dict[str, Any]]:
+    """
+    The k cheapest available days; equal fares go to the date closest
+    to `target` (then the earlier one).
+    """
+    def distance(day):
+        return abs((date.fromisoformat(day["date"]) - target).days) if target else 0
+
+    available = [day for day in calendar["days"] if day["available"]]
+    return sorted(available, key=lambda day: (day["cheapest_fare"], distance(day), day["date"]))[:k]
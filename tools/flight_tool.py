@@ -2,6 +2,8 @@ from datetime import datetime, time
 from typing import Dict, Any, List, Optional
 
 from utils.helpers import load_json, validate_fields
+from tools.tool_cache import cached_tool
+from utils.deadline import Deadline
 
 
 FLIGHT_DATA_PATH = "data/flights.json"
@@ -18,6 +20,16 @@ REQUIRED_FLIGHT_FIELDS = [
 
 DEBUG = True  # set False to disable debug output
 
+# Time the connecting-flight search needs; with less left on the turn
+# deadline (and direct flights found) it is skipped
+CONNECTING_SEARCH_BUDGET_S = 0.05
+
+# Shortest connection between the two legs of a connecting flight
+MIN_LAYOVER_MINUTES = 45
+
+# Departure / arrival times as returned to callers
+DATETIME_FORMAT = "%d %b %Y, %H:%M"
+
 
 # ---------------- Helper Functions ---------------- #
 
@@ -38,7 +50,7 @@ def _format_duration(minutes: int) -> str:
 
 
 def _format_datetime(dt_str: str) -> str:
-    return datetime.fromisoformat(dt_str).strftime("%d %b %Y, %H:%M")
+    return datetime.fromisoformat(dt_str).strftime(DATETIME_FORMAT)
 
 
 def _time_bucket(dep_dt: datetime) -> str:
@@ -54,6 +66,12 @@ def _time_bucket(dep_dt: datetime) -> str:
 
 # ---------------- Main Flight Search ---------------- #
 
+@cached_tool(
+    "flights",
+    lambda: [FLIGHT_DATA_PATH],
+    case_insensitive=("source", "destination"),
+    cacheable=lambda result: not result["partial"],
+)
 def search_flights(
     source: str,
     destination: str,
@@ -61,7 +79,8 @@ def search_flights(
     min_price: Optional[int] = None,
     max_price: Optional[int] = None,
     time_of_day: Optional[str] = None,
-    airlines: Optional[List[str]] = None
+    airlines: Optional[List[str]] = None,
+    deadline: Optional[Deadline] = None
 ) -> Dict[str, Any]:
 
     if not source or not destination:
@@ -109,9 +128,21 @@ def search_flights(
     if DEBUG:
         print("DEBUG: Checking valid connecting routes")
 
-    for leg1 in flights:
+    # Out of time → direct flights are enough, stop expanding chains
+    search_connections = not (
+        deadline and enriched_direct and not deadline.allows(CONNECTING_SEARCH_BUDGET_S)
+    )
+    if not search_connections:
+        deadline.degrade("connecting_flights")
+    connections_complete = search_connections
+
+    for leg1 in flights if search_connections else []:
         if leg1["from"].lower() != source.lower():
             continue
+        if deadline and enriched_direct and deadline.expired():
+            deadline.degrade("connecting_flights")
+            connections_complete = False
+            break
 
         leg1_dep_dt = datetime.fromisoformat(leg1["departure_time"])
         leg1_arr_dt = datetime.fromisoformat(leg1["arrival_time"])
@@ -130,7 +161,7 @@ def search_flights(
             leg2_dep_dt = datetime.fromisoformat(leg2["departure_time"])
             layover = (leg2_dep_dt - leg1_arr_dt).total_seconds() / 60
 
-            if layover < 45:
+            if layover < MIN_LAYOVER_MINUTES:
                 continue
 
             total_duration = (
@@ -209,4 +240,6 @@ def search_flights(
             "time_of_day": available_time_slots,
             "price_range": price_range,
         },
+        # Connecting search cut short by the turn deadline
+        "partial": not connections_complete,
     }
@@ -1,6 +1,7 @@
 from typing import Dict, Any, List, Optional
 
 from utils.helpers import load_json, validate_fields
+from tools.tool_cache import cached_tool
 
 
 # ---------------- Configuration ---------------- #
@@ -19,6 +20,7 @@ REQUIRED_HOTEL_FIELDS = [
 
 # ---------------- Main Hotel Search ---------------- #
 
+@cached_tool("hotels", lambda: [HOTEL_DATA_PATH], case_insensitive=("city",))
 def search_hotels(
     city: str,
     sort_by: Optional[str] = None,
@@ -1,6 +1,7 @@
 from typing import Dict, Any, List, Optional
 
 from utils.helpers import load_json, validate_fields
+from tools.tool_cache import cached_tool
 
 
 # ---------------- Configuration ---------------- #
@@ -18,6 +19,7 @@ REQUIRED_PLACES_FIELDS = [
 
 # ---------------- Main Places Search ---------------- #
 
+@cached_tool("places", lambda: [PLACES_DATA_PATH], case_insensitive=("city",))
 def search_places(
     city: str,
     sort_by: Optional[str] = None,
@@ -0,0 +1,237 @@
+import functools
+import inspect
+import os
+import pickle
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Optional
+
+
+# ---------------- Configuration ---------------- #
+
+DEFAULT_MAX_BYTES = int(float(os.getenv("TOOL_CACHE_MB", "64")) * 1024 * 1024)
+
+# Arguments that change how long a call may take, not what it returns
+UNKEYED_ARGS = {"deadline"}
+
+
+# ---------------- Helpers ---------------- #
+
+def dataset_version(paths: Iterable[str]) -> tuple:
+    """
+    Snapshot identity of the data files behind a tool: a changed
+    mtime or size means a new snapshot.
+    """
+    version = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+            version.append((path, st.st_mtime_ns, st.st_size))
+        except OSError:
+            version.append((path, None, None))
+    return tuple(version)
+
+
+def _normalize(value: Any) -> Any:
+    # Hashable form of an argument
+    if isinstance(value, (list, tuple)):
+        return tuple(_normalize(v) for v in value)
+    if isinstance(value, (set, frozenset)):
+        return tuple(sorted((_normalize(v) for v in value), key=repr))
+    if isinstance(value, dict):
+        return tuple(sorted((k, _normalize(v)) for k, v in value.items()))
+    return value
+
+
+class _Flight:
+    """One computation in progress; identical requests wait on it."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.blob: Optional[bytes] = None
+        self.error: Optional[BaseException] = None
+
+
+# ---------------- Cache ---------------- #
+
+class ToolCache:
+    """
+    Process-wide cache of tool results, shared by every session.
+    - Keyed by tool name, normalized arguments and dataset version
+    - Values are stored pickled; every caller gets its own copy, so
+      results can be modified freely
+    - LRU eviction by stored size (bytes)
+    - Concurrent identical requests are computed once (single flight);
+      a result that is not cacheable is not shared either, and waiting
+      requests compute it again
+    - A new dataset snapshot drops the tool's old entries
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[tuple, bytes]" = OrderedDict()
+        self._inflight: Dict[tuple, _Flight] = {}
+        self._versions: Dict[str, tuple] = {}
+        self._bytes = 0
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "coalesced": 0,
+            "stores": 0,
+            "evictions": 0,
+            "invalidations": 0,
+        }
+
+    def _check_version(self, tool: str, version: tuple):
+        # Caller holds the lock
+        if self._versions.get(tool) == version:
+            return
+        if tool in self._versions:
+            stale = [k for k in self._entries if k[0] == tool]
+            for k in stale:
+                self._bytes -= len(self._entries.pop(k))
+            self._stats["invalidations"] += 1
+        self._versions[tool] = version
+
+    def _store(self, key: tuple, blob: bytes):
+        # Caller holds the lock
+        if len(blob) > self.max_bytes or key in self._entries:
+            return
+        self._entries[key] = blob
+        self._bytes += len(blob)
+        self._stats["stores"] += 1
+        while self._bytes > self.max_bytes:
+            _, old = self._entries.popitem(last=False)
+            self._bytes -= len(old)
+            self._stats["evictions"] += 1
+
+    def get_or_compute(
+        self,
+        tool: str,
+        version: tuple,
+        args: tuple,
+        compute: Callable[[], Any],
+        cacheable: Callable[[Any], bool] = lambda result: True,
+    ) -> Any:
+        key = (tool, version, args)
+
+        while True:
+            with self._lock:
+                self._check_version(tool, version)
+                blob = self._entries.get(key)
+                if blob is not None:
+                    self._entries.move_to_end(key)
+                    self._stats["hits"] += 1
+                else:
+                    flight = self._inflight.get(key)
+                    leader = flight is None
+                    if leader:
+                        flight = self._inflight[key] = _Flight()
+                        self._stats["misses"] += 1
+                    else:
+                        self._stats["coalesced"] += 1
+
+            if blob is not None:
+                return pickle.loads(blob)
+            if leader:
+                break
+
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            if flight.blob is not None:
+                return pickle.loads(flight.blob)
+            # The leader's result was not cacheable (e.g. cut short by
+            # its own deadline): compute again under ours
+
+        try:
+            result = compute()
+            if cacheable(result):
+                flight.blob = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+                if flight.blob is not None:
+                    self._store(key, flight.blob)
+            flight.done.set()
+
+        return result
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._versions.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._entries)
+            stats["bytes"] = self._bytes
+            stats["max_bytes"] = self.max_bytes
+
+        requests = stats["hits"] + stats["misses"] + stats["coalesced"]
+        stats["requests"] = requests
+        stats["hit_ratio"] = (
+            round((stats["hits"] + stats["coalesced"]) / requests, 4) if requests else 0.0
+        )
+        return stats
+
+
+TOOL_CACHE = ToolCache()
+
+
+def tool_cache_stats() -> Dict[str, Any]:
+    return TOOL_CACHE.stats()
+
+
+# ---------------- Decorator ---------------- #
+
+def cached_tool(
+    name: str,
+    data_paths: Callable[[], Iterable[str]],
+    case_insensitive: Iterable[str] = (),
+    cacheable: Callable[[Any], bool] = lambda result: True,
+    cache: Optional[ToolCache] = None,
+):
+    """
+    Serves a tool through the shared cache.
+    - `data_paths` returns the files the tool reads (looked up on every
+      call, so a swapped path is noticed too)
+    - Arguments in `case_insensitive` are lower-cased for the key; only
+      list those the tool itself compares case-insensitively
+    - Results for which `cacheable(result)` is False, or that finished
+      after the call's own deadline expired, are returned but neither
+      stored nor shared
+    """
+    case_insensitive = set(case_insensitive)
+
+    def decorate(fn):
+        signature = inspect.signature(fn)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key_args = tuple(
+                (k, v.lower() if k in case_insensitive and isinstance(v, str) else _normalize(v))
+                for k, v in bound.arguments.items()
+                if k not in UNKEYED_ARGS
+            )
+            deadline = bound.arguments.get("deadline")
+            return (cache or TOOL_CACHE).get_or_compute(
+                name,
+                dataset_version(data_paths()),
+                key_args,
+                lambda: fn(*args, **kwargs),
+                lambda result: cacheable(result) and not (deadline and deadline.expired()),
+            )
+
+        wrapper.uncached = fn
+        return wrapper
+
+    return decorate
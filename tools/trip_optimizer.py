@@ -0,0 +1,251 @@
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+from tools.budget_tool import TIER_DAILY_COSTS, estimate_trip_budget
+from tools.flight_tool import DATETIME_FORMAT, search_flights
+from tools.hotel_tool import search_hotels
+
+
+# ---------------- Configuration ---------------- #
+
+OBJECTIVES = ("cost", "value")
+
+# "value" ranks by generalized cost: what is paid, less what the hotel's
+# stars are worth, plus what time in the air costs (per traveler)
+VALUE_PER_STAR_NIGHT = 600
+VALUE_PER_FLIGHT_HOUR = 300
+
+
+# ---------------- Cost Matrices ---------------- #
+#
+# Costs are separable (outbound + return + hotel + daily costs), so a
+# package in the top k only ever uses one of the k best outbound flights
+# for its weekday, one of the k best returns and one of the k best
+# hotels. Each component is pruned to those before the date × outbound
+# × return × hotel matrix is built.
+
+DAY_FORMAT = DATETIME_FORMAT.split(",")[0]
+
+
+@lru_cache(maxsize=4096)
+def _weekday(day: str) -> int:
+    # Departures fall on few distinct days; each is parsed once
+    return datetime.strptime(day, DAY_FORMAT).weekday()
+
+
+def _time_filter(slots: Union[str, Sequence[str], None]) -> Optional[set]:
+    if not slots:
+        return None
+    return {slots.lower()} if isinstance(slots, str) else {s.lower() for s in slots}
+
+
+def _leg_candidates(
+    flights: List[Dict[str, Any]],
+    travelers: int,
+    objective: str,
+    time_of_day: Union[str, Sequence[str], None],
+    k: int,
+):
+    """
+    Per weekday (rows 0-6), the k best flights: (cost, score, index)
+    matrices of shape (7, k), padded with inf / -1.
+    """
+    slots = _time_filter(time_of_day)
+    if not flights:
+        return np.full((7, 1), np.inf), np.full((7, 1), np.inf), np.full((7, 1), -1)
+
+    weekday = np.array([_weekday(f["departure_time"].split(",")[0]) for f in flights])
+    cost = np.array([f["price"] for f in flights], dtype=float) * travelers
+    score = cost.copy()
+    if objective == "value":
+        hours = np.array([f.get("duration_minutes", 0) for f in flights]) / 60
+        score += hours * VALUE_PER_FLIGHT_HOUR * travelers
+
+    allowed = np.array([slots is None or f.get("time_of_day") in slots for f in flights])
+    by_day = np.where((weekday == np.arange(7)[:, None]) & allowed, score, np.inf)
+
+    order = np.argsort(by_day, axis=1, kind="stable")[:, :k]
+    best = np.take_along_axis(by_day, order, axis=1)
+    found = np.isfinite(best)
+    return np.where(found, cost[order], np.inf), best, np.where(found, order, -1)
+
+
+def _hotel_candidates(hotels: List[Dict[str, Any]], days: int, travelers: int, objective: str, k: int):
+    nights = days * travelers
+    cost = np.array([h["price_per_night"] for h in hotels], dtype=float) * nights
+    score = cost.copy()
+    if objective == "value":
+        score -= np.array([h["stars"] for h in hotels]) * VALUE_PER_STAR_NIGHT * nights
+
+    order = np.argsort(score, kind="stable")[:k]
+    return cost[order], score[order], order
+
+
+# ---------------- Ranking ---------------- #
+
+def rank_packages(
+    outbound_flights: List[Dict[str, Any]],
+    return_flights: Optional[List[Dict[str, Any]]],
+    hotels: List[Dict[str, Any]],
+    dates: List[date],
+    days: int,
+    travelers: int,
+    budget_tier: str = "budget",
+    objective: str = "cost",
+    max_total: Optional[int] = None,
+    min_stars: Optional[int] = None,
+    time_of_day: Union[str, Sequence[str], None] = None,
+    return_time_of_day: Union[str, Sequence[str], None] = None,
+    top_k: int = 5,
+) -> List[Dict[str, Any]]:
+    """
+    The top_k complete packages (start date, outbound, return, hotel)
+    over the given start dates, best first. Flights run weekly on the
+    weekday of their departure; return_flights=None plans one way.
+
+    Equal scores go to the earlier date in `dates`.
+    With objective="value" and a max_total, pruning can miss a package
+    that only a cheaper, lower-value component would bring under the cap.
+    """
+    if objective not in OBJECTIVES:
+        raise ValueError(f"objective must be one of {OBJECTIVES}")
+
+    if min_stars is not None:
+        hotels = [h for h in hotels if h["stars"] >= min_stars]
+    if not dates or not hotels or top_k <= 0:
+        return []
+
+    k = top_k
+    out_cost, out_score, out_idx = _leg_candidates(outbound_flights, travelers, objective, time_of_day, k)
+    if return_flights is None:
+        ret_cost = ret_score = np.zeros((7, 1))
+        ret_idx = np.full((7, 1), -1)
+    else:
+        ret_cost, ret_score, ret_idx = _leg_candidates(
+            return_flights, travelers, objective, return_time_of_day, k
+        )
+    hotel_cost, hotel_score, hotel_idx = _hotel_candidates(hotels, days, travelers, objective, k)
+
+    out_day = np.array([d.weekday() for d in dates])
+    ret_day = (out_day + days - 1) % 7
+    daily = sum(TIER_DAILY_COSTS.get(budget_tier, TIER_DAILY_COSTS["budget"]).values()) * travelers * days
+
+    # (date, outbound, return, hotel)
+    cost = (
+        out_cost[out_day][:, :, None, None]
+        + ret_cost[ret_day][:, None, :, None]
+        + hotel_cost[None, None, None, :]
+        + daily
+    )
+    score = (
+        out_score[out_day][:, :, None, None]
+        + ret_score[ret_day][:, None, :, None]
+        + hotel_score[None, None, None, :]
+        + daily
+    )
+    if max_total is not None:
+        score = np.where(cost <= max_total, score, np.inf)
+
+    flat = score.ravel()
+    feasible = int(np.isfinite(flat).sum())
+    if not feasible:
+        return []
+
+    # Everything tied with the k-th best, then (score, position) order
+    n = min(k, feasible)
+    threshold = np.partition(flat, n - 1)[n - 1]
+    chosen = np.flatnonzero(flat <= threshold)
+    chosen = chosen[np.lexsort((chosen, flat[chosen]))][:n]
+
+    packages = []
+    for d, i, j, h in zip(*np.unravel_index(chosen, score.shape)):
+        start = dates[d]
+        outbound = outbound_flights[out_idx[out_day[d], i]]
+        ret = return_flights[ret_idx[ret_day[d], j]] if return_flights is not None else None
+        hotel = hotels[hotel_idx[h]]
+        budget = estimate_trip_budget(outbound, hotel, days, travelers, return_flight=ret, budget_tier=budget_tier)
+
+        packages.append({
+            "start_date": start.isoformat(),
+            "return_date": (start + timedelta(days=days - 1)).isoformat() if ret else None,
+            "outbound_flight": outbound,
+            "return_flight": ret,
+            "hotel": hotel,
+            "total_cost": budget["total_estimated_cost"],
+            "score": int(round(score[d, i, j, h])),
+            "budget": budget,
+        })
+    return packages
+
+
+# ---------------- Main Optimizer ---------------- #
+
+def optimize_trip(
+    source: str,
+    destination: str,
+    start: date,
+    end: date,
+    days: int,
+    travelers: int,
+    round_trip: bool = True,
+    budget_tier: str = "budget",
+    objective: str = "cost",
+    max_total: Optional[int] = None,
+    min_stars: Optional[int] = None,
+    time_of_day: Union[str, Sequence[str], None] = None,
+    return_time_of_day: Union[str, Sequence[str], None] = None,
+    top_k: int = 5,
+    target: Optional[date] = None,
+) -> Dict[str, Any]:
+    """
+    Picks outbound flight, return flight, hotel and start date (from
+    start to end) together. Direct flights only, as in the plan.
+
+    Returns:
+    {
+        "source": "Mumbai", "destination": "Goa",
+        "start": "2026-11-07", "end": "2026-11-13",
+        "objective": "cost",
+        "packages": [{"start_date", "return_date", "outbound_flight",
+                      "return_flight", "hotel", "total_cost", "score",
+                      "budget"}, ...]
+    }
+
+    Equal scores go to the date closest to `target` (default: start).
+    """
+    if not source or not destination:
+        raise ValueError("Source and destination are required")
+
+    target = target or start
+    dates = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+    dates.sort(key=lambda d: (abs((d - target).days), d))
+
+    outbound = search_flights(source, destination).get("direct_flights", [])
+    returns = search_flights(destination, source).get("direct_flights", []) if round_trip else None
+    hotels = search_hotels(destination).get("hotels", [])
+
+    return {
+        "source": source,
+        "destination": destination,
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "objective": objective,
+        "packages": rank_packages(
+            outbound,
+            returns,
+            hotels,
+            dates,
+            days,
+            travelers,
+            budget_tier=budget_tier,
+            objective=objective,
+            max_total=max_total,
+            min_stars=min_stars,
+            time_of_day=time_of_day,
+            return_time_of_day=return_time_of_day,
+            top_k=top_k,
+        ),
+    }
@@ -2,11 +2,15 @@ from typing import Dict, Any, List
 from datetime import datetime, date, timedelta
 import requests
 
+from utils.deadline import Deadline
+
 # CONFIGURATION
 
 
 MAX_FORECAST_DAYS = 10  # Open-Meteo reliable window
 CACHE_TTL_DAYS = 1      # Refresh cache daily
+API_TIMEOUT_S = 10
+MIN_API_BUDGET_S = 0.3  # less left on the turn deadline → no API call
 
 
 
@@ -102,6 +106,22 @@ def _seasonal_outlook(city: str) -> str:
     return "Dry and pleasant winter weather" if city.lower() == "goa" else "Seasonal average conditions"
 
 
+def _seasonal_forecast(city: str, start_date: str, end_date: str, days_ahead: int, note: str) -> Dict[str, Any]:
+    return {
+        "city": city.title(),
+        "start_date": start_date,
+        "end_date": end_date,
+        "summary": "Detailed forecast not available yet",
+        "seasonal_outlook": _seasonal_outlook(city),
+        "confidence": _confidence_level(days_ahead),
+        "weather_risk_score": 25,
+        "rain_probability_avg": 15,
+        "best_day_to_travel": start_date,
+        "note": note,
+        "daily_forecast": [],
+    }
+
+
 # ===============================
 # MAIN WEATHER TOOL
 # ===============================
@@ -110,8 +130,14 @@ def weather_lookup(
     city: str,
     start_date: str,
     end_date: str,
-    return_date: str | None = None
+    return_date: str | None = None,
+    deadline: Deadline | None = None
 ) -> Dict[str, Any]:
+    """
+    With a turn deadline too short for the API, a stale cached forecast
+    (or the seasonal outlook) is served instead and the "weather"
+    stage is marked degraded.
+    """
 
     if not city:
         raise ValueError("City is required")
@@ -137,19 +163,10 @@ def weather_lookup(
 
     # ---------------- FAR FUTURE (SEASONAL MODE) ----------------
     if days_ahead > MAX_FORECAST_DAYS:
-        data = {
-            "city": city.title(),
-            "start_date": start_date,
-            "end_date": end_date,
-            "summary": "Detailed forecast not available yet",
-            "seasonal_outlook": _seasonal_outlook(city),
-            "confidence": _confidence_level(days_ahead),
-            "weather_risk_score": 25,
-            "rain_probability_avg": 15,
-            "best_day_to_travel": start_date,
-            "note": "Forecast will auto-refresh closer to travel date",
-            "daily_forecast": [],
-        }
+        data = _seasonal_forecast(
+            city, start_date, end_date, days_ahead,
+            "Forecast will auto-refresh closer to travel date",
+        )
 
         _WEATHER_CACHE[cache_key] = {
             "cached_on": today,
@@ -158,6 +175,16 @@ def weather_lookup(
 
         return data
 
+    # ---------------- OUT OF TIME (STALE / SEASONAL) ----------------
+    if deadline and not deadline.allows(MIN_API_BUDGET_S):
+        deadline.degrade("weather")
+        if cached:
+            return {**cached["data"], "stale": True}
+        return _seasonal_forecast(
+            city, start_date, end_date, days_ahead,
+            "Live forecast skipped to keep the response fast",
+        )
+
     # ---------------- API CALL ----------------
     coords = CITY_COORDINATES[city_key]
     url = "https://api.open-meteo.com/v1/forecast"
@@ -170,7 +197,8 @@ def weather_lookup(
         "end_date": end_date,
     }
 
-    response = requests.get(url, params=params, timeout=10)
+    timeout = deadline.timeout(API_TIMEOUT_S) if deadline else API_TIMEOUT_S
+    response = requests.get(url, params=params, timeout=timeout)
     response.raise_for_status()
     data = response.json()
 
@@ -0,0 +1,229 @@
+import re
+from datetime import date, timedelta
+from typing import NamedTuple
+
+
+class DateExpression(NamedTuple):
+    start: date
+    end: date | None     # set for ranges ("15-20 june", "this weekend")
+    kind: str            # absolute | relative | range
+    span: tuple          # character offsets in the parsed text
+
+
+MONTHS = {
+    "jan": 1, "january": 1, "feb": 2, "february": 2, "mar": 3, "march": 3,
+    "apr": 4, "april": 4, "may": 5, "jun": 6, "june": 6, "jul": 7, "july": 7,
+    "aug": 8, "august": 8, "sep": 9, "sept": 9, "september": 9, "oct": 10,
+    "october": 10, "nov": 11, "november": 11, "dec": 12, "december": 12,
+}
+
+WEEKDAYS = {
+    "monday": 0, "tuesday": 1, "wednesday": 2, "thursday": 3,
+    "friday": 4, "saturday": 5, "sunday": 6,
+}
+
+SMALL_NUMBERS = {
+    "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6, "seven": 7,
+    "eight": 8, "nine": 9, "ten": 10, "a": 1, "an": 1, "a couple of": 2, "a few": 3,
+}
+
+# A message without any of these words (or a digit) holds no date
+DATE_WORDS = frozenset(
+    [*MONTHS, *WEEKDAYS, "today", "tonight", "tomorrow", "weekend", "week", "weeks",
+     "month", "months", "day", "days"]
+)
+
+# Words a date expression can start with; the pattern is only tried there
+_STARTERS = frozenset(
+    [*MONTHS, *WEEKDAYS, "today", "tonight", "tomorrow", "day", "in", "after",
+     "this", "next", "coming", "last", *(w.split()[0] for w in SMALL_NUMBERS)]
+)
+_WORD = re.compile(r"[a-z]+|\d+")
+
+_MONTH = "|".join(sorted(MONTHS, key=len, reverse=True))
+_WEEKDAY = "|".join(WEEKDAYS)
+_ORD = r"(?:st|nd|rd|th)?"
+_YEAR = r"(?:,?\s*(?P<{}>\d{{4}}))?"
+_TO = r"\s*(?:-|–|to|till|until|through|and)\s*"
+_COUNT = r"\d+|" + "|".join(sorted(map(re.escape, SMALL_NUMBERS), key=len, reverse=True))
+
+
+# One compiled expression; alternatives are tried left to right,
+# longest forms first.
+
+DATE_PATTERN = re.compile(
+    r"\b(?:"
+    r"(?P<iso>(?P<iso_y>\d{4})-(?P<iso_m>\d{1,2})-(?P<iso_d>\d{1,2}))"
+    rf"|(?P<dd_range>(?P<r1_d1>\d{{1,2}}){_ORD}{_TO}(?P<r1_d2>\d{{1,2}}){_ORD}\s+(?:of\s+)?(?P<r1_m>{_MONTH})\.?{_YEAR.format('r1_y')})"
+    rf"|(?P<md_range>(?P<r2_m>{_MONTH})\.?\s+(?P<r2_d1>\d{{1,2}}){_ORD}{_TO}(?P<r2_d2>\d{{1,2}}){_ORD}{_YEAR.format('r2_y')})"
+    rf"|(?P<dm>(?P<dm_d>\d{{1,2}}){_ORD}\s+(?:of\s+)?(?P<dm_m>{_MONTH})\.?{_YEAR.format('dm_y')})"
+    rf"|(?P<md>(?P<md_m>{_MONTH})\.?\s+(?P<md_d>\d{{1,2}}){_ORD}(?!\d){_YEAR.format('md_y')})"
+    r"|(?P<num>(?P<num_d>\d{1,2})/(?P<num_m>\d{1,2})(?:/(?P<num_y>\d{2,4}))?"
+    r"|(?P<num_d2>\d{1,2})[.-](?P<num_m2>\d{1,2})[.-](?P<num_y2>\d{4}))"
+    r"|(?P<word>day\s+after\s+tomorrow|tomorrow|today|tonight)"
+    rf"|(?P<in>(?:in|after)\s+(?P<in_n>{_COUNT})\s+(?P<in_u>days?|weeks?|months?))"
+    rf"|(?P<from_now>(?P<fn_n>{_COUNT})\s+(?P<fn_u>days?|weeks?)\s+from\s+(?:now|today))"
+    rf"|(?P<weekend>(?P<we_mod>this|next|coming)\s+weekend)"
+    r"|(?P<period>(?P<p_mod>next|coming)\s+(?P<p_u>week|month))"
+    rf"|(?P<weekday>(?:(?P<wd_mod>this|next|coming|last)\s+)?(?P<wd>{_WEEKDAY}))"
+    r")\b"
+)
+
+_CONNECTOR = re.compile(_TO)
+
+
+def _year_for(month: int, day: int, year: str | None, today: date) -> date:
+    if year:
+        y = int(year)
+        return date(y + 2000 if y < 100 else y, month, day)
+
+    # No year → next occurrence
+    d = date(today.year, month, day)
+    if d < today:
+        d = date(today.year + 1, month, day)
+    return d
+
+
+def _count(token: str) -> int:
+    token = token.lower()
+    return int(token) if token.isdigit() else SMALL_NUMBERS[token]
+
+
+def _weekday(name: str, modifier: str | None, today: date) -> date:
+    """
+    - "friday" / "this friday" / "coming friday" → next occurrence (today counts)
+    - "next friday" → the friday of next week
+    - "last friday" → most recent past friday
+    """
+    target = WEEKDAYS[name.lower()]
+    modifier = (modifier or "").lower()
+
+    if modifier == "last":
+        back = (today.weekday() - target) % 7 or 7
+        return today - timedelta(days=back)
+
+    ahead = (target - today.weekday()) % 7
+    if modifier == "next":
+        next_monday = today + timedelta(days=7 - today.weekday())
+        return next_monday + timedelta(days=target)
+    return today + timedelta(days=ahead)
+
+
+def _resolve(m: re.Match, today: date):
+    """
+    Match → (start, end | None, kind). Raises ValueError for impossible dates.
+    """
+    g = m.group
+
+    if g("iso"):
+        return date(int(g("iso_y")), int(g("iso_m")), int(g("iso_d"))), None, "absolute"
+
+    if g("dd_range") or g("md_range"):
+        p = "r1" if g("dd_range") else "r2"
+        month = MONTHS[g(f"{p}_m")]
+        start = _year_for(month, int(g(f"{p}_d1")), g(f"{p}_y"), today)
+        end = date(start.year, month, int(g(f"{p}_d2")))
+        if end < start:
+            raise ValueError("range ends before it starts")
+        return start, end, "range"
+
+    if g("dm"):
+        return _year_for(MONTHS[g("dm_m")], int(g("dm_d")), g("dm_y"), today), None, "absolute"
+
+    if g("md"):
+        return _year_for(MONTHS[g("md_m")], int(g("md_d")), g("md_y"), today), None, "absolute"
+
+    if g("num"):
+        if g("num_d"):
+            return _year_for(int(g("num_m")), int(g("num_d")), g("num_y"), today), None, "absolute"
+        return _year_for(int(g("num_m2")), int(g("num_d2")), g("num_y2"), today), None, "absolute"
+
+    if g("word"):
+        word = " ".join(g("word").split())
+        offset = {"today": 0, "tonight": 0, "tomorrow": 1, "day after tomorrow": 2}[word]
+        return today + timedelta(days=offset), None, "relative"
+
+    if g("in") or g("from_now"):
+        n = _count(g("in_n") or g("fn_n"))
+        unit = g("in_u") or g("fn_u")
+        if unit.startswith("month"):
+            month = today.month - 1 + n
+            year = today.year + month // 12
+            month = month % 12 + 1
+            day = min(today.day, 28)
+            return date(year, month, day), None, "relative"
+        days = n * 7 if unit.startswith("week") else n
+        return today + timedelta(days=days), None, "relative"
+
+    if g("weekend"):
+        saturday = today + timedelta(days=(5 - today.weekday()) % 7)
+        if today.weekday() == 6:
+            saturday = today - timedelta(days=1)
+        if g("we_mod") == "next":
+            saturday += timedelta(days=7)
+        start = max(saturday, today)
+        return start, saturday + timedelta(days=1), "range"
+
+    if g("period"):
+        if g("p_u") == "week":
+            return today + timedelta(days=7 - today.weekday()), None, "relative"
+        year = today.year + (today.month == 12)
+        month = today.month % 12 + 1
+        return date(year, month, 1), None, "relative"
+
+    if g("weekday"):
+        return _weekday(g("wd"), g("wd_mod"), today), None, "relative"
+
+    raise ValueError("unrecognised date expression")
+
+
+def parse_date(text: str, today: date | None = None) -> DateExpression | None:
+    """
+    First date expression in the text, resolved against `today`.
+
+    Handles:
+    - absolute: 2025-06-15, 15th June, June 15 2026, 15/06, 29 dec
+    - relative: today, tomorrow, in 3 days, next friday, next week
+    - ranges:   15-20 June, June 15 to 20, this weekend, 15 june to 20 june
+
+    Past dates are returned as-is; callers decide whether to accept them.
+    The pattern is only tried where a date can start (a digit, month,
+    weekday or relative word), so messages without dates cost one
+    word scan.
+    """
+    if not text:
+        return None
+
+    today = today or date.today()
+    text = text.lower()
+
+    for word in _WORD.finditer(text):
+        w = word.group()
+        if not (w[0].isdigit() or w in _STARTERS):
+            continue
+        m = DATE_PATTERN.match(text, word.start())
+        if not m:
+            continue
+        try:
+            start, end, kind = _resolve(m, today)
+        except (ValueError, KeyError):
+            continue
+
+        span_end = m.end()
+
+        # "15 june to 20 june", "friday to sunday"
+        if end is None:
+            link = _CONNECTOR.match(text, span_end)
+            if link:
+                second = DATE_PATTERN.match(text, link.end())
+                if second:
+                    try:
+                        other, _, _ = _resolve(second, start)
+                        if other >= start:
+                            end, kind, span_end = other, "range", second.end()
+                    except (ValueError, KeyError):
+                        pass
+
+        return DateExpression(start, end, kind, (m.start(), span_end))
+
+    return None
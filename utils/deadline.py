@@ -0,0 +1,60 @@
+import threading
+import time
+
+
+class Deadline:
+    """
+    Latency budget for one agent turn, passed down to every stage.
+
+    Stages ask whether enough time is left for their expensive path
+    (LLM call, network weather, connection search) and otherwise take
+    their cheap path and record themselves as degraded.
+
+    budget_s=None never expires (remaining() is threading.TIMEOUT_MAX,
+    so it can still be passed as a timeout).
+    """
+
+    def __init__(self, budget_s: float | None):
+        self.budget_s = budget_s
+        self.started_at = time.monotonic()
+        self.expires_at = self.started_at + budget_s if budget_s is not None else float("inf")
+        self._degraded = []
+        self._lock = threading.Lock()
+
+    @property
+    def unbounded(self) -> bool:
+        return self.budget_s is None
+
+    def remaining(self) -> float:
+        return max(0.0, min(threading.TIMEOUT_MAX, self.expires_at - time.monotonic()))
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started_at
+
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+    def allows(self, estimate_s: float) -> bool:
+        """
+        True if a step expected to take `estimate_s` fits in what is left.
+        """
+        return self.remaining() >= estimate_s
+
+    def timeout(self, cap_s: float) -> float:
+        """
+        Timeout for a blocking call: the stage's own cap, or less.
+        """
+        return min(cap_s, self.remaining())
+
+    def degrade(self, stage: str):
+        with self._lock:
+            if stage not in self._degraded:
+                self._degraded.append(stage)
+
+    @property
+    def degraded(self) -> list[str]:
+        with self._lock:
+            return list(self._degraded)
+
+    def __repr__(self):
+        return f"Deadline(remaining={self.remaining():.3f}s, degraded={self.degraded})"
@@ -0,0 +1,55 @@
+from functools import lru_cache
+
+from utils.helpers import load_json
+
+
+CITY_DATA_PATHS = [
+    ("data/flights.json", ("from", "to")),
+    ("data/hotels.json", ("city",)),
+    ("data/places.json", ("city",)),
+]
+
+# Common alternate / historic names → canonical dataset name
+CITY_ALIASES = {
+    "bengaluru": "Bangalore",
+    "bombay": "Mumbai",
+    "calcutta": "Kolkata",
+    "madras": "Chennai",
+    "new delhi": "Delhi",
+    "ncr": "Delhi",
+    "panaji": "Goa",
+    "panjim": "Goa",
+    "hyd": "Hyderabad",
+    "blr": "Bangalore",
+    "pink city": "Jaipur",
+}
+
+
+@lru_cache(maxsize=1)
+def known_cities() -> dict[str, str]:
+    """
+    Every city name and alias found in the datasets.
+
+    Returns:
+        dict: lowercase name / alias → canonical (title-case) city
+    """
+    names = {}
+
+    for path, fields in CITY_DATA_PATHS:
+        try:
+            records = load_json(path)
+        except (FileNotFoundError, ValueError):
+            continue
+
+        for record in records:
+            for field in fields:
+                city = str(record.get(field, "")).strip()
+                if city:
+                    names[city.lower()] = city.title()
+
+    canonical = set(names.values())
+    for alias, city in CITY_ALIASES.items():
+        if city in canonical:
+            names[alias] = city
+
+    return names
@@ -0,0 +1,102 @@
+import json
+import re
+
+
+_STRUCTURAL = re.compile(r'[{}"]')
+_STRING_SPECIAL = re.compile(r'["\\]')
+
+
+class JSONObjectStream:
+    """
+    Incremental scanner for the first top-level JSON object in a text
+    that arrives in pieces (LLM tokens).
+    - Text before the object is skipped
+    - Braces inside strings (and escaped quotes) are handled across
+      piece boundaries
+    - A balanced candidate that does not parse (prose like "{...}") is
+      dropped and scanning continues
+    feed() returns the object as soon as its closing brace arrives.
+    """
+
+    def __init__(self):
+        self.result = None
+        self.chars_to_result = None   # characters fed up to the closing brace
+        self._parts = []
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._offset = 0
+
+    @property
+    def done(self) -> bool:
+        return self.result is not None
+
+    def feed(self, chunk: str) -> dict | None:
+        if self.result is not None:
+            return self.result
+
+        pos, n = 0, len(chunk)
+        seg = 0 if self._depth else None
+
+        while pos < n:
+            if self._escape:
+                self._escape = False
+                pos += 1
+                continue
+
+            if not self._depth:
+                start = chunk.find("{", pos)
+                if start == -1:
+                    break
+                self._depth, self._parts, seg = 1, [], start
+                self._in_string = False
+                pos = start + 1
+                continue
+
+            if self._in_string:
+                m = _STRING_SPECIAL.search(chunk, pos)
+                if not m:
+                    break
+                pos = m.end()
+                if m.group() == "\\":
+                    self._escape = True
+                else:
+                    self._in_string = False
+                continue
+
+            m = _STRUCTURAL.search(chunk, pos)
+            if not m:
+                break
+            pos = m.end()
+            c = m.group()
+
+            if c == '"':
+                self._in_string = True
+            elif c == "{":
+                self._depth += 1
+            else:
+                self._depth -= 1
+                if self._depth:
+                    continue
+                self._parts.append(chunk[seg:pos])
+                try:
+                    data = json.loads("".join(self._parts))
+                except json.JSONDecodeError:
+                    data = None
+                if isinstance(data, dict):
+                    self.result = data
+                    self.chars_to_result = self._offset + pos
+                    return data
+                seg = None
+
+        if self._depth and seg is not None:
+            self._parts.append(chunk[seg:])
+        self._offset += n
+        return None
+
+
+def first_json_object(text: str) -> dict | None:
+    """
+    The first complete JSON object in `text`, nested objects included.
+    """
+    return JSONObjectStream().feed(text)
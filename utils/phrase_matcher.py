@@ -0,0 +1,210 @@
+import re
+from collections import deque
+from typing import Any, NamedTuple
+
+
+NUM = "<num>"
+DATE = "<date>"
+
+_TOKEN = re.compile(r"\d{4}-\d{2}-\d{2}|\d+|[a-z]+(?:'[a-z]+)?|\+")
+
+
+class Token(NamedTuple):
+    text: str
+    start: int
+    end: int
+    symbol: str          # what the automaton sees
+    number: int | None   # numeric value for NUM tokens
+
+
+class Span(NamedTuple):
+    start: int           # character offsets into the scanned text
+    end: int
+    kind: str
+    value: Any
+    confidence: float
+    first_token: int
+    last_token: int      # exclusive
+
+    @property
+    def size(self) -> int:
+        return self.last_token - self.first_token
+
+
+class _Pattern:
+    __slots__ = ("length", "kind", "value", "confidence", "numbers", "constraints")
+
+    def __init__(self, length, kind, value, confidence, numbers, constraints):
+        self.length = length
+        self.kind = kind
+        self.value = value
+        self.confidence = confidence
+        self.numbers = numbers          # [("token", offset) | ("const", n)]
+        self.constraints = constraints  # {offset: required number}
+
+
+class PhraseMatcher:
+    """
+    Token-level Aho-Corasick automaton.
+
+    - Phrases are added once, the automaton is compiled once
+    - A message is tokenized and scanned in a single pass
+    - Every phrase occurrence comes back as a typed Span
+
+    Numbers (digits and number words) are read as one NUM symbol, so
+    "<num> days" matches "5 days", "five days" and "a couple of days".
+    A value may be a callable taking the captured numbers.
+    """
+
+    def __init__(self, number_words: dict[str, int] | None = None):
+        number_words = number_words or {}
+        self._single_numbers = {w: n for w, n in number_words.items() if " " not in w}
+        self._multi_numbers = {w: n for w, n in number_words.items() if " " in w}
+
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+        self._compiled = False
+
+    # Building
+
+    def _symbols(self, phrase: str):
+        """
+        Phrase → automaton symbols, numbers captured and literal number
+        constraints ("one way" → NUM with value 1).
+        """
+        symbols, numbers, constraints = [], [], {}
+        for i, word in enumerate(phrase.lower().split()):
+            if word == NUM:
+                symbols.append(NUM)
+                numbers.append(("token", i))
+            elif word.isdigit() or word in self._single_numbers:
+                symbols.append(NUM)
+                constraints[i] = int(word) if word.isdigit() else self._single_numbers[word]
+            else:
+                symbols.append(word)
+        return symbols, numbers, constraints
+
+    def _insert(self, symbols, pattern):
+        node = 0
+        for sym in symbols:
+            nxt = self._goto[node].get(sym)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][sym] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = nxt
+        self._out[node].append(pattern)
+
+    def add(self, phrase: str, kind: str, value: Any = None, confidence: float = 1.0):
+        if self._compiled:
+            raise RuntimeError("PhraseMatcher is already compiled")
+
+        symbols, numbers, constraints = self._symbols(phrase)
+        self._insert(
+            symbols,
+            _Pattern(len(symbols), kind, value, confidence, numbers, constraints),
+        )
+
+        # "a couple of days" / "a few nights": spell multi-word numbers out
+        if phrase.split().count(NUM) == 1:
+            for number_phrase, n in self._multi_numbers.items():
+                sym, _, cons = self._symbols(phrase.replace(NUM, number_phrase))
+                self._insert(
+                    sym,
+                    _Pattern(len(sym), kind, value, confidence, [("const", n)], cons),
+                )
+
+    def compile(self) -> "PhraseMatcher":
+        queue = deque()
+        for child in self._goto[0].values():
+            self._fail[child] = 0
+            queue.append(child)
+
+        while queue:
+            node = queue.popleft()
+            for sym, child in self._goto[node].items():
+                queue.append(child)
+                f = self._fail[node]
+                while f and sym not in self._goto[f]:
+                    f = self._fail[f]
+                self._fail[child] = self._goto[f].get(sym, 0)
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+        self._compiled = True
+        return self
+
+    # Scanning
+
+    def tokenize(self, text: str) -> list[Token]:
+        tokens = []
+        for m in _TOKEN.finditer(text):
+            word = m.group()
+            if word.isdigit():
+                tokens.append(Token(word, m.start(), m.end(), NUM, int(word)))
+            elif word in self._single_numbers:
+                tokens.append(Token(word, m.start(), m.end(), NUM, self._single_numbers[word]))
+            elif len(word) == 10 and word[4] == "-":
+                tokens.append(Token(word, m.start(), m.end(), DATE, None))
+            else:
+                tokens.append(Token(word, m.start(), m.end(), word, None))
+        return tokens
+
+    def scan(self, text: str) -> tuple[list[Token], list[Span]]:
+        """
+        Single pass over the (already lowercased) text.
+
+        Returns:
+            (tokens, spans) — spans are every phrase occurrence,
+            in order of their end position.
+        """
+        if not self._compiled:
+            self.compile()
+
+        tokens = self.tokenize(text)
+        spans = []
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+
+        for i, tok in enumerate(tokens):
+            sym = tok.symbol
+            while node and sym not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(sym, 0)
+
+            for p in out[node]:
+                first = i - p.length + 1
+                if any(tokens[first + off].number != req for off, req in p.constraints.items()):
+                    continue
+
+                value = p.value
+                if callable(value):
+                    nums = [
+                        n if src == "const" else tokens[first + n].number
+                        for src, n in p.numbers
+                    ]
+                    value = value(*nums)
+
+                spans.append(Span(
+                    tokens[first].start, tok.end, p.kind, value, p.confidence, first, i + 1
+                ))
+
+        return tokens, spans
+
+
+def maximal_spans(spans: list[Span]) -> list[Span]:
+    """
+    Drop spans strictly inside a longer span
+    ("budget" inside "on a budget", "3 days" inside "in 3 days").
+    """
+    keep = []
+    for s in spans:
+        if any(
+            t.first_token <= s.first_token and s.last_token <= t.last_token and t.size > s.size
+            for t in spans
+        ):
+            continue
+        keep.append(s)
+    return keep
@@ -0,0 +1,86 @@
+import time
+from concurrent.futures import wait, FIRST_COMPLETED
+
+
+class TaskGraph:
+    """
+    Small dependency graph of calls run on a thread pool.
+    - A task starts as soon as all of its dependencies have finished
+    - It receives their results as keyword arguments named after them
+    - Wall time of every task is kept in `timings` (ms)
+    - The first exception raised by a task is raised by run()
+    - A task given `inputs` is fingerprinted by them and by its
+      dependencies' fingerprints; run(previous=...) reuses an earlier
+      result whose fingerprint still matches instead of running it
+    - run(on_result=...) is called with (name, result) as each task
+      finishes or is reused, on the calling thread
+    """
+
+    def __init__(self):
+        self._tasks = {}   # name -> (fn, deps, inputs)
+        self.timings = {}
+        self.nodes = {}    # name -> (fingerprint, result)
+        self.recomputed = []
+
+    def add(self, name: str, fn, deps: tuple = (), inputs: tuple | None = None):
+        # inputs: everything besides `deps` the result depends on;
+        # None means the task always runs
+        if name in self._tasks:
+            raise ValueError(f"Duplicate task '{name}'")
+        self._tasks[name] = (fn, tuple(deps), None if inputs is None else tuple(inputs))
+        return self
+
+    @staticmethod
+    def _timed(fn, kwargs: dict):
+        started = time.perf_counter()
+        result = fn(**kwargs)
+        return result, round((time.perf_counter() - started) * 1000, 1)
+
+    def run(self, executor, previous: dict | None = None, on_result=None) -> dict:
+        # previous: `nodes` of an earlier run
+        previous = previous or {}
+        on_result = on_result or (lambda name, result: None)
+        pending = dict(self._tasks)
+        running = {}
+        results = {}
+
+        while pending or running:
+            reused = True
+            while reused:
+                reused = False
+                ready = [
+                    name for name, (_, deps, _) in pending.items()
+                    if all(d in results for d in deps)
+                ]
+                for name in ready:
+                    fn, deps, inputs = pending.pop(name)
+                    fingerprint = None
+                    if inputs is not None and all(self.nodes[d][0] is not None for d in deps):
+                        fingerprint = (inputs, tuple(self.nodes[d][0] for d in deps))
+
+                    kept = previous.get(name)
+                    if fingerprint is not None and kept is not None and kept[0] == fingerprint:
+                        # Unchanged since the earlier run; its dependents may be ready now
+                        results[name] = kept[1]
+                        self.nodes[name] = kept
+                        on_result(name, kept[1])
+                        reused = True
+                        continue
+
+                    kwargs = {d: results[d] for d in deps}
+                    running[executor.submit(self._timed, fn, kwargs)] = (name, fingerprint)
+
+            if not running:
+                if pending:
+                    raise ValueError(f"Unsatisfiable dependencies: {sorted(pending)}")
+                break
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name, fingerprint = running.pop(future)
+                results[name], self.timings[name] = future.result()
+                self.nodes[name] = (fingerprint, results[name])
+                self.recomputed.append(name)
+                on_result(name, results[name])
+
+        return results